@@ -0,0 +1,130 @@
+"""
+Agreement and speed of the light calc_hash backend (blank tokenizer +
+pymorphy3, memoized) against the reference hash over the full spaCy
+ru_core_news_sm pipeline, the default backend.
+
+    python benchmarks/bench_calc_hash.py --repeat 3 [--corpus names.txt] [--no-reference]
+
+The corpus is one Russian name or organization per line (a built-in sample by
+default). Every name is expanded into its singular and plural case forms.
+Reported are exact agreement (both paths give the same hash for a string) and
+grouping agreement (the forms of one entry collapse to a single key on both
+paths), which is what FakerContext relies on to restore declined values.
+The corpus is also hashed as one document, value by value and in a single
+calc_hashes call, each starting from empty memos. `--no-reference` skips
+everything that needs ru_core_news_sm and reports the light backend alone.
+"""
+import argparse
+import time
+from pathlib import Path
+
+from palimpsest.fakers import faker_utils
+from palimpsest.fakers.names_morph import get_morphs
+
+SAMPLE = [
+    "Иван", "Степан", "Анна", "Мария", "Пётр", "Екатерина", "Ольга", "Ирина",
+    "Елена", "Наталья", "Михаил", "Сергей", "Алексей", "Дмитрий",
+    "Иванов", "Степанов", "Петрова", "Кузнецов", "Смирнова", "Соколов",
+    "Попова", "Волков", "Морозова", "Лебедев",
+    "Иван Иванов", "Степан Степанов", "Анна Петрова", "Мария Смирнова",
+    "Ольга Попова", "Пётр Волков", "Наталья Морозова", "Сергей Лебедев",
+    "ООО «Ромашка»", "ПАО Сбербанк", "ПАО «Газпром»", "АО «Российские железные дороги»",
+    "Министерство финансов", "Московский государственный университет",
+]
+ORG_CASES = {
+    "ООО «Ромашка»": ["ООО «Ромашки»", "ООО «Ромашке»", "ООО «Ромашкой»"],
+    "ПАО Сбербанк": ["ПАО Сбербанка", "ПАО Сбербанку", "ПАО Сбербанком"],
+    "ПАО «Газпром»": ["ПАО «Газпрома»", "ПАО «Газпрому»", "ПАО «Газпромом»"],
+    "АО «Российские железные дороги»": ["АО «Российских железных дорог»", "АО «Российским железным дорогам»"],
+    "Министерство финансов": ["Министерства финансов", "Министерству финансов", "Министерством финансов"],
+    "Московский государственный университет": [
+        "Московского государственного университета", "Московскому государственному университету",
+    ],
+}
+
+
+def forms(entry):
+    if entry in ORG_CASES:
+        return [entry, *ORG_CASES[entry]]
+    words = [get_morphs(word) for word in entry.split()]
+    result = [entry]
+    for number in ("singular", "plural"):
+        for case in words[0][number]:
+            result.append(" ".join(word[number][case].strip() for word in words))
+    return list(dict.fromkeys(result))
+
+
+def timed(fn, texts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--corpus", type=Path)
+    parser.add_argument("--no-reference", action="store_true", help="skip the ru_core_news_sm reference")
+    args = parser.parse_args()
+    # the memoized and batched timings measure the light backend
+    faker_utils.HASH_BACKEND = "light"
+
+    entries = args.corpus.read_text(encoding="utf-8").splitlines() if args.corpus else SAMPLE
+    groups = [forms(entry) for entry in entries if entry.strip()]
+    texts = [text for group in groups for text in group]
+
+    light = faker_utils.calc_hash_light
+    spacy_hash = (lambda text: None) if args.no_reference else faker_utils.calc_hash_spacy
+    hashes = {text: (light(text), spacy_hash(text)) for text in texts}
+    exact = sum(ours == reference for ours, reference in hashes.values())
+    light_groups = sum(len({hashes[text][0] for text in group}) == 1 for group in groups)
+    spacy_groups = sum(len({hashes[text][1] for text in group}) == 1 for group in groups)
+    for group in groups:
+        if len({hashes[text][0] for text in group}) > 1:
+            print(f"light splits {group[0]!r}: " + ", ".join(f"{text}={hashes[text][0]}" for text in group))
+    for text, (ours, reference) in hashes.items():
+        if reference is not None and ours != reference:
+            print(f"differs: {text!r}: light={ours!r} spacy={reference!r}")
+
+    def cold(text):
+        faker_utils._token_key.cache_clear()
+        return light(text)
+
+    spacy_time = None if args.no_reference else timed(spacy_hash, texts, args.repeat)
+    cold_time = timed(cold, texts, args.repeat)
+    faker_utils.calc_hash.cache_clear()
+    for text in texts:
+        faker_utils.calc_hash(text)
+    warm_time = timed(faker_utils.calc_hash, texts, args.repeat)
+
+    def per_value(document):
+        faker_utils.calc_hash.cache_clear()
+        faker_utils._token_key.cache_clear()
+        return [faker_utils.calc_hash(text) for text in document]
+
+    def batched(document):
+        faker_utils._token_key.cache_clear()
+        return faker_utils.calc_hashes(document)
+
+    per_value_time = timed(per_value, [texts], args.repeat)
+    batched_time = timed(batched, [texts], args.repeat)
+
+    print(f"entries: {len(groups)}   strings: {len(texts)}")
+    if args.no_reference:
+        print(f"forms collapsed:    light {light_groups}/{len(groups)}")
+    else:
+        print(f"exact agreement:    {exact}/{len(texts)} ({exact / len(texts):.1%})")
+        print(f"forms collapsed:    light {light_groups}/{len(groups)}   spacy {spacy_groups}/{len(groups)}")
+        print(f"spaCy ru_core_news_sm: {len(texts) / spacy_time:10.0f} hashes/sec")
+    print(f"light, no memo:        {len(texts) / cold_time:10.0f} hashes/sec")
+    print(f"light, memoized:       {len(texts) / warm_time:10.0f} hashes/sec")
+    print(f"document, per value:   {per_value_time * 1000:10.2f} ms")
+    print(f"document, calc_hashes: {batched_time * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
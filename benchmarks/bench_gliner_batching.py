@@ -0,0 +1,69 @@
+"""
+Docs/sec of `_PalimpsestRuntime.analyze` with per-chunk GLiNER inference
+(batch_size=1, the legacy loop) against batched chunk analysis.
+
+    python benchmarks/bench_gliner_batching.py --batch-size 8 --repeat 3 [--docs contract1.txt ...]
+
+Without --docs a contract-like document of --pages pages is synthesised from
+the sample text, so it splits into many 768-token chunks.
+"""
+import argparse
+import time
+from pathlib import Path
+
+from palimpsest.palimpsest import _runtime_factory
+
+SAMPLE = (
+    "Клиент Степан Степанов (паспорт 4519345678) по поручению Ивана Иванова "
+    "обратился в \"НашаКомпания\" с предложением купить трактор. "
+    "Для оплаты используется его карта 4694791869619038. "
+    "Позвоните ему 9867777777 или 9857777237. "
+    "Или можно по адресу г. Санкт-Петербург, Сенная Площадь, д1/2кв17.\n"
+)
+
+
+def load_docs(paths, pages):
+    if paths:
+        return [Path(p).read_text(encoding="utf-8") for p in paths]
+    # ~20 sample paragraphs per page
+    return [SAMPLE * 20 * pages]
+
+
+def spans(results):
+    return sorted((r.entity_type, r.start, r.end) for r in results)
+
+
+def run(runtime, docs, batch_size, repeat):
+    runtime._batch_size = batch_size
+    outputs = [spans(runtime.analyze(doc)[1]) for doc in docs]  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for doc in docs:
+            runtime.analyze(doc)
+    elapsed = time.perf_counter() - start
+    return repeat * len(docs) / elapsed, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", nargs="*", help="UTF-8 text files to analyze")
+    parser.add_argument("--pages", type=int, default=20, help="size of the synthetic document")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    docs = load_docs(args.docs, args.pages)
+    runtime = _runtime_factory(batch_size=args.batch_size)
+
+    loop_rate, loop_out = run(runtime, docs, 1, args.repeat)
+    batch_rate, batch_out = run(runtime, docs, args.batch_size, args.repeat)
+
+    print(f"documents:           {len(docs)} ({sum(map(len, docs))} chars)")
+    print(f"per-chunk loop:      {loop_rate:.3f} docs/sec")
+    print(f"batched (bs={args.batch_size:<3}):    {batch_rate:.3f} docs/sec")
+    print(f"speedup:             {batch_rate / loop_rate:.2f}x")
+    print(f"identical spans:     {loop_out == batch_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Latency and detection quality of the GLiNER ONNX Runtime backends ("onnx",
+"onnx-int8") against the torch checkpoint on the CPU.
+
+    python benchmarks/bench_gliner_onnx.py --repeat 3 [--backends torch onnx onnx-int8] [--gold gold.jsonl]
+
+The first run of an ONNX backend exports (and quantizes) the model into the
+local ONNX cache; that one-off cost is reported as start-up time.
+Quality is precision/recall/F1 of exact (entity_type, start, end) spans
+against a small labelled Russian sample, or against --gold: one JSON object
+per line, {"text": "...", "entities": [["PERSON", 7, 21], ...]}. Only the
+GLiNER entities are requested, so regex recognizers do not dilute the scores.
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+from palimpsest.analyzer_engine_provider import GLINER_BACKENDS, GLINER_ENTITIES
+from palimpsest.palimpsest import _runtime_factory
+
+# (text, [(entity_type, surface form), ...]); offsets are found in the text
+LABELLED = [
+    ("Клиент Степан Степанов просит перезвонить ему завтра.", [("PERSON", "Степан Степанов")]),
+    ("Пётр Иванов из Санкт-Петербурга поехал в офис.", [("PERSON", "Пётр Иванов"), ("RU_CITY", "Санкт-Петербурга")]),
+    ("Доставка по адресу г. Москва, ул. Тверская, д. 7, кв. 12.", [("RU_ADDRESS", "г. Москва, ул. Тверская, д. 7, кв. 12")]),
+    ("Анна Сергеевна Кузнецова переехала в Казань.", [("PERSON", "Анна Сергеевна Кузнецова"), ("RU_CITY", "Казань")]),
+    ("Договор подписал Игорь Петрович Соколов.", [("PERSON", "Игорь Петрович Соколов")]),
+    ("Офис компании находится в Новосибирске.", [("RU_CITY", "Новосибирске")]),
+    ("Мария Орлова и Дмитрий Волков встретятся в Екатеринбурге.",
+     [("PERSON", "Мария Орлова"), ("PERSON", "Дмитрий Волков"), ("RU_CITY", "Екатеринбурге")]),
+    ("Счёт отправлен на имя Елены Смирновой.", [("PERSON", "Елены Смирновой")]),
+]
+
+
+def labelled_docs():
+    docs, gold = [], []
+    for text, entities in LABELLED:
+        spans = set()
+        for entity_type, surface in entities:
+            start = text.index(surface)
+            spans.add((entity_type, start, start + len(surface)))
+        docs.append(text)
+        gold.append(spans)
+    return docs, gold
+
+
+def load_gold(gold_path):
+    if not gold_path:
+        return labelled_docs()
+    rows = [json.loads(line) for line in Path(gold_path).read_text(encoding="utf-8").splitlines() if line.strip()]
+    return [row["text"] for row in rows], [{tuple(e) for e in row["entities"]} for row in rows]
+
+
+def spans(results):
+    return {(r.entity_type, r.start, r.end) for r in results}
+
+
+def prf(predicted, expected):
+    tp = sum(len(p & e) for p, e in zip(predicted, expected))
+    n_pred = sum(map(len, predicted))
+    n_exp = sum(map(len, expected))
+    precision = tp / n_pred if n_pred else 1.0
+    recall = tp / n_exp if n_exp else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def run(backend, docs, repeat):
+    start = time.perf_counter()
+    runtime = _runtime_factory(run_entities=sorted(GLINER_ENTITIES), gliner_backend=backend)
+    startup = time.perf_counter() - start
+    outputs = [spans(runtime.analyze(doc)[1]) for doc in docs]  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for doc in docs:
+            runtime.analyze(doc)
+    per_doc = (time.perf_counter() - start) / (repeat * len(docs))
+    runtime.close()
+    return startup, per_doc, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", choices=GLINER_BACKENDS, default=list(GLINER_BACKENDS))
+    parser.add_argument("--gold", help="JSONL file with texts and gold entity spans")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    docs, gold = load_gold(args.gold)
+    results = {backend: run(backend, docs, args.repeat) for backend in args.backends}
+
+    print(f"documents: {len(docs)} ({sum(map(len, docs))} chars), gold spans: {sum(map(len, gold))}")
+    base = results[args.backends[0]][1]
+    for backend, (startup, per_doc, outputs) in results.items():
+        p, r, f = prf(outputs, gold)
+        print(
+            f"{backend:<10} startup {startup:8.2f} s   latency {per_doc * 1000:8.1f} ms/doc "
+            f"({base / per_doc:4.2f}x)   precision {p:.3f} recall {r:.3f} f1 {f:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
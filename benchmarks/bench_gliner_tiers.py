@@ -0,0 +1,71 @@
+"""
+Latency and detection quality of each GLiNER model tier, as measured for the
+"GLiNER Model Tiers" table of the developer guide.
+
+    python benchmarks/bench_gliner_tiers.py --repeat 3 [--tiers small medium large ./my-model] [--gold gold.jsonl]
+
+Tiers are names from GLINER_TIERS or any Hugging Face id / local checkpoint.
+Documents and scoring are those of bench_gliner_onnx.py: exact
+(entity_type, start, end) spans of the GLiNER entities against the labelled
+Russian sample or --gold. "F1 vs large" scores each tier against the large
+tier's own spans, which needs no gold data. Latency is per document on one
+thread, the way a single chat turn is anonymized. The hardware line goes
+under the table in the guide.
+"""
+import argparse
+import os
+import platform
+import time
+
+from bench_gliner_onnx import load_gold, prf, spans
+
+from palimpsest.analyzer_engine_provider import GLINER_ENTITIES, GLINER_TIERS
+from palimpsest.palimpsest import _runtime_factory
+
+
+def run(tier, docs, repeat):
+    start = time.perf_counter()
+    runtime = _runtime_factory(run_entities=sorted(GLINER_ENTITIES), gliner_model=tier)
+    startup = time.perf_counter() - start
+    outputs = [spans(runtime.analyze(doc)[1]) for doc in docs]  # warm-up
+    latencies = []
+    for _ in range(repeat):
+        for doc in docs:
+            start = time.perf_counter()
+            runtime.analyze(doc)
+            latencies.append(time.perf_counter() - start)
+    runtime.close()
+    latencies.sort()
+    return startup, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.95)], outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tiers", nargs="+", default=list(GLINER_TIERS))
+    parser.add_argument("--gold", help="JSONL file with texts and gold entity spans")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    import torch
+
+    docs, gold = load_gold(args.gold)
+    print(f"documents: {len(docs)} ({sum(map(len, docs))} chars), gold spans: {sum(map(len, gold))}")
+    print(
+        f"hardware: {platform.processor() or platform.machine()}, {os.cpu_count()} CPUs, "
+        f"torch {torch.__version__} with {torch.get_num_threads()} threads, Python {platform.python_version()}"
+    )
+    results = {tier: run(tier, docs, args.repeat) for tier in args.tiers}
+    reference = results.get("large", (None,) * 4)[3]
+    print("| Tier | Start-up, s | p50, ms/doc | p95, ms/doc | Precision | Recall | F1 | F1 vs large |")
+    print("| --- | --- | --- | --- | --- | --- | --- | --- |")
+    for tier, (startup, p50, p95, outputs) in results.items():
+        p, r, f = prf(outputs, gold)
+        agreement = f"{prf(outputs, reference)[2]:.3f}" if reference is not None else "-"
+        print(
+            f"| `{tier}` | {startup:.1f} | {p50 * 1000:.1f} | {p95 * 1000:.1f} "
+            f"| {p:.3f} | {r:.3f} | {f:.3f} | {agreement} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
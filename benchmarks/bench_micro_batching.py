@@ -0,0 +1,52 @@
+"""
+Messages/sec of concurrent single-message callers without and with GLiNER
+micro-batching.
+
+    python benchmarks/bench_micro_batching.py --threads 16 --messages 256 --wait-ms 5 --batch-size 16
+
+Every thread analyzes short distinct messages (one chunk each), as chat
+sessions served from a thread pool would.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from palimpsest.palimpsest import _runtime_factory
+
+SAMPLE = (
+    "Клиент Степан Степанов по поручению Ивана Иванова просит перезвонить "
+    "ему по адресу г. Санкт-Петербург, Сенная Площадь, д1/2кв17."
+)
+
+
+def run(runtime, messages, threads):
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(runtime.analyze, messages[:threads]))  # warm-up
+        start = time.perf_counter()
+        list(pool.map(runtime.analyze, messages))
+    return len(messages) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--messages", type=int, default=256)
+    parser.add_argument("--wait-ms", type=float, default=5.0)
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    messages = [f"Сообщение {i}. {SAMPLE}" for i in range(args.messages)]
+    rates = {}
+    for wait_ms in (0.0, args.wait_ms):
+        runtime = _runtime_factory(batch_size=args.batch_size, batch_wait_ms=wait_ms)
+        rates[wait_ms] = run(runtime, messages, args.threads)
+        runtime.close()
+
+    print(f"threads: {args.threads}   messages: {len(messages)}")
+    print(f"per-call GLiNER:          {rates[0.0]:8.2f} msg/sec")
+    print(f"micro-batched ({args.wait_ms:g} ms): {rates[args.wait_ms]:8.2f} msg/sec")
+    print(f"speedup:                  {rates[args.wait_ms] / rates[0.0]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Latency and detection quality of the "light" (tokenizer-only) NLP mode against
+the "full" spaCy ru_core_news_lg parse.
+
+    python benchmarks/bench_nlp_mode.py --repeat 3 [--docs a.txt ...] [--gold gold.jsonl]
+
+Quality is reported as precision/recall/F1 of the light spans against the full
+spans (agreement), and against gold annotations when --gold is given: one JSON
+object per line, {"text": "...", "entities": [["PERSON", 7, 21], ...]}.
+Spans are compared as exact (entity_type, start, end) triples on the analyzed
+text, so gold offsets must refer to text without line breaks.
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+from palimpsest.palimpsest import _runtime_factory
+
+SAMPLE = (
+    "Клиент Степан Степанов (паспорт 4519345678) по поручению Ивана Иванова "
+    "обратился в \"НашаКомпания\" с предложением купить трактор. "
+    "Для оплаты используется его карта 4694791869619038. "
+    "Позвоните ему 9867777777 или 9857777237. "
+    "Или можно по адресу г. Санкт-Петербург, Сенная Площадь, д1/2кв17."
+)
+
+
+def load_docs(paths, gold_path):
+    if gold_path:
+        rows = [json.loads(line) for line in Path(gold_path).read_text(encoding="utf-8").splitlines() if line.strip()]
+        return [row["text"] for row in rows], [{tuple(e) for e in row["entities"]} for row in rows]
+    if paths:
+        return [Path(p).read_text(encoding="utf-8") for p in paths], None
+    return [SAMPLE] * 50, None
+
+
+def spans(results):
+    return {(r.entity_type, r.start, r.end) for r in results}
+
+
+def prf(predicted, expected):
+    tp = sum(len(p & e) for p, e in zip(predicted, expected))
+    n_pred = sum(map(len, predicted))
+    n_exp = sum(map(len, expected))
+    precision = tp / n_pred if n_pred else 1.0
+    recall = tp / n_exp if n_exp else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def run(nlp_mode, docs, repeat):
+    start = time.perf_counter()
+    runtime = _runtime_factory(nlp_mode=nlp_mode)
+    startup = time.perf_counter() - start
+    outputs = [spans(runtime.analyze(doc)[1]) for doc in docs]  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for doc in docs:
+            runtime.analyze(doc)
+    per_doc = (time.perf_counter() - start) / (repeat * len(docs))
+    runtime.close()
+    return startup, per_doc, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", nargs="*", help="UTF-8 text files to analyze")
+    parser.add_argument("--gold", help="JSONL file with texts and gold entity spans")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    docs, gold = load_docs(args.docs, args.gold)
+    results = {mode: run(mode, docs, args.repeat) for mode in ("full", "light")}
+
+    print(f"documents: {len(docs)} ({sum(map(len, docs))} chars)")
+    for mode, (startup, per_doc, _) in results.items():
+        print(f"{mode:<6} startup {startup:8.2f} s   latency {per_doc * 1000:9.1f} ms/doc")
+    print(f"speedup: {results['full'][1] / results['light'][1]:.2f}x")
+    p, r, f = prf(results["light"][2], results["full"][2])
+    print(f"light vs full spans: precision {p:.3f} recall {r:.3f} f1 {f:.3f}")
+    if gold:
+        for mode, (_, _, outputs) in results.items():
+            p, r, f = prf(outputs, gold)
+            print(f"{mode:<6} vs gold:       precision {p:.3f} recall {r:.3f} f1 {f:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Docs/sec of the in-process runtime against the forked process-pool runtime
+for growing pool sizes, with the parent's resident memory after start-up.
+
+    python benchmarks/bench_process_pool.py --processes 1 2 4 --docs-count 64 [--docs a.txt ...]
+
+Documents are submitted from as many threads as there are workers, each
+thread with its own affinity key, as concurrent sessions would be.
+"""
+import argparse
+import resource
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from palimpsest.palimpsest import _runtime_factory
+
+SAMPLE = (
+    "Клиент Степан Степанов (паспорт 4519345678) по поручению Ивана Иванова "
+    "обратился в \"НашаКомпания\" с предложением купить трактор. "
+    "Для оплаты используется его карта 4694791869619038. "
+    "Позвоните ему 9867777777 или 9857777237. "
+    "Или можно по адресу г. Санкт-Петербург, Сенная Площадь, д1/2кв17.\n"
+)
+
+
+def load_docs(paths, count):
+    if paths:
+        return [Path(p).read_text(encoding="utf-8") for p in paths]
+    # distinct documents so no chunk is ever answered from a memo
+    return [f"Документ {i}.\n" + SAMPLE * 4 for i in range(count)]
+
+
+def run(runtime, docs, threads):
+    def analyze(i):
+        return runtime.analyze(docs[i], affinity=i % threads)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(analyze, range(min(threads, len(docs)))))  # warm-up
+        start = time.perf_counter()
+        list(pool.map(analyze, range(len(docs))))
+    return len(docs) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", nargs="*", help="UTF-8 text files to analyze")
+    parser.add_argument("--docs-count", type=int, default=64, help="number of synthetic documents")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    docs = load_docs(args.docs, args.docs_count)
+    runtime = _runtime_factory()
+    base = run(runtime, docs, 1)
+    runtime.close()
+    print(f"documents: {len(docs)} ({sum(map(len, docs))} chars)")
+    print(f"in-process:      {base:8.3f} docs/sec")
+    for processes in args.processes:
+        runtime = _runtime_factory(processes=processes)
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        rate = run(runtime, docs, processes)
+        runtime.close()
+        print(
+            f"processes={processes:<3}   {rate:8.3f} docs/sec   "
+            f"scaling {rate / base:5.2f}x   parent max RSS {rss:8.0f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,23 @@
 from .palimpsest import (
+    AnalysisCache,
+    FakeReservoir,
+    InferenceProfile,
     Palimpsest,
     PalimpsestSession,
     PalimpsestSessionError,
     SessionRequiredError,
     SessionStateError,
+    StreamingDeanonymizer,
 )
 
 __all__ = [
+    "AnalysisCache",
+    "FakeReservoir",
+    "InferenceProfile",
     "Palimpsest",
     "PalimpsestSession",
     "PalimpsestSessionError",
     "SessionRequiredError",
     "SessionStateError",
+    "StreamingDeanonymizer",
 ]
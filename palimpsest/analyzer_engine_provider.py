@@ -10,6 +10,7 @@ from presidio_analyzer import (
 from presidio_analyzer.nlp_engine import (
     NlpEngine,
     NlpEngineProvider,
+    SpacyNlpEngine,
 )
 import spacy
 from .recognizers.regex_recognisers import (
@@ -22,9 +23,88 @@ from .recognizers.regex_recognisers import (
     RUCreditCardRecognizer
 )
 from .recognizers.natasha_recogniser import NatashaSlovnetRecognizer
+from .parallel_analyzer import ParallelAnalyzerEngine
+from .utils.inference_profile import InferenceProfile
+from . import model_registry
 
 _SPACY_MODEL = "ru_core_news_lg"
 
+# Entities produced by the model-backed recognizers (mirrors their label maps).
+# Everything else in Palimpsest comes from regex/pattern recognizers.
+GLINER_ENTITIES = frozenset({"PERSON", "RU_ADDRESS", "RU_CITY"})
+NATASHA_ENTITIES = frozenset({"RU_PERSON", "RU_ORGANIZATION"})
+
+
+# "full": spaCy ru_core_news_lg parses every chunk (morphologizer, NER,
+# lemmatizer) for presidio context enhancement; "light": tokenizer only.
+NLP_MODES = ("full", "light")
+
+# GLiNER tiers selectable by name; any other model name is used as a Hugging
+# Face id or a local checkpoint directory. Smaller tiers trade recall for latency.
+GLINER_TIERS = {
+    "small": "gliner-community/gliner_small-v2.5",
+    "medium": "gliner-community/gliner_medium-v2.5",
+    "large": "gliner-community/gliner_large-v2.5",
+}
+DEFAULT_GLINER_TIER = "large"
+
+# "torch": the GLiNER checkpoint as is; "onnx" / "onnx-int8": a local ONNX
+# export (fp32 or dynamically quantized int8) run by ONNX Runtime on the CPU.
+GLINER_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+# spaCy components whose output neither presidio's NlpArtifacts (tokens,
+# lemmas, entities) nor any Palimpsest recognizer reads.
+UNUSED_SPACY_COMPONENTS = ("parser",)
+
+
+def resolve_gliner_model(model: str) -> str:
+    """GLiNER model id or path for a tier name, or `model` itself."""
+    return GLINER_TIERS.get(model, model)
+
+
+def _requested(entities: frozenset, run_entities: Optional[List[str]]) -> bool:
+    """Whether a recognizer producing `entities` is needed for `run_entities` (None means all)."""
+    return not run_entities or not entities.isdisjoint(run_entities)
+
+
+class _BlankSpacyNlpEngine(SpacyNlpEngine):
+    """spaCy engine with a blank (tokenizer-only) pipeline: no model to load or run."""
+
+    def load(self) -> None:
+        self.nlp = {model["lang_code"]: spacy.blank(model["model_name"]) for model in self.models}
+
+
+def _disable_unused_components(nlp) -> None:
+    for name in UNUSED_SPACY_COMPONENTS:
+        if name in nlp.pipe_names:
+            nlp.disable_pipe(name)
+
+
+def _shared_blank_engine(lang: str = "ru") -> NlpEngine:
+    def load():
+        engine = _BlankSpacyNlpEngine(models=[{"lang_code": "en", "model_name": lang}])
+        engine.load()
+        return engine
+
+    return model_registry.acquire(("spacy", f"blank:{lang}"), load)
+
+
+def _shared_spacy_engine(model_name: str = _SPACY_MODEL) -> NlpEngine:
+    """spaCy NLP engine for `model_name`, loaded once per process."""
+    def load():
+        if not spacy.util.is_package(model_name):
+            spacy.cli.download(model_name)
+        nlp_configuration = {
+            "nlp_engine_name": "spacy",
+            "models": [{"lang_code": "en", "model_name": model_name}],
+        }
+        engine = NlpEngineProvider(nlp_configuration=nlp_configuration).create_engine()
+        for nlp in engine.nlp.values():
+            _disable_unused_components(nlp)
+        return engine
+
+    return model_registry.acquire(("spacy", model_name), load)
+
 
 def create_nlp_engine_with_transformers(
     model_path: str,
@@ -116,12 +196,14 @@ def create_nlp_engine_with_transformers(
 
 def create_nlp_engine_with_flair(
     model_path: str,
+    inference_profile: Optional[InferenceProfile] = None,
 ) -> Tuple[NlpEngine, RecognizerRegistry]:
     """
     Instantiate an NlpEngine with a FlairRecognizer and a small spaCy model.
     The FlairRecognizer would return results from Flair models, the spaCy model
     would return NlpArtifacts such as POS and lemmas.
     :param model_path: Flair model path.
+    :param inference_profile: CPU inference settings for the Flair model.
     """
     from .recognizers.flair_recognizer import FlairRecognizer
 
@@ -133,7 +215,7 @@ def create_nlp_engine_with_flair(
     if not spacy.util.is_package("en_core_web_sm"):
         spacy.cli.download("en_core_web_sm")
     # Using a small spaCy model + a Flair NER model
-    flair_recognizer = FlairRecognizer(model_path=model_path)
+    flair_recognizer = FlairRecognizer(model_path=model_path, profile=inference_profile)
     nlp_configuration = {
         "nlp_engine_name": "spacy",
         "models": [{"lang_code": "en", "model_name": "en_core_web_sm"}],
@@ -147,6 +229,7 @@ def create_nlp_engine_with_flair(
 
 def create_nlp_engine_with_natasha(
     model_path: str,
+    nlp_mode: str = "full",
 ) -> Tuple[NlpEngine, RecognizerRegistry]:
     """
     Instantiate an NlpEngine with a FlairRecognizer and a small spaCy model.
@@ -161,54 +244,65 @@ def create_nlp_engine_with_natasha(
     # there is no official Flair NlpEngine, hence we load it as an additional recognizer
     #spacy_model = "en_core_web_sm"
     #spacy_model = "ru_core_news_lg"
-    if not spacy.util.is_package(_SPACY_MODEL):
-        spacy.cli.download(_SPACY_MODEL)
+    if nlp_mode == "light":
+        nlp_engine = _shared_blank_engine()
+    else:
+        nlp_engine = _shared_spacy_engine(_SPACY_MODEL)
     # Using a small spaCy model + a Flair NER model
     natasha_recognizer = NatashaSlovnetRecognizer()
-    nlp_configuration = {
-        "nlp_engine_name": "spacy",
-        #"models": [{"lang_code": "en", "model_name": "en_core_web_sm"}],
-        "models": [{"lang_code": "en", "model_name": _SPACY_MODEL}],
-    }
     registry.add_recognizer(natasha_recognizer)
     registry.remove_recognizer("SpacyRecognizer")
 
-    nlp_engine = NlpEngineProvider(nlp_configuration=nlp_configuration).create_engine()
-
     return nlp_engine, registry
 
 def create_nlp_engine_with_gliner(
-    model_path: str = "gliner-community/gliner_large-v2.5",
+    model_path: str = DEFAULT_GLINER_TIER,
     run_entities: Optional[List[str]] = None,
+    batch_size: int = 8,
+    nlp_mode: str = "full",
+    batch_wait_ms: float = 0.0,
+    gliner_backend: str = "torch",
+    inference_profile: Optional[InferenceProfile] = None,
 ) -> Tuple[NlpEngine, RecognizerRegistry]:
     """
     Instantiate an NlpEngine with a FlairRecognizer and a small spaCy model.
     The FlairRecognizer would return results from Flair models, the spaCy model
     would return NlpArtifacts such as POS and lemmas.
-    :param model_path: Flair model path.
+    GLiNER and spaCy `ru_core_news_lg` are only loaded when `run_entities`
+    asks for a model-backed entity; regex-only configurations get a blank
+    tokenizer-only NLP engine.
+    :param model_path: GLiNER tier name (GLINER_TIERS), Hugging Face id, or local path.
+    :param batch_size: GLiNER inference batch size for batched chunk analysis.
+    :param batch_wait_ms: Micro-batching deadline for concurrent callers; 0 disables it.
+    :param nlp_mode: "light" replaces the spaCy parse with a blank tokenizer.
+    :param gliner_backend: GLiNER inference backend, one of GLINER_BACKENDS.
+    :param inference_profile: CPU inference settings for the torch GLiNER model.
     """
-    from .recognizers.gliner_recogniser import GlinerRecognizer
-
     registry = RecognizerRegistry()
     registry.load_predefined_recognizers()
 
     # there is no official Flair NlpEngine, hence we load it as an additional recognizer
 
     #spacy_model = "ru_core_news_lg"
-    if not spacy.util.is_package(_SPACY_MODEL):
-        spacy.cli.download(_SPACY_MODEL)
-    # Using a small spaCy model + a Flair NER model
-    gliner_recognizer = GlinerRecognizer(run_entities=run_entities, model_path=model_path)
-    nlp_configuration = {
-        "nlp_engine_name": "spacy",
-        #"models": [{"lang_code": "en", "model_name": "en_core_web_sm"}],
-        "models": [{"lang_code": "en", "model_name": _SPACY_MODEL}],
-    }
-    registry.add_recognizer(gliner_recognizer)
+    if nlp_mode != "light" and _requested(GLINER_ENTITIES | NATASHA_ENTITIES, run_entities):
+        nlp_engine = _shared_spacy_engine(_SPACY_MODEL)
+    else:
+        nlp_engine = _shared_blank_engine()
+    if _requested(GLINER_ENTITIES, run_entities):
+        from .recognizers.gliner_recogniser import GlinerRecognizer
+
+        # Using a small spaCy model + a Flair NER model
+        gliner_recognizer = GlinerRecognizer(
+            run_entities=run_entities,
+            model_path=resolve_gliner_model(model_path),
+            batch_size=batch_size,
+            batch_wait_ms=batch_wait_ms,
+            backend=gliner_backend,
+            profile=inference_profile,
+        )
+        registry.add_recognizer(gliner_recognizer)
     registry.remove_recognizer("SpacyRecognizer")
 
-    nlp_engine = NlpEngineProvider(nlp_configuration=nlp_configuration).create_engine()
-
     return nlp_engine, registry
 
 def nlp_engine_and_registry(
@@ -217,6 +311,11 @@ def nlp_engine_and_registry(
     ta_key: Optional[str] = None,
     ta_endpoint: Optional[str] = None,
     run_entities: Optional[List[str]] = None,
+    batch_size: int = 8,
+    nlp_mode: str = "full",
+    batch_wait_ms: float = 0.0,
+    gliner_backend: str = "torch",
+    inference_profile: Optional[InferenceProfile] = None,
 ) -> Tuple[NlpEngine, RecognizerRegistry]:
     """Create the NLP Engine instance based on the requested model.
     :param model_family: Which model package to use for NER.
@@ -226,17 +325,34 @@ def nlp_engine_and_registry(
         "en_core_web_lg"
     :param ta_key: Key to the Text Analytics endpoint (only if model_path = "Azure Text Analytics")
     :param ta_endpoint: Endpoint of the Text Analytics instance (only if model_path = "Azure Text Analytics")
+    :param batch_size: Inference batch size for recognizers supporting batched analysis.
+    :param nlp_mode: "full" spaCy parse or "light" tokenizer-only engine (Natasha and GLiNER families).
+    :param batch_wait_ms: GLiNER micro-batching deadline for concurrent callers; 0 disables it.
+    :param gliner_backend: GLiNER inference backend: "torch", "onnx" or "onnx-int8".
+    :param inference_profile: CPU inference settings for torch-backed models (GLiNER, Flair).
     """
+    if nlp_mode not in NLP_MODES:
+        raise ValueError(f"NLP mode {nlp_mode} not supported")
+    if gliner_backend not in GLINER_BACKENDS:
+        raise ValueError(f"GLiNER backend {gliner_backend} not supported")
 
     # Set up NLP Engine according to the model of choice
     if "flair" in model_family.lower():
-        engine, registry = create_nlp_engine_with_flair(model_path)
+        engine, registry = create_nlp_engine_with_flair(model_path, inference_profile)
     elif "huggingface" in model_family.lower():
         engine, registry = create_nlp_engine_with_transformers(model_path)
     elif "natasha" in model_family.lower():
-        engine, registry = create_nlp_engine_with_natasha(model_path)
+        engine, registry = create_nlp_engine_with_natasha(model_path, nlp_mode=nlp_mode)
     elif "gliner" in model_family.lower():
-        engine, registry = create_nlp_engine_with_gliner(model_path, run_entities)
+        engine, registry = create_nlp_engine_with_gliner(
+            model_path,
+            run_entities,
+            batch_size=batch_size,
+            nlp_mode=nlp_mode,
+            batch_wait_ms=batch_wait_ms,
+            gliner_backend=gliner_backend,
+            inference_profile=inference_profile,
+        )
     else:
         raise ValueError(f"Model family {model_family} not supported")
     
@@ -249,6 +365,12 @@ def analyzer_engine(
     ta_key: Optional[str] = None,
     ta_endpoint: Optional[str] = None,
     run_entities: Optional[List[str]] = None,
+    batch_size: int = 8,
+    nlp_mode: str = "full",
+    recognizer_workers: int = 0,
+    batch_wait_ms: float = 0.0,
+    gliner_backend: str = "torch",
+    inference_profile: Optional[InferenceProfile] = None,
 ) -> AnalyzerEngine:
     """Create the NLP Engine instance based on the requested model.
     :param model_family: Which model package to use for NER.
@@ -258,13 +380,34 @@ def analyzer_engine(
         "en_core_web_lg"
     :param ta_key: Key to the Text Analytics endpoint (only if model_path = "Azure Text Analytics")
     :param ta_endpoint: Endpoint of the Text Analytics instance (only if model_path = "Azure Text Analytics")
+    :param batch_size: Inference batch size for recognizers supporting batched analysis.
+    :param nlp_mode: "full" spaCy parse or "light" tokenizer-only engine.
+    :param recognizer_workers: Threads running model-backed recognizers concurrently; 0 keeps them sequential.
+    :param batch_wait_ms: GLiNER micro-batching deadline for concurrent callers; 0 disables it.
+    :param gliner_backend: GLiNER inference backend: "torch", "onnx" or "onnx-int8".
+    :param inference_profile: CPU inference settings for torch-backed models (GLiNER, Flair).
     """
     nlp_engine, registry = nlp_engine_and_registry(
-        model_family, model_path, ta_key, ta_endpoint, run_entities=run_entities
+        model_family,
+        model_path,
+        ta_key,
+        ta_endpoint,
+        run_entities=run_entities,
+        batch_size=batch_size,
+        nlp_mode=nlp_mode,
+        batch_wait_ms=batch_wait_ms,
+        gliner_backend=gliner_backend,
+        inference_profile=inference_profile,
     )
-    analyzer = AnalyzerEngine(nlp_engine=nlp_engine, registry=registry)
-    natasha_recognizer = NatashaSlovnetRecognizer()
-    analyzer.registry.add_recognizer(natasha_recognizer)
+    if recognizer_workers > 0:
+        analyzer = ParallelAnalyzerEngine(
+            nlp_engine=nlp_engine, registry=registry, max_workers=recognizer_workers
+        )
+    else:
+        analyzer = AnalyzerEngine(nlp_engine=nlp_engine, registry=registry)
+    if _requested(NATASHA_ENTITIES, run_entities):
+        natasha_recognizer = NatashaSlovnetRecognizer()
+        analyzer.registry.add_recognizer(natasha_recognizer)
     analyzer.registry.add_recognizer(ru_internal_passport_recognizer)
     analyzer.registry.add_recognizer(ru_phone_recognizer)
     analyzer.registry.add_recognizer(ticket_number_recogniser)
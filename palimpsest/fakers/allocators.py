@@ -0,0 +1,94 @@
+"""
+Collision-free allocation for the structured fake types.
+
+Random fakes of a large session collide more and more often, and every
+collision costs a retry plus a hash. The structured types (phones, cards,
+INN, SNILS, passports, accounts, IPs) instead number their value space and
+hand out each number once per session through an `IndexAllocator`; the
+fakers in `fakers_funcs` render a number into a formatted, checksum-valid
+value.
+"""
+import random
+from typing import Optional
+
+_ROUNDS = 4
+_MIX = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+class IndexAllocator:
+    """
+    Hands out every integer of [0, size) exactly once, in a scrambled order:
+    the n-th call returns a keyed permutation of n. The permutation is a
+    balanced Feistel network over the smallest even bit width covering
+    `size`, cycle-walked back into range, so consecutive calls show no
+    arithmetic pattern. Round keys are drawn from `rng` on first use, so a
+    seeded Faker gives a reproducible sequence. O(1) expected per call, no
+    retries; raises ValueError once the space is exhausted.
+    """
+
+    def __init__(self, size: int, rng: Optional[random.Random] = None):
+        if size < 1:
+            raise ValueError("IndexAllocator size must be positive")
+        self._size = size
+        self._rng = rng
+        self._half = max(1, ((size - 1).bit_length() + 1) // 2)
+        self._keys = None
+        self._next = 0
+
+    def __len__(self) -> int:
+        """Number of indices handed out so far."""
+        return self._next
+
+    def _permute(self, x: int) -> int:
+        half = self._half
+        mask = (1 << half) - 1
+        left, right = x >> half, x & mask
+        for key in self._keys:
+            mixed = (((right ^ key) * _MIX) & _MASK64) >> (64 - half)
+            left, right = right, left ^ mixed
+        return (left << half) | right
+
+    def __call__(self) -> int:
+        if self._next >= self._size:
+            raise ValueError(f"IndexAllocator exhausted all {self._size} values")
+        if self._keys is None:
+            rng = self._rng or random.Random()
+            self._keys = [rng.getrandbits(64) for _ in range(_ROUNDS)]
+        # the domain is less than four times size, so this loops < 4 times on average
+        index = self._permute(self._next)
+        while index >= self._size:
+            index = self._permute(index)
+        self._next += 1
+        return index
+
+
+def luhn_digit(digits: str) -> str:
+    """Check digit that makes `digits` + it pass the Luhn test."""
+    total = 0
+    for i, ch in enumerate(reversed(digits)):
+        d = int(ch)
+        if i % 2 == 0:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return str(-total % 10)
+
+
+def inn10_digit(digits: str) -> str:
+    """Check digit of a 10-digit (legal entity) INN for its first nine digits."""
+    return str(sum(int(d) * w for d, w in zip(digits, (2, 4, 10, 3, 5, 9, 4, 6, 8))) % 11 % 10)
+
+
+def snils_checksum(digits: str) -> Optional[str]:
+    """
+    Two check digits of a SNILS for its first nine digits, or None when the
+    sum leaves remainder 100 - such numbers are not accepted by the SNILS
+    recognizer (petrovna), so allocation skips them.
+    """
+    total = sum(int(d) * (9 - i) for i, d in enumerate(digits))
+    if total in (100, 101):
+        return "00"
+    check = total % 101 if total > 101 else total
+    return None if check == 100 else "%02d" % check
@@ -0,0 +1,127 @@
+from collections import deque
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class FakeReservoir:
+    """
+    Pre-generated, pre-hashed fake values per (fakers module, locale, fake
+    function), drawn by FakerContext wrappers instead of calling Faker and
+    hashing on the request path.
+
+    `register(key, generate, fake_hash)` adds a pool; one background thread
+    tops every pool that falls below `low_watermark` back up to
+    `high_watermark`. `take(key)` pops a `(fake, hash)` pair in O(1), or
+    returns None when the pool is empty - a miss, after which the caller
+    generates inline. Only fakers that ignore their input value can be
+    pre-generated; all built-in ones do. Safe to share between sessions and
+    processors; the owner calls `close()`.
+    """
+
+    def __init__(self, low_watermark: int = 16, high_watermark: int = 64):
+        if low_watermark < 0:
+            raise ValueError("FakeReservoir low_watermark must not be negative")
+        if high_watermark <= low_watermark:
+            raise ValueError("FakeReservoir high_watermark must exceed low_watermark")
+        self._low = low_watermark
+        self._high = high_watermark
+        self._pools: Dict[Hashable, deque] = {}
+        self._sources: Dict[Hashable, Tuple[Callable[[], str], Callable[[str], str]]] = {}
+        self._misses: Dict[Hashable, int] = {}
+        self._lock = Lock()
+        self._wakeup = Event()
+        self._worker = None
+        self._closing = False
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.errors = 0
+
+    def register(self, key: Hashable, generate: Callable[[], str], fake_hash: Callable[[str], str]) -> None:
+        """Add a pool filled with `generate()` values keyed by `fake_hash`; the first registration of `key` wins."""
+        if key in self._sources:
+            return
+        with self._lock:
+            if key in self._sources:
+                return
+            self._sources[key] = (generate, fake_hash)
+            self._pools[key] = deque()
+            self._misses[key] = 0
+            if self._worker is None and not self._closing:
+                self._worker = Thread(target=self._run, name="palimpsest-fake-reservoir", daemon=True)
+                self._worker.start()
+        self._wakeup.set()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._sources
+
+    def take(self, key: Hashable) -> Optional[Tuple[str, str]]:
+        """A pre-generated `(fake, hash)` of pool `key`, or None on a miss."""
+        pool = self._pools.get(key)
+        if pool is None:
+            return None
+        try:
+            drawn = pool.popleft()
+        except IndexError:
+            drawn = None
+        with self._lock:
+            if drawn is None:
+                self.misses += 1
+                self._misses[key] += 1
+            else:
+                self.hits += 1
+        if len(pool) < self._low:
+            self._wakeup.set()
+        return drawn
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "generated": self.generated,
+                "errors": self.errors,
+                "low_watermark": self._low,
+                "high_watermark": self._high,
+                "pools": {
+                    key: {"size": len(pool), "misses": self._misses[key]}
+                    for key, pool in self._pools.items()
+                },
+            }
+
+    def close(self) -> None:
+        """Stop refilling; values already pooled can still be taken."""
+        with self._lock:
+            self._closing = True
+            worker, self._worker = self._worker, None
+        self._wakeup.set()
+        if worker is not None:
+            worker.join()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._closing:
+                return
+            with self._lock:
+                sources = list(self._sources.items())
+            for key, (generate, fake_hash) in sources:
+                pool = self._pools[key]
+                if len(pool) >= self._low:
+                    continue
+                while len(pool) < self._high and not self._closing:
+                    try:
+                        fake = generate()
+                        pool.append((fake, fake_hash(fake)))
+                    except Exception:
+                        # the request path generates inline and surfaces the error there
+                        logger.warning(f"Fake reservoir could not refill {key!r}", exc_info=True)
+                        with self._lock:
+                            self.errors += 1
+                        break
+                    with self._lock:
+                        self.generated += 1
@@ -3,23 +3,71 @@ logger = logging.getLogger(__name__)
 
 import inspect
 import functools
-from typing import Callable
+import re
+from contextlib import contextmanager
+from typing import Callable, Iterable
 
+from faker import Faker
 from rapidfuzz import fuzz, process
 
-from .faker_utils import calc_hash, normalize_phone
+from .faker_utils import calc_hash, calc_hashes, normalize_phone
+from .allocators import IndexAllocator
 from .fakers_funcs import fake_factory
+from .fake_reservoir import FakeReservoir
 
 from ..utils.addr_unifier import unify_address
+from ..utils.aho_corasick import AhoCorasick
 
 MAX_FAKE_GENERATION_ATTEMPTS = 10
 
+def _reservoir_calc_hash(fake: str) -> str:
+    # looked up per call, so a patched calc_hash also keys the pooled fakes
+    return calc_hash(fake)
+
+def _call_with_faker(module, faker, func: Callable[[str], str], value: str) -> str:
+    """Call a fakers-module function with `faker` bound, when the module binds Fakers at all."""
+    bind_faker = getattr(module, "bind_faker", None)
+    reset_faker = getattr(module, "reset_faker", None)
+    if bind_faker is None or reset_faker is None:
+        return func(value)
+
+    token = bind_faker(faker)
+    try:
+        return func(value)
+    finally:
+        reset_faker(token)
+
+class _ReservoirSource:
+    """
+    Refill generator of one reservoir pool. It owns a Faker of its own, so the
+    background thread never draws from the random stream of a request-path
+    Faker; the instance is built on the first refill, in the reservoir thread.
+    """
+    def __init__(self, module, locale: str, func: Callable[[str], str], seed=None):
+        self._module = module
+        self._locale = locale
+        self._func = func
+        self._seed = seed
+        self._faker = None
+
+    def __call__(self) -> str:
+        if self._faker is None and hasattr(self._module, "bind_faker"):
+            faker = Faker(locale=self._locale)
+            # seeded with a value drawn from a seeded context, fresh entropy otherwise
+            faker.seed_instance(self._seed)
+            self._faker = faker
+        return _call_with_faker(self._module, self._faker, self._func, "")
+
 class FakerContext:
     """
     A context that finds every function named fake_* in the fakers module
     and turns it into a method which records into context-local maps.
+    With a `FakeReservoir`, the generic and phone wrappers draw pre-generated
+    fakes from it and generate inline only on a miss. Fakers listed in the
+    module's ALLOCATED_FAKERS render a fresh number of their value space
+    instead, which is unique within the context by construction.
     """
-    def __init__(self, module=None, locale = "ru_RU"):
+    def __init__(self, module=None, locale = "ru_RU", reservoir: FakeReservoir = None):
         # if you do not pass a module, we introspect the current one
         if module is None:
             from . import fakers_funcs as module
@@ -29,6 +77,8 @@ class FakerContext:
             "ru": fake_factory(locale="ru_RU"),
             "en": fake_factory(locale="en_US"),
         }
+        self._locale_names = {"default": locale.replace("-", "_"), "ru": "ru_RU", "en": "en_US"}
+        self._reservoir = reservoir
         self._fake_func_locale = {
             "fake_ru_bank_account": "ru",
             "fake_ru_passport": "ru",
@@ -36,10 +86,18 @@ class FakerContext:
             "fake_ru_address": "ru",
             "fake_card": "en",
         }
+        # numbered value spaces of the structured fakers, one allocator per space
+        self._allocated = getattr(module, "ALLOCATED_FAKERS", {})
+        self._allocators: dict[str, IndexAllocator] = {}
 
         # each context gets its own two maps
         self._true: dict[str, dict] = {}
         self._faked: dict[str, dict] = {}
+        # hashes of the values being anonymized, see precomputed_hashes()
+        self._hashes: dict[str, str] = {}
+        # automata over the exact fakes and over their word stems
+        self._fake_index = AhoCorasick()
+        self._stem_index = AhoCorasick(word_boundaries=False)
 
         # wrap & bind every fake_* as an instance method
         phone_func = None
@@ -47,6 +105,8 @@ class FakerContext:
         for name, func in inspect.getmembers(module, inspect.isfunction):
             if name == "fake_factory":
                 continue
+            if name in self._allocated:
+                func = self._allocated_func(name, func)
             if name == "fake_phone":
                 phone_func = func
                 continue
@@ -68,7 +128,50 @@ class FakerContext:
     def reset(self):
         self._true: dict[str, dict] = {}
         self._faked: dict[str, dict] = {}
+        # a fresh numbering, so a reset context allocates like a new one
+        self._allocators = {}
+        self._hashes = {}
+        self._fake_index = AhoCorasick()
+        self._stem_index = AhoCorasick(word_boundaries=False)
+
+    def _record_fake(self, fake_hash: str, entry: dict):
+        """Register a generated fake for hash lookup and for text scanning."""
+        self._faked[fake_hash] = entry
+        self._fake_index.add(entry["fake"], entry)
+        for word in re.findall(r"\w{3,}", entry["fake"]):
+            # inflection changes word endings, so keep the head of each word
+            self._stem_index.add(word[:max(3, len(word) - 3)].lower())
+
+    def find_fakes(self, text: str, start: int = 0) -> list[tuple[int, int, dict]]:
+        """Leftmost-longest occurrences of known fakes as `(start, end, entry)`."""
+        return self._fake_index.find(text, start)
+
+    def fake_prefix_length(self, text: str) -> int:
+        """Length of the text suffix that could still be the beginning of a known fake."""
+        return self._fake_index.open_prefix(text)
+
+    def has_fake_stem(self, text: str) -> bool:
+        """True when text contains the stem of a word of some known fake."""
+        return bool(self._stem_index.find(text.lower()))
+
+    @contextmanager
+    def precomputed_hashes(self, values: Iterable[str]):
+        """
+        Hash all `values` of a document in one batched calc_hashes call; the
+        fake_* wrappers called inside the block reuse these hashes instead of
+        hashing each value on its own.
+        """
+        values = [value for value in dict.fromkeys(values) if value != "PII"]
+        previous = self._hashes
+        self._hashes = {**previous, **dict(zip(values, calc_hashes(values)))}
+        try:
+            yield self
+        finally:
+            self._hashes = previous
 
+    def _hash(self, value: str) -> str:
+        h = self._hashes.get(value)
+        return calc_hash(value) if h is None else h
 
 
     def _generate_unique_fake(
@@ -77,10 +180,15 @@ class FakerContext:
         func: Callable[[str], str],
         fake_hash_func: Callable[[str], str],
         build_entry: Callable[[str], dict],
+        reservoir_key=None,
     ) -> tuple[str, str, dict]:
         for _ in range(MAX_FAKE_GENERATION_ATTEMPTS):
-            fake_val = func(value)
-            fake_hash = fake_hash_func(fake_val)
+            drawn = self._reservoir.take(reservoir_key) if reservoir_key is not None else None
+            if drawn is None:
+                fake_val = func(value)
+                fake_hash = fake_hash_func(fake_val)
+            else:
+                fake_val, fake_hash = drawn
             if fake_hash not in self._faked:
                 return fake_val, fake_hash, build_entry(fake_val)
 
@@ -96,16 +204,46 @@ class FakerContext:
         return self._faker_by_locale[locale_key]
 
     def _call_fake_func(self, name: str, func: Callable[[str], str], value: str) -> str:
-        bind_faker = getattr(self._module, "bind_faker", None)
-        reset_faker = getattr(self._module, "reset_faker", None)
-        if bind_faker is None or reset_faker is None:
-            return func(value)
+        return _call_with_faker(self._module, self._faker_for_function(name), func, value)
+
+    def _allocator(self, name: str) -> IndexAllocator:
+        """The allocator of the ALLOCATED_FAKERS space of `name`, created on first use."""
+        space, size, _ = self._allocated[name]
+        allocator = self._allocators.get(space)
+        if allocator is None:
+            # seeding the Faker makes the numbering reproducible
+            allocator = IndexAllocator(size, getattr(self._faker_for_function(name), "random", None))
+            self._allocators[space] = allocator
+        return allocator
+
+    def _allocated_func(self, name: str, func: Callable[[str], str]) -> Callable[[str], str]:
+        """`func` replaced by a render of the next free number of its ALLOCATED_FAKERS space."""
+        render = self._allocated[name][2]
 
-        token = bind_faker(self._faker_for_function(name))
-        try:
-            return func(value)
-        finally:
-            reset_faker(token)
+        @functools.wraps(func)
+        def allocated(value: str) -> str:
+            # looked up per call, so reset() starts a new numbering
+            return render(self._allocator(name))
+        return allocated
+
+    def _reserve(self, name: str, func: Callable[[str], str], fake_hash: Callable[[str], str]):
+        """
+        Pool key of `func` in the reservoir, or None without a reservoir. The
+        pool is registered on the first fake an entity type needs, so only
+        fakers the runtime actually uses are pre-generated.
+        """
+        if self._reservoir is None or name in self._allocated:
+            # pooled fakes would bypass the allocator and could collide again
+            return None
+        locale_key = self._fake_func_locale.get(name, "default")
+        key = (self._module.__name__, self._locale_names[locale_key], name)
+        if key not in self._reservoir:
+            # the pool outlives this context, so its generator must not reference it
+            faker = self._faker_by_locale[locale_key]
+            seed = faker.random.getrandbits(64) if getattr(faker, "_is_seeded", False) else None
+            generate = _ReservoirSource(self._module, self._locale_names[locale_key], func, seed)
+            self._reservoir.register(key, generate, fake_hash)
+        return key
 
     def _wrap(self, name, func):
         """Return a wrapper around func(value: str)->str that records into our maps."""
@@ -115,7 +253,7 @@ class FakerContext:
             if value == "PII":
                 return value
 
-            h = calc_hash(value)
+            h = self._hash(value)
             if h in self._true:
                 # already faked this exact true value
                 return self._true[h]["fake"]
@@ -125,13 +263,17 @@ class FakerContext:
                 lambda source: self._call_fake_func(name, func, source),
                 calc_hash,
                 lambda fake: {"true": value, "fake": fake},
+                self._reserve(name, func, _reservoir_calc_hash),
             )
 
             # record forward and backward
             self._true[h] = entry
-            self._faked[fake_hash] = entry
+            self._record_fake(fake_hash, entry)
 
             return fake_val
+
+        # the runtime batches the hashing of values bound for this wrapper
+        wrapper.hash_keyed = True
         return wrapper
     
     def _wrap_phone(self, name, func):
@@ -150,10 +292,11 @@ class FakerContext:
                 lambda source: self._call_fake_func(name, func, source),
                 self.phone_hash,
                 lambda fake: {"true": value, "fake": fake},
+                self._reserve(name, func, normalize_phone),
             )
 
             self._true[h] = entry
-            self._faked[fake_hash] = entry
+            self._record_fake(fake_hash, entry)
 
             return fake_val
         return wrapper
@@ -184,7 +327,7 @@ class FakerContext:
             )
 
             self._true[h] = {**entry, "fuzzy_key": source_fuzzy_key}
-            self._faked[fake_hash] = entry
+            self._record_fake(fake_hash, entry)
             return fake_val
         return wrapper
 
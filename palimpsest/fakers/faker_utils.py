@@ -1,14 +1,89 @@
+import os
+import re
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+from threading import Lock
+
 import logging
 logger = logging.getLogger(__name__)
 
-import pymorphy3
 from .names_morph import get_morphs
+from .name_lexicon import get_lexicon
+from ..model_registry import morph_analyzer
+
+# Bound of the process-wide calc_hash memo, shared by every FakerContext
+HASH_CACHE_SIZE = int(os.environ.get("PALIMPSEST_HASH_CACHE_SIZE", "65536"))
+# Lemmas behind calc_hash: "spacy" (ru_core_news_sm, the reference) or "light"
+# (blank tokenizer + pymorphy3, see benchmarks/bench_calc_hash.py)
+HASH_BACKEND = os.environ.get("PALIMPSEST_HASH_BACKEND", "spacy")
+if HASH_BACKEND not in ("spacy", "light"):
+    raise ValueError(f"PALIMPSEST_HASH_BACKEND must be 'spacy' or 'light', got {HASH_BACKEND!r}")
+# bump when calc_hash output changes without a backend or dependency change
+CALC_HASH_VERSION = 2
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class _HashMemo:
+    """
+    The process-wide LRU of calc_hash keys. calc_hash and calc_hashes both
+    read and fill it, so a value hashed by either is never piped again.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._keys = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, texts):
+        """Known keys of the distinct `texts`, by text; counts hits and misses."""
+        found = {}
+        with self._lock:
+            for text in texts:
+                key = self._keys.get(text)
+                if key is None:
+                    self.misses += 1
+                else:
+                    self._keys.move_to_end(text)
+                    self.hits += 1
+                    found[text] = key
+        return found
+
+    def store(self, keys: dict) -> None:
+        with self._lock:
+            for text, key in keys.items():
+                self._keys[text] = key
+                self._keys.move_to_end(text)
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._keys))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+            self.hits = self.misses = 0
+
+
+_hash_memo = _HashMemo(HASH_CACHE_SIZE)
 
 _nlp = None  # spaCy model, loaded once
-_morph = pymorphy3.MorphAnalyzer(lang='ru')
+_tokenizer = None  # blank spaCy Russian tokenizer, loaded once
+_morph = morph_analyzer()
+
+# pymorphy3 parts of speech spaCy's Russian lemmatizer treats as open classes
+# (ADJ, DET, NOUN, NUM, PRON, PROPN, VERB)
+_OPEN_POS = {"NOUN", "ADJF", "ADJS", "COMP", "VERB", "INFN", "PRTF", "PRTS", "GRND", "NUMR", "NPRO"}
+_NAME_TAGS = {"Name", "Surn", "Patr"}
+VOWELS = set("АЕЁИОУЫЭЮЯаеёиоуыэюя")
+_CYRILLIC = re.compile("[А-Яа-яЁё]")
 
 def get_nlp():
-    """Lazily load and return the shared spaCy Russian pipeline."""
+    """Lazily load and return the full spaCy Russian pipeline behind the default calc_hash."""
     global _nlp
     if _nlp is None:
         import spacy
@@ -18,6 +93,15 @@ def get_nlp():
         _nlp = spacy.load("ru_core_news_sm")
     return _nlp
 
+def get_tokenizer():
+    """Lazily load and return the shared blank spaCy Russian tokenizer; nothing to download."""
+    global _tokenizer
+    if _tokenizer is None:
+        import spacy
+
+        _tokenizer = spacy.blank("ru").tokenizer
+    return _tokenizer
+
 def normalize_phone(raw: str, default_country: str = "99", default_city: str = "999") -> str:
     """
     Normalize phone to digits-only form.
@@ -63,31 +147,133 @@ def normalize_phone(raw: str, default_country: str = "99", default_city: str = "
 
     return f"{country}{city}{local}"
 
+def strip_vowels(word: str) -> str:
+    while word and word[-1] in VOWELS:
+        word = word[:-1]
+    return word
+
+def alnum(s: str) -> str:
+    alfanum = ''.join(ch if (ch.isalnum() or ch.isspace()) else " " for ch in s)
+
+    words = alfanum.split()
+    #stripped = [strip_vowels(w) for w in words]
+    stripped = [w for w in words]
+    return " ".join(stripped)
+
+def normalyze_lemma(lemma):
+    parse = _morph.parse(lemma)[0]
+    form = parse.inflect({"nomn", "sing", "masc"})
+    return form.word if form else lemma
+
+def light_lemma(word):
+    """
+    Lemma of one token without a tagger, following spaCy's Russian pymorphy3
+    lemmatizer: open classes take the normal form of the most probable known
+    analysis, unknown words are lowercased, closed classes keep a unique
+    normal form or the word itself.
+
+    A word read as a first name, surname or patronymic takes the normal form
+    of its best declinable name analysis, so "Анне" is "анна" although
+    pymorphy3 ranks the indeclinable name "Анне" first.
+    """
+    parses = _morph.parse(word)
+    known = [parse for parse in parses if parse.is_known]
+    if not known:
+        return word.lower()
+    if known[0].tag.grammemes & _NAME_TAGS:
+        declinable = [
+            parse for parse in known
+            if parse.tag.grammemes & _NAME_TAGS and "Fixd" not in parse.tag
+        ]
+        return (declinable or known)[0].normal_form
+    if known[0].tag.POS in _OPEN_POS:
+        return known[0].normal_form
+    normal_forms = {parse.normal_form for parse in parses}
+    return normal_forms.pop() if len(normal_forms) == 1 else word
+
+@lru_cache(maxsize=HASH_CACHE_SIZE)
+def _token_key(word):
+    return normalyze_lemma(light_lemma(word))
+
+def _spacy_key(doc):
+    return alnum("".join(normalyze_lemma(token.lemma_) for token in doc))
+
+def _light_key(doc):
+    return alnum("".join(_token_key(token.text) for token in doc))
+
 def calc_hash(text):
-    VOWELS = set("АЕЁИОУЫЭЮЯаеёиоуыэюя")
-    def alnum(s: str) -> str:
-        def strip_vowels(word: str) -> str:
-            while word and word[-1] in VOWELS:
-                word = word[:-1]
-            return word
-        alfanum = ''.join(ch if (ch.isalnum() or ch.isspace()) else " " for ch in s)   
-
-        words = alfanum.split()
-        #stripped = [strip_vowels(w) for w in words]
-        stripped = [w for w in words]
-        return " ".join(stripped)
-    
-    def normalyze_lemma(lemma):
-        parse = _morph.parse(lemma)[0]
-        form = parse.inflect({"nomn", "sing", "masc"})
-        return form.word if form else lemma
-
-    nlp = get_nlp()
-    tockens = nlp(text)
-    hash = alnum("".join([normalyze_lemma(token.lemma_) for token in tockens]))
-    return hash
+    """
+    Stable key of `text` for the fake/true maps: the tokens' lemmas in the
+    nominative singular masculine, joined, with punctuation removed.
+
+    Lemmas come from `HASH_BACKEND`. Results are memoized in a bounded LRU
+    (`HASH_CACHE_SIZE`) shared by all sessions of the process and by
+    calc_hashes; inspect it with `calc_hash.cache_info()`.
+    """
+    key = _hash_memo.lookup([text]).get(text)
+    if key is None:
+        key = calc_hash_light(text) if HASH_BACKEND == "light" else calc_hash_spacy(text)
+        _hash_memo.store({text: key})
+    return key
+
+calc_hash.cache_info = _hash_memo.cache_info
+calc_hash.cache_clear = _hash_memo.cache_clear
+
+def calc_hashes(texts):
+    """
+    calc_hash of every text, in order, computed in one pass: identical texts
+    are hashed once, texts already in the calc_hash memo are not hashed
+    again, and the rest go through one `pipe` call of the backend. New keys
+    are added to the memo.
+    """
+    unique = list(dict.fromkeys(texts))
+    hashes = _hash_memo.lookup(unique)
+    missing = [text for text in unique if text not in hashes]
+    if missing:
+        if HASH_BACKEND == "light":
+            docs, key = get_tokenizer().pipe(missing), _light_key
+        else:
+            docs, key = get_nlp().pipe(missing), _spacy_key
+        computed = {text: key(doc) for text, doc in zip(missing, docs)}
+        _hash_memo.store(computed)
+        hashes.update(computed)
+    return [hashes[text] for text in texts]
+
+def calc_hash_spacy(text):
+    """The key over the full ru_core_news_sm pipeline; the reference the light backend is benchmarked against."""
+    return _spacy_key(get_nlp()(text))
+
+def calc_hash_light(text):
+    """The key from the blank spaCy tokenizer plus pymorphy3 only; token lemmas are memoized."""
+    return _light_key(get_tokenizer()(text))
+
+def calc_hash_fingerprint():
+    """What calc_hash keys depend on: CALC_HASH_VERSION, the backend, and the versions of its packages and models."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    packages = ["pymorphy3", "pymorphy3-dicts-ru", "spacy"]
+    if HASH_BACKEND == "spacy":
+        packages.append("ru_core_news_sm")
+    parts = [f"calc_hash {CALC_HASH_VERSION}", HASH_BACKEND]
+    for package in packages:
+        try:
+            parts.append(f"{package} {version(package)}")
+        except PackageNotFoundError:
+            parts.append(f"{package} missing")
+    return ";".join(parts)
 
 def validate_name(name):
+    known = None
+    if _CYRILLIC.search(name):
+        # the table holds Faker's ru_RU names only
+        try:
+            lexicon = get_lexicon()
+            known = lexicon.validity(name) if lexicon is not None else None
+        except Exception:
+            # get_lexicon logged why; decline and hash instead
+            pass
+    if known is not None:
+        return known
     try:
         forms = get_morphs(name)
         hash_nom = calc_hash(name)
@@ -1,11 +1,14 @@
 import logging
 logger = logging.getLogger(__name__)
 
+import ipaddress
 from contextvars import ContextVar, Token
 
 from faker import Faker
 
+from .allocators import inn10_digit, luhn_digit, snils_checksum
 from .faker_utils import validate_name
+from .name_lexicon import get_lexicon
 
 _current_faker: ContextVar[Faker | None] = ContextVar(
     "palimpsest_current_faker",
@@ -58,7 +61,30 @@ def fake_passport(x):
 def fake_ru_passport(x):
     return fake.numerify("#### ######")
 
+def _ru_lexicon():
+    """The precomputed name table when the bound Faker draws from its ru_RU lists and the table is available, else None."""
+    if fake.locales != ["ru_RU"]:
+        return None
+    try:
+        # None while the table is still being built
+        return get_lexicon()
+    except Exception:
+        # get_lexicon logged why; the fakers validate candidates instead
+        return None
+
+def _lexicon_name(role, gender=None):
+    """A random valid name of `role` from the table, or None when there is none to draw from."""
+    lexicon = _ru_lexicon()
+    names = lexicon.names(role, gender) if lexicon is not None else ()
+    return fake.random_element(names) if names else None
+
 def fake_name(x):
+    first = _lexicon_name("first")
+    if first is not None:
+        gender = next(e.gender for e in _ru_lexicon().lookup(first, "first") if e.valid)
+        last = _lexicon_name("last", gender)
+        if last is not None:
+            return first + " " + last
     attempts = 10
     while attempts > 0:
         name = fake.first_name() + " " + fake.last_name()
@@ -72,6 +98,9 @@ def fake_ru_name(x):
     return fake.first_name() + " " + fake.last_name()
 
 def fake_first_name(x):
+    name = _lexicon_name("first")
+    if name is not None:
+        return name
     attempts = 10
     while attempts > 0:
         name = fake.first_name()
@@ -84,6 +113,9 @@ def fake_middle_name(x):
     return fake.middle_name()
 
 def fake_last_name(x):
+    name = _lexicon_name("last")
+    if name is not None:
+        return name
     attempts = 10
     while attempts > 0:
         name = fake.last_name()
@@ -136,3 +168,71 @@ def fake_url(x):
 
 def fake_organization(x):
     return fake.company()
+
+def _stamp(template, number, width):
+    """`template` with its last `width` digits replaced by `number`, zero-padded; the rest of the format is kept."""
+    digits = list("%0*d" % (width, number))
+    chars = list(template)
+    for i in range(len(chars) - 1, -1, -1):
+        if not digits:
+            break
+        if chars[i].isdigit():
+            chars[i] = digits.pop()
+    if digits:
+        raise ValueError(f"Fake template {template!r} has fewer than {width} digits")
+    return "".join(chars)
+
+def _allocated_phone(next_index):
+    # normalize_phone keys on the last seven digits, the local number
+    return _stamp(fake_phone(""), next_index(), 7)
+
+def _allocated_card(next_index):
+    digits = "4%014d" % next_index()
+    return digits + luhn_digit(digits)
+
+def _allocated_inn(next_index):
+    # region 01-92, inspection 01-99 and record 00001-99999, as Faker draws them
+    region, rest = divmod(next_index(), 99 * 99999)
+    inspection, record = divmod(rest, 99999)
+    digits = "%02d%02d%05d" % (region + 1, inspection + 1, record + 1)
+    return digits + inn10_digit(digits)
+
+SNILS_FIRST = 1001999  # numbers up to 001-001-998 are never issued
+
+def _allocated_snils(next_index):
+    while True:
+        digits = "%09d" % (SNILS_FIRST + next_index())
+        checksum = snils_checksum(digits)
+        if checksum is not None:
+            return digits + checksum
+
+def _allocated_passport(next_index):
+    return _stamp(fake_passport(""), next_index(), 8)
+
+def _allocated_ru_passport(next_index):
+    return _stamp(fake_ru_passport(""), next_index(), 8)
+
+def _allocated_account(next_index):
+    return _stamp(fake_account(""), next_index(), 12)
+
+def _allocated_ip(next_index):
+    while True:
+        address = ipaddress.IPv4Address(next_index())
+        if address.is_global:
+            return str(address)
+
+# Fakers of structured types whose value space is numbered: name -> (space,
+# size, render). FakerContext gives every space one IndexAllocator per session
+# and calls render(next_index) instead of the fake_* function, so these fakes
+# never collide and never retry. Fakers sharing a space share its numbers.
+ALLOCATED_FAKERS = {
+    "fake_phone": ("phone", 10**7, _allocated_phone),
+    "fake_card": ("card", 10**14, _allocated_card),
+    "fake_inn": ("inn", 92 * 99 * 99999, _allocated_inn),
+    "fake_snils": ("snils", 10**9 - SNILS_FIRST, _allocated_snils),
+    "fake_passport": ("passport", 10**8, _allocated_passport),
+    "fake_ru_passport": ("passport", 10**8, _allocated_ru_passport),
+    "fake_account": ("account", 10**12, _allocated_account),
+    "fake_ru_bank_account": ("account", 10**12, _allocated_account),
+    "fake_ip": ("ip", 2**32, _allocated_ip),
+}
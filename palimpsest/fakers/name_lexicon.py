@@ -0,0 +1,283 @@
+"""
+Precomputed morphology table of the Faker ru_RU first and last names.
+
+Every name of Faker's gendered ru_RU lists is declined once (six singular and
+six plural cases, see `get_part_morphs`) and hashed with `calc_hash`. A name is
+valid when all its forms hash to the same key, i.e. a declined occurrence of
+the fake in an LLM answer still restores to the true value. The table is built
+at install/deploy time with
+
+    python -m palimpsest.fakers.name_lexicon [path]
+
+and stored as one memory-mapped file. It is never built on a request path:
+without the file, `get_lexicon` returns None (callers validate candidates
+instead) and builds it in a background thread, unless
+PALIMPSEST_NAME_LEXICON_AUTOBUILD=0. The file layout is
+
+    magic (8 bytes) | record count (uint32) | padding (4 bytes) | record offsets (uint32 * (count + 1)) | records
+
+Each record is UTF-8 `role, name, gender, valid, hash, 12 forms` joined by
+`\\x1f`, sorted by (role, name, gender) so lookups binary-search the mapped
+file without decoding it.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from bisect import bisect_left
+from pathlib import Path
+from threading import Lock, Thread
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import logging
+logger = logging.getLogger(__name__)
+
+# bump when the record layout changes; calc_hash changes are covered by its fingerprint
+FORMAT_VERSION = 1
+NAME_LEXICON_DIR = os.environ.get("PALIMPSEST_NAME_LEXICON_DIR", "~/.cache/palimpsest/names")
+# build a missing table in a background thread; "0" leaves it to the CLI step
+NAME_LEXICON_AUTOBUILD = os.environ.get("PALIMPSEST_NAME_LEXICON_AUTOBUILD", "1") != "0"
+ROLES = ("first", "last")
+GENDERS = ("male", "female")
+
+_MAGIC = b"PALNAME" + bytes([FORMAT_VERSION])
+_HEADER = struct.Struct("=8sI4x")  # 16 bytes, keeps the offsets aligned
+_SEP = "\x1f"
+
+
+class NameEntry(NamedTuple):
+    role: str
+    name: str
+    gender: str
+    valid: bool
+    hash: str
+    forms: Tuple[str, ...]
+
+
+def faker_name_lists() -> Dict[Tuple[str, str], Tuple[str, ...]]:
+    """Faker's ru_RU name vocabularies by (role, gender)."""
+    from faker.providers.person.ru_RU import Provider
+
+    return {
+        (role, gender): tuple(getattr(Provider, f"{role}_names_{gender}"))
+        for role in ROLES
+        for gender in GENDERS
+    }
+
+
+def lexicon_path(lists: Dict[Tuple[str, str], Tuple[str, ...]] = None) -> Path:
+    """
+    Default file of the table for `lists`. The name digests the lists and the
+    `calc_hash_fingerprint`, so a Faker, pymorphy3, spaCy model, or calc_hash
+    change gets a new file instead of a stale table.
+    """
+    from .faker_utils import calc_hash_fingerprint
+
+    digest = hashlib.sha256(_MAGIC)
+    digest.update(calc_hash_fingerprint().encode("utf-8"))
+    for key, names in sorted((lists or faker_name_lists()).items()):
+        digest.update(_SEP.join((*key, *names)).encode("utf-8"))
+        digest.update(b"\0")
+    return Path(os.path.expanduser(NAME_LEXICON_DIR)) / f"ru_RU-{digest.hexdigest()[:16]}.lex"
+
+
+def _entries(lists, hash_fn: Callable[[str], str]) -> List[NameEntry]:
+    from pytrovich.enums import Gender, NamePart
+
+    from .names_morph import get_part_morphs
+
+    parts = {"first": NamePart.FIRSTNAME, "last": NamePart.LASTNAME}
+    genders = {"male": Gender.MALE, "female": Gender.FEMALE}
+    entries = []
+    for (role, gender), names in lists.items():
+        for name in dict.fromkeys(names):
+            morphs = get_part_morphs(name, parts[role], genders[gender])
+            forms = (*morphs["singular"].values(), *morphs["plural"].values())
+            key = hash_fn(name)
+            valid = all(hash_fn(form) == key for form in forms)
+            entries.append(NameEntry(role, name, gender, valid, key, forms))
+    entries.sort(key=lambda entry: (entry.role, entry.name, entry.gender))
+    return entries
+
+
+def build_lexicon(path=None, lists=None, hash_fn: Callable[[str], str] = None) -> Path:
+    """
+    Decline, hash, and validate every name of `lists` (default: Faker's ru_RU
+    lists) and write the table to `path`. The file is written next to its
+    destination and moved in with `os.replace`, so readers never map a
+    partial table.
+    """
+    if hash_fn is None:
+        from .faker_utils import calc_hash as hash_fn
+    lists = lists or faker_name_lists()
+    path = Path(path) if path else lexicon_path(lists)
+    records = [
+        _SEP.join((e.role, e.name, e.gender, "1" if e.valid else "0", e.hash, *e.forms)).encode("utf-8")
+        for e in _entries(lists, hash_fn)
+    ]
+    offsets = [0]
+    for record in records:
+        offsets.append(offsets[-1] + len(record))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, scratch = tempfile.mkstemp(prefix=path.name + ".", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, len(records)))
+            file.write(struct.pack(f"={len(offsets)}I", *offsets))  # native order, read back with cast("I")
+            file.write(b"".join(records))
+        os.replace(scratch, path)
+    except BaseException:
+        os.unlink(scratch)
+        raise
+    logger.info(f"Wrote name lexicon with {len(records)} names to {path}")
+    return path
+
+
+class NameLexicon:
+    """
+    Read-only view of a table written by `build_lexicon`. Lookups decode only
+    the records they touch; the valid-name lists for generation are decoded
+    once per (role, gender).
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            self._map.close()
+            raise ValueError(f"{self.path} is not a name lexicon of format {FORMAT_VERSION}")
+        self._offsets = memoryview(self._map)[_HEADER.size:_HEADER.size + 4 * (self._count + 1)].cast("I")
+        self._base = _HEADER.size + 4 * (self._count + 1)
+        self._names: Dict[Tuple[str, Optional[str]], Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _raw(self, index: int) -> bytes:
+        return self._map[self._base + self._offsets[index]:self._base + self._offsets[index + 1]]
+
+    def _entry(self, index: int) -> NameEntry:
+        role, name, gender, valid, key, *forms = self._raw(index).decode("utf-8").split(_SEP)
+        return NameEntry(role, name, gender, valid == "1", key, tuple(forms))
+
+    def _key(self, index: int) -> Tuple[str, str]:
+        role, name, _ = self._raw(index).split(_SEP.encode(), 2)
+        return role.decode("utf-8"), name.decode("utf-8")
+
+    def lookup(self, name: str, role: str) -> List[NameEntry]:
+        """Entries of `name` in `role` ("first" or "last"), one per gender list it occurs in."""
+        lo = bisect_left(range(self._count), (role, name), key=self._key)
+        entries = []
+        while lo < self._count and self._key(lo) == (role, name):
+            entries.append(self._entry(lo))
+            lo += 1
+        return entries
+
+    def names(self, role: str, gender: str = None) -> Tuple[str, ...]:
+        """Valid names of `role`, of one gender or (None) of both, in table order."""
+        names = self._names.get((role, gender))
+        if names is None:
+            names = tuple(
+                entry.name
+                for entry in map(self._entry, range(self._count))
+                if entry.role == role and entry.valid and gender in (None, entry.gender)
+            )
+            self._names[(role, gender)] = names
+        return names
+
+    def validity(self, full_name: str) -> Optional[bool]:
+        """
+        Whether a single name or a "First Last" name hashes consistently across its
+        declensions, or None when a part is not in the table. Both parts must
+        be valid in the gender of the first name, since that gender is what
+        declines the last name.
+        """
+        parts = full_name.split()
+        if len(parts) == 1:
+            entries = self.lookup(parts[0], "first") or self.lookup(parts[0], "last")
+            return any(entry.valid for entry in entries) if entries else None
+        if len(parts) != 2:
+            return None
+        for first in self.lookup(parts[0], "first"):
+            lasts = [last for last in self.lookup(parts[1], "last") if last.gender == first.gender]
+            if lasts:
+                return first.valid and lasts[0].valid
+        return None
+
+    def close(self) -> None:
+        self._offsets.release()
+        self._map.close()
+
+
+_lexicon: Optional[NameLexicon] = None
+_lexicon_error: Optional[Exception] = None
+_lexicon_path: Optional[Path] = None
+_builder: Optional[Thread] = None
+_lexicon_lock = Lock()
+
+
+def _failed(exc: Exception, path) -> Exception:
+    global _lexicon_error
+    exc.add_note(
+        "Palimpsest "
+        "operation=name_lexicon_load "
+        "component=NameLexicon "
+        f"path={str(path)!r}"
+    )
+    _lexicon_error = exc
+    logger.warning(f"Name lexicon {path} is unavailable: {type(exc).__name__}")
+    return exc
+
+
+def _build_in_background(path: Path) -> None:
+    global _lexicon
+    try:
+        build_lexicon(path)
+        lexicon = NameLexicon(path)
+    except Exception as exc:
+        with _lexicon_lock:
+            _failed(exc, path)
+        return
+    with _lexicon_lock:
+        _lexicon = lexicon
+
+
+def get_lexicon() -> Optional[NameLexicon]:
+    """
+    The process-wide table of Faker's ru_RU names, or None while it is not
+    available. A missing file is never built on the calling thread: the first
+    call starts `build_lexicon` in a background thread (see
+    NAME_LEXICON_AUTOBUILD) and later calls return the table once it is
+    written. A failed build or load is logged once and re-raised on every
+    later call without retrying.
+    """
+    global _lexicon, _lexicon_path, _builder
+    with _lexicon_lock:
+        if _lexicon is not None:
+            return _lexicon
+        if _lexicon_error is not None:
+            raise _lexicon_error
+        if _builder is not None:
+            return None
+        path = _lexicon_path
+        try:
+            if path is None:
+                path = _lexicon_path = lexicon_path()
+            if path.exists():
+                _lexicon = NameLexicon(path)
+                return _lexicon
+        except Exception as exc:
+            raise _failed(exc, path)
+        if NAME_LEXICON_AUTOBUILD:
+            logger.info(f"Name lexicon {path} not found; building it in the background")
+            _builder = Thread(target=_build_in_background, args=(path,), name="palimpsest-name-lexicon", daemon=True)
+            _builder.start()
+        return None
+
+
+if __name__ == "__main__":
+    print(build_lexicon(sys.argv[1] if len(sys.argv) > 1 else None))
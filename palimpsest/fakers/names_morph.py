@@ -3,12 +3,29 @@ from pytrovich.enums import NamePart, Gender, Case
 from pytrovich.maker import PetrovichDeclinationMaker
 from pytrovich.detector import PetrovichGenderDetector
 
-import pymorphy3
+from ..model_registry import morph_analyzer
 
 
 _detector = PetrovichGenderDetector()
 _maker    = PetrovichDeclinationMaker()
-_morph    = pymorphy3.MorphAnalyzer()
+_morph    = morph_analyzer()
+
+# oblique cases for pytrovich, and pymorphy grammemes of every case
+_CASES = {
+    "genitive":      Case.GENITIVE,
+    "dative":        Case.DATIVE,
+    "accusative":    Case.ACCUSATIVE,
+    "instrumental":  Case.INSTRUMENTAL,
+    "prepositional": Case.PREPOSITIONAL,
+}
+_PLURAL_FEATS = {
+    "nominative":    set(),
+    "genitive":      {"gent"},
+    "dative":        {"datv"},
+    "accusative":    {"accs"},
+    "instrumental":  {"ablt"},
+    "prepositional": {"loct"},
+}
 
 @lru_cache(maxsize=2048)
 def get_morphs(full_name: str) -> dict[str, dict[str, str]]:
@@ -64,17 +81,8 @@ def get_morphs(full_name: str) -> dict[str, dict[str, str]]:
         singular[cname] = " ".join(p for p in (fn, mn, ln) if p)
 
     # — 2) plural forms via pymorphy2
-    pym_feats = {
-        "nominative":    set(),
-        "genitive":      {"gent"},
-        "dative":        {"datv"},
-        "accusative":    {"accs"},
-        "instrumental":  {"ablt"},
-        "prepositional": {"loct"},
-    }
-
     plural: dict[str, str] = {}
-    for cname, feats in pym_feats.items():
+    for cname, feats in _PLURAL_FEATS.items():
         feats = feats | {"plur"}  # add plural
         declined = []
         for tok in (first, middle, last) if middle else (first, last):
@@ -84,3 +92,17 @@ def get_morphs(full_name: str) -> dict[str, dict[str, str]]:
         plural[cname] = " ".join(declined)
 
     return {"singular": singular, "plural": plural}
+
+def get_part_morphs(name: str, part: NamePart, gender: Gender) -> dict[str, dict[str, str]]:
+    """
+    Decline a single name part (e.g. a first or last name of a known gender)
+    the way get_morphs declines it inside a full name; same return shape.
+    """
+    singular = {"nominative": name}
+    for cname, cenum in _CASES.items():
+        singular[cname] = _maker.make(part, gender, cenum, name)
+    plural: dict[str, str] = {}
+    for cname, feats in _PLURAL_FEATS.items():
+        inf = _morph.parse(name)[0].inflect(feats | {"plur"})
+        plural[cname] = inf.word if inf else name
+    return {"singular": singular, "plural": plural}
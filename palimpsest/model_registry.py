@@ -0,0 +1,98 @@
+"""
+Process-wide registry of heavyweight models shared by all Palimpsest runtimes.
+
+Models are keyed by what identifies their weights (family and path), never by
+entity configuration: runtimes that differ only in `run_entities` get the same
+GLiNER, spaCy, Natasha, and tokenizer objects and filter results instead.
+Each `acquire` adds a reference; the registry drops a model when its last
+reference is released so the weights can be garbage collected.
+"""
+from contextlib import contextmanager
+from threading import RLock, local
+from typing import Any, Callable, Dict, Hashable, List
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._lock = RLock()
+        self._models: Dict[Hashable, list] = {}  # key -> [model, refcount]
+        self._scopes = local()
+
+    def acquire(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Return the model stored under `key`, loading it with `factory` on first
+        use, and add a reference. Inside a `leases()` block the reference is
+        also recorded for that block's owner.
+        """
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is None:
+                logger.info(f"Loading shared model {key!r}")
+                entry = [factory(), 0]
+                self._models[key] = entry
+            entry[1] += 1
+        scopes = getattr(self._scopes, "stack", None)
+        if scopes:
+            scopes[-1].append(key)
+        return entry[0]
+
+    def release(self, key: Hashable) -> None:
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] <= 0:
+                logger.info(f"Unloading shared model {key!r}")
+                del self._models[key]
+
+    def refcount(self, key: Hashable) -> int:
+        with self._lock:
+            entry = self._models.get(key)
+            return entry[1] if entry else 0
+
+    def loaded(self) -> Dict[Hashable, int]:
+        """Currently loaded keys with their reference counts."""
+        with self._lock:
+            return {key: entry[1] for key, entry in self._models.items()}
+
+    @contextmanager
+    def leases(self):
+        """
+        Record every key acquired by this thread inside the block into the
+        yielded list, so its owner can later `release_all` of them. If the
+        block raises, the references taken so far are released.
+        """
+        stack = getattr(self._scopes, "stack", None)
+        if stack is None:
+            stack = self._scopes.stack = []
+        keys: List[Hashable] = []
+        stack.append(keys)
+        try:
+            yield keys
+        except BaseException:
+            self.release_all(keys)
+            raise
+        finally:
+            stack.pop()
+
+    def release_all(self, keys: List[Hashable]) -> None:
+        for key in keys:
+            self.release(key)
+        keys.clear()
+
+
+registry = ModelRegistry()
+acquire = registry.acquire
+release = registry.release
+leases = registry.leases
+
+
+def morph_analyzer():
+    """The process-wide Russian pymorphy3 analyzer (never unloaded)."""
+    import pymorphy3
+
+    return registry.acquire(("pymorphy3", "ru"), lambda: pymorphy3.MorphAnalyzer(lang="ru"))
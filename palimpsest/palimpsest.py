@@ -1,17 +1,26 @@
+import asyncio
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager, nullcontext
 from functools import lru_cache
-from threading import RLock
-from typing import Any, List
+from threading import Lock, RLock
+from typing import Any, AsyncIterable, AsyncIterator, Hashable, Iterable, Iterator, List, Sequence
 from uuid import uuid4
+from weakref import WeakKeyDictionary
 
 from presidio_analyzer import RecognizerResult
 from presidio_anonymizer import AnonymizerEngine, EngineResult
-from presidio_anonymizer.entities import OperatorConfig
+from presidio_anonymizer.entities import OperatorConfig, OperatorResult
 from presidio_anonymizer.operators import Decrypt
 
 from transformers import AutoTokenizer
 
 from .fakers.faker_context import FakerContext
+from .fakers.fake_reservoir import FakeReservoir
+from . import model_registry
+from .utils.aho_corasick import AhoCorasick
+from .utils.analysis_cache import AnalysisCache
+from .utils.inference_profile import InferenceProfile
 
 from .config import *
 
@@ -29,10 +38,107 @@ def _length_factory(tokenizer: Any = None):
         return len
 
 
+DEANONYMIZE_MODES = ("analyze", "dictionary", "hybrid")
+STREAM_WINDOW_SIZE = 16384
+MAX_IN_FLIGHT = 8
+_LOOP_LOCAL_LOCK = Lock()
+
+
+def _loop_local(primitives: WeakKeyDictionary, factory):
+    """
+    The asyncio primitive of the running loop in `primitives`, created on
+    first use. asyncio locks and semaphores bind to the first loop that
+    waits on them, so each loop gets its own; a closed loop's entry goes
+    away with the loop.
+    """
+    loop = asyncio.get_running_loop()
+    with _LOOP_LOCAL_LOCK:
+        primitive = primitives.get(loop)
+        if primitive is None:
+            primitive = primitives[loop] = factory()
+        return primitive
+
+
+def _check_deanonymize_mode(mode: str) -> str:
+    if mode not in DEANONYMIZE_MODES:
+        raise ValueError(
+            f"Deanonymize mode {mode!r} not supported; expected one of {DEANONYMIZE_MODES}"
+        )
+    return mode
+
+
 def _filter_dict(d: dict, valid_keys)-> dict:
     valid = set(valid_keys)
     return {k: v for k, v in d.items() if k in valid}
 
+
+def _hash_keyed_values(text: str, analyzer_results, operators: dict) -> list:
+    """Surface strings of the results whose operator looks the true value up by calc_hash."""
+    values = []
+    for result in analyzer_results:
+        operator = operators.get(result.entity_type) or operators.get("DEFAULT")
+        if operator is not None and getattr(operator.params.get("lambda"), "hash_keyed", False):
+            values.append(text[result.start:result.end])
+    return values
+
+
+def _batch_recognizers(analyzer) -> list:
+    """Recognizers of the analyzer that can predict all chunks of a text in batches."""
+    registry = getattr(analyzer, "registry", None)
+    if registry is None:
+        return []
+    return [r for r in registry.recognizers if callable(getattr(r, "prefetch", None))]
+
+class _EntryTable:
+    """
+    Anonymization entries of a session keyed by fake text.
+
+    The fake->restored table is compiled into an Aho–Corasick automaton as
+    entries arrive, so restoring a text is one left-to-right pass that
+    prefers the longest fake instead of a `str.replace` per entry.
+    """
+
+    def __init__(self, entries=()):
+        self._by_text = OrderedDict()
+        self._pending = []
+        self._automaton = AhoCorasick(word_boundaries=False)
+        self._rewrites = 0
+        for entry in entries:
+            self.add(entry)
+
+    def __iter__(self):
+        return iter(self._by_text.values())
+
+    def __len__(self) -> int:
+        return len(self._by_text)
+
+    def add(self, entry):
+        fake_text = getattr(entry, "text", None)
+        if fake_text:
+            self._by_text[fake_text] = entry
+            self._pending.append(entry)
+
+    def clear(self):
+        self._by_text.clear()
+        self._pending.clear()
+        self._automaton = AhoCorasick(word_boundaries=False)
+        self._rewrites = 0
+
+    def replace(self, text: str, restore) -> str:
+        """Replace every known fake with `restore(entry)` in one pass."""
+        for entry in self._pending:
+            restored = restore(entry)
+            if restored != entry.text:
+                self._rewrites += 1
+            # identity entries stay in the table so that a shorter fake
+            # never rewrites the inside of a longer one
+            self._automaton.add(entry.text, restored)
+        self._pending.clear()
+        if not self._rewrites:
+            return text
+        return self._automaton.replace(text)
+
+
 class PalimpsestSessionError(RuntimeError):
     """Base class for Palimpsest session-state errors."""
 
@@ -45,38 +151,101 @@ class SessionStateError(PalimpsestSessionError):
     """Raised when a session is closed, foreign, or has no usable mapping."""
 
 
+def _load_tokenizer(model_id: str = "gliner-community/gliner_large-v2.5"):
+    try:
+        return AutoTokenizer.from_pretrained(
+            model_id#,
+            #local_files_only=True,
+        )
+    except Exception as exc:
+        exc.add_note(
+            "Palimpsest "
+            "operation=tokenizer_init "
+            "component=_PalimpsestRuntime "
+            f"model_id={model_id!r}"
+        )
+        raise
+
+
 class _PalimpsestRuntime:
-    def __init__(self, run_entities: List[str] = None):
-        from .analyzer_engine_provider import analyzer_engine
+    _analysis_cache = None
+    _nlp_batch_size = 1
+    _leases = ()
+
+    def __init__(
+        self,
+        run_entities: List[str] = None,
+        batch_size: int = 8,
+        analysis_cache: AnalysisCache = None,
+        nlp_mode: str = "full",
+        nlp_batch_size: int = 32,
+        recognizer_workers: int = 0,
+        batch_wait_ms: float = 0.0,
+        gliner_backend: str = "torch",
+        inference_profile: InferenceProfile = None,
+        gliner_model: str = "large",
+    ):
+        from .analyzer_engine_provider import GLINER_ENTITIES, _requested, analyzer_engine, resolve_gliner_model
         from .recognizers.regex_recognisers import RU_ENTITIES
 
         self._run_entities = list(run_entities) if run_entities else None
-        self._analyzer = analyzer_engine(
-            "gliner",
-            "gliner-community/gliner_large-v2.5",
-            run_entities=run_entities,
-        )
+        self._batch_size = batch_size
+        self._nlp_batch_size = nlp_batch_size
+        self._analysis_cache = analysis_cache
+        # context enhancement differs between NLP modes and int8 weights shift
+        # scores, so neither shares cache entries with the other configurations
+        model_path = resolve_gliner_model(gliner_model)
+        model = model_path
+        if gliner_backend != "torch":
+            model = f"{model}@{gliner_backend}"
+        if inference_profile is not None and "bf16" in inference_profile.weights_key:
+            # only when the weights really are bf16; elsewhere they stay fp32
+            model = f"{model}@bf16"
+        self._model_id = f"gliner:{model}:{nlp_mode}"
+        # models come from the process-wide registry; the runtime only holds
+        # references, released by close()
         try:
-            self._tokenizer = AutoTokenizer.from_pretrained(
-                "gliner-community/gliner_large-v2.5"#,
-                #local_files_only=True,
-            )
-        except Exception as exc:
-            exc.add_note(
-                "Palimpsest "
-                "operation=tokenizer_init "
-                "component=_PalimpsestRuntime "
-                "model_id='gliner-community/gliner_large-v2.5'"
-            )
+            with model_registry.leases() as self._leases:
+                self._analyzer = analyzer_engine(
+                    "gliner",
+                    model_path,
+                    run_entities=run_entities,
+                    batch_size=batch_size,
+                    nlp_mode=nlp_mode,
+                    recognizer_workers=recognizer_workers,
+                    batch_wait_ms=batch_wait_ms,
+                    gliner_backend=gliner_backend,
+                    inference_profile=inference_profile,
+                )
+                # chunk lengths are measured in GLiNER tokens only when GLiNER runs
+                self._tokenizer = None
+                if _requested(GLINER_ENTITIES, self._run_entities):
+                    self._tokenizer = model_registry.acquire(
+                        ("tokenizer", model_path),
+                        lambda: _load_tokenizer(model_path),
+                    )
+            self._batch_recognizers = _batch_recognizers(self._analyzer)
+            self._calc_len = _length_factory(self._tokenizer)
+            supported = self._analyzer.get_supported_entities() + RU_ENTITIES
+            if "IN_PAN" in supported:
+                supported.remove("IN_PAN")
+            self._supported = supported
+            self._analyzer_entities = self._run_entities or supported
+            self._engine = AnonymizerEngine()
+            self._cr_key = CRYPRO_KEY
+        except BaseException:
+            # nobody will own a half-built runtime, so unpin its models here
+            self.close()
             raise
-        self._calc_len = _length_factory(self._tokenizer)
-        supported = self._analyzer.get_supported_entities() + RU_ENTITIES
-        if "IN_PAN" in supported:
-            supported.remove("IN_PAN")
-        self._supported = supported
-        self._analyzer_entities = self._run_entities or supported
-        self._engine = AnonymizerEngine()
-        self._cr_key = CRYPRO_KEY
+
+    def close(self):
+        """Stop recognizer worker threads and drop this runtime's references to shared models."""
+        for owner in (getattr(self, "_analyzer", None), *getattr(self, "_batch_recognizers", ())):
+            close = getattr(owner, "close", None)
+            if close is not None:
+                close()
+        model_registry.registry.release_all(list(self._leases))
+        self._leases = ()
 
     def _anon_operators(self, ctx: FakerContext) -> dict:
         operators = {
@@ -127,21 +296,77 @@ class _PalimpsestRuntime:
             return _filter_dict(operators, self._run_entities)
         return operators
 
-    def analyze(self, text, analizer_entities=None):
-        from .utils.sentence_splitter import split_text
+    @contextmanager
+    def _prefetch(self, chunks: List[str], entities: List[str]):
+        """
+        Let batch-capable recognizers (GLiNER, Natasha) predict every chunk in shared
+        batches before presidio walks the chunks one by one. A micro-batching
+        recognizer also takes single chunks, to batch them with the chunks of
+        concurrent callers. batch_size=1 keeps the legacy per-chunk inference.
+        """
+        with ExitStack() as stack:
+            if self._batch_size > 1 and chunks:
+                requested = set(entities)
+                for recognizer in self._batch_recognizers:
+                    if len(chunks) < 2 and not getattr(recognizer, "micro_batching", False):
+                        continue
+                    if requested.intersection(recognizer.supported_entities):
+                        stack.enter_context(recognizer.prefetch(chunks, self._batch_size))
+            yield
+
+    def _nlp_artifacts(self, chunks: List[str]) -> dict:
+        """
+        spaCy artifacts of `chunks` computed with one `nlp.pipe` pass, by chunk
+        text, so that presidio does not run the pipeline chunk by chunk.
+        nlp_batch_size=1 keeps the legacy per-chunk processing.
+        """
+        nlp_engine = getattr(self._analyzer, "nlp_engine", None)
+        chunks = list(dict.fromkeys(chunks))
+        if nlp_engine is None or self._nlp_batch_size <= 1 or len(chunks) < 2:
+            return {}
+        batch = nlp_engine.process_batch(chunks, language="en", batch_size=self._nlp_batch_size)
+        return {chunk: artifacts for chunk, (_, artifacts) in zip(chunks, batch)}
+
+    def _cached_chunks(self, chunks: List[str], entities: List[str], memo: dict = None) -> dict:
+        """Chunk-relative results already known from `memo` or the analysis cache, by chunk text."""
+        cache = self._analysis_cache
+        cached = {}
+        for chunk in dict.fromkeys(chunks):
+            if memo and chunk in memo:
+                cached[chunk] = memo[chunk]
+            elif cache is not None:
+                results = cache.get(AnalysisCache.key(chunk, entities, self._model_id))
+                if results is not None:
+                    cached[chunk] = results
+        return cached
+
+    def _analyze_chunk(self, chunk: str, entities: List[str], artifacts: dict = None):
+        options = {}
+        if artifacts and chunk in artifacts:
+            options["nlp_artifacts"] = artifacts[chunk]
+        return self._analyzer.analyze(
+            text=chunk,
+            entities=entities,
+            language="en",
+            return_decision_process=False,
+            **options,
+        )
 
-        entities = list(analizer_entities or self._analyzer_entities)
-        chunks = split_text(text, max_chunk_size=768, _len=self._calc_len)
+    def _analyze_pending(self, chunks: List[str], entities: List[str], affinity: Hashable = None) -> list:
+        """
+        Chunk-relative results for distinct `chunks` that are neither memoized
+        nor cached, computed with shared spaCy and GLiNER batches. `affinity`
+        is only a routing hint for pooled runtimes.
+        """
+        artifacts = self._nlp_artifacts(chunks)
+        with self._prefetch(chunks, entities):
+            return [self._analyze_chunk(chunk, entities, artifacts) for chunk in chunks]
+
+    def _analyze_chunks(self, chunks: List[str], cached: dict):
         analyzer_results = []
         shift = 0
-        final_text = ""
+        parts = []
         for chunk in chunks:
-            analized = self._analyzer.analyze(
-                text=chunk,
-                entities=entities,
-                language="en",
-                return_decision_process=False,
-            )
             analized = [
                 RecognizerResult(
                     r.entity_type,
@@ -151,48 +376,179 @@ class _PalimpsestRuntime:
                     r.analysis_explanation,
                     r.recognition_metadata,
                 )
-                for r in analized
+                for r in cached[chunk]
             ]
             analyzer_results.extend(analized)
-            final_text = final_text + chunk + "\n"
-            shift = len(final_text)
-        return final_text, analyzer_results
+            parts.append(chunk)
+            parts.append("\n")
+            shift += len(chunk) + 1
+        return "".join(parts), analyzer_results
+
+    def analyze(self, text, analizer_entities=None, affinity: Hashable = None):
+        return self.analyze_many([text], analizer_entities, affinity=affinity)[0]
+
+    def analyze_many(self, texts: List[str], analizer_entities=None, memo: dict = None, affinity: Hashable = None):
+        """
+        Analyze several texts with shared model batches: spaCy artifacts and
+        GLiNER predictions for the chunks of all texts are computed together,
+        then each text is assembled separately.
+        Returns one `(final_text, analyzer_results)` pair per input text.
+
+        `memo` maps chunk text to chunk-relative results of a previous call with
+        the same entities; only chunks missing from it are analyzed. It is
+        rewritten to hold exactly the chunks of `texts`.
+
+        `affinity` (e.g. the session's FakerContext) lets a pooled runtime send
+        every call of one conversation to the same worker.
+        """
+        from .utils.sentence_splitter import split_text
 
-    def anonymize(self, ctx: FakerContext, text: str):
-        final_text, analyzer_results = self.analyze(text)
-        result = self._engine.anonymize(
-            text=final_text,
-            analyzer_results=analyzer_results,
-            operators=self._anon_operators(ctx),
-        )
+        entities = list(analizer_entities or self._analyzer_entities)
+        chunked = [split_text(text, max_chunk_size=768, _len=self._calc_len) for text in texts]
+        all_chunks = [chunk for chunks in chunked for chunk in chunks]
+        cached = self._cached_chunks(all_chunks, entities, memo)
+        pending = [chunk for chunk in dict.fromkeys(all_chunks) if chunk not in cached]
+        cached.update(zip(pending, self._analyze_pending(pending, entities, affinity)))
+        if self._analysis_cache is not None:
+            self._analysis_cache.put_many(
+                (AnalysisCache.key(chunk, entities, self._model_id), cached[chunk]) for chunk in pending
+            )
+        analyzed = [self._analyze_chunks(chunks, cached) for chunks in chunked]
+        if memo is not None:
+            memo.clear()
+            memo.update((chunk, cached[chunk]) for chunk in all_chunks)
+        return analyzed
+
+    def anonymize(self, ctx: FakerContext, text: str, memo: dict = None):
+        return self.anonymize_analyzed(ctx, *self.analyze_many([text], memo=memo, affinity=ctx)[0])
+
+    def anonymize_analyzed(self, ctx: FakerContext, final_text: str, analyzer_results):
+        operators = self._anon_operators(ctx)
+        values = _hash_keyed_values(final_text, analyzer_results, operators)
+        with ctx.precomputed_hashes(values) if values else nullcontext():
+            result = self._engine.anonymize(
+                text=final_text,
+                analyzer_results=analyzer_results,
+                operators=operators,
+            )
         return result.text, result.items, final_text, analyzer_results
 
     def deanonymize(self, ctx: FakerContext, text: str, entities):
+        return self.deanonymize_analyzed(ctx, *self.analyze(text, affinity=ctx), entities)
+
+    def deanonymize_analyzed(self, ctx: FakerContext, analized_anon_text: str, analized_anon_results, entities):
         def deanonymize_item(item):
             if item.operator == "encrypt":
                 return Decrypt().operate(text=item.text, params={"key": self._cr_key})
             return item.text
 
-        analized_anon_text, analized_anon_results = self.analyze(text)
         result = self._engine.anonymize(
             text=analized_anon_text,
             analyzer_results=analized_anon_results,
             operators=self._deanon_operators(ctx),
         )
 
-        deanonimized_text = result.text
-        deanonimized_entities = [
-            {**item.to_dict(), "restored": deanonymize_item(item)}
-            for item in entities
-        ]
-        for item in deanonimized_entities:
-            deanonimized_text = deanonimized_text.replace(item["text"], item["restored"])
+        if not isinstance(entities, _EntryTable):
+            entities = _EntryTable(entities)
+        deanonimized_text = entities.replace(result.text, deanonymize_item)
 
         return deanonimized_text, result.items, analized_anon_text, analized_anon_results
 
-
-def _runtime_factory(run_entities: List[str] = None):
-    return _PalimpsestRuntime(run_entities)
+    def deanonymize_known(self, ctx: FakerContext, text: str, entities, fallback: bool = False):
+        """
+        Restore the fakes the session knows verbatim with one automaton scan
+        instead of re-running the analyzer over the whole text.
+
+        With `fallback=True` residual lines (text between exact matches) that
+        still contain a stem of a known fake - e.g. a name the LLM inflected -
+        are analyzed and passed through the deanon operators.
+        """
+        pieces = []  # (input_start, piece_text, restored_entry or None)
+        pos = 0
+        for start, end, entry in ctx.find_fakes(text):
+            if pos < start:
+                pieces.append((pos, text[pos:start], None))
+            pieces.append((start, text[start:end], entry))
+            pos = end
+        if pos < len(text):
+            pieces.append((pos, text[pos:], None))
+
+        residual = {}
+        if fallback:
+            lines = []
+            for start, piece, entry in pieces:
+                if entry is not None:
+                    lines.append((start, piece, entry))
+                    continue
+                for line in piece.splitlines(keepends=True):
+                    lines.append((start, line, None))
+                    start += len(line)
+            pieces = lines
+            candidates = [i for i, (_, piece, entry) in enumerate(pieces) if entry is None and ctx.has_fake_stem(piece)]
+            analyzed = self.analyze_many([pieces[i][1] for i in candidates], affinity=ctx)
+            for i, analysis in zip(candidates, analyzed):
+                residual[i] = self.deanonymize_analyzed(ctx, *analysis, entities)
+
+        restored = []
+        items = []
+        results = []
+        out_pos = 0
+        for i, (start, piece, entry) in enumerate(pieces):
+            if entry is not None:
+                out = entry["true"]
+                results.append(RecognizerResult("KNOWN_FAKE", start, start + len(piece), 1.0))
+                items.append(OperatorResult(out_pos, out_pos + len(out), "KNOWN_FAKE", out, "dictionary"))
+            elif i in residual:
+                out, piece_items, _, piece_results = residual[i]
+                # analysis terminates every chunk with "\n"; drop the last one
+                out = out[:-1] if out.endswith("\n") else out
+                results.extend(
+                    RecognizerResult(r.entity_type, r.start + start, r.end + start, r.score)
+                    for r in piece_results
+                    if r.end <= len(piece)
+                )
+                items.extend(
+                    OperatorResult(r.start + out_pos, r.end + out_pos, r.entity_type, r.text, r.operator)
+                    for r in piece_items
+                )
+            else:
+                out = piece
+            restored.append(out)
+            out_pos += len(out)
+
+        return "".join(restored), items, text, results
+
+
+def _runtime_factory(
+    run_entities: List[str] = None,
+    batch_size: int = 8,
+    analysis_cache: AnalysisCache = None,
+    nlp_mode: str = "full",
+    nlp_batch_size: int = 32,
+    recognizer_workers: int = 0,
+    batch_wait_ms: float = 0.0,
+    gliner_backend: str = "torch",
+    inference_profile: InferenceProfile = None,
+    gliner_model: str = "large",
+    processes: int = 0,
+    torch_threads: int = None,
+):
+    options = dict(
+        batch_size=batch_size,
+        analysis_cache=analysis_cache,
+        nlp_mode=nlp_mode,
+        nlp_batch_size=nlp_batch_size,
+        recognizer_workers=recognizer_workers,
+        batch_wait_ms=batch_wait_ms,
+        gliner_backend=gliner_backend,
+        inference_profile=inference_profile,
+        gliner_model=gliner_model,
+    )
+    if processes > 0:
+        from .process_pool import _PooledRuntime
+
+        return _PooledRuntime(run_entities, processes=processes, torch_threads=torch_threads, **options)
+    return _PalimpsestRuntime(run_entities, **options)
 
 
 def _anonimizer_factory(ctx: FakerContext, run_entities: List[str] = None):
@@ -215,8 +571,12 @@ class PalimpsestSession:
     def __init__(self, processor: "Palimpsest", session_id: str = None):
         self.session_id = session_id or str(uuid4())
         self._processor = processor
-        self._ctx = FakerContext(locale=processor._locale)
-        self._anon_entries_by_text = OrderedDict()
+        self._ctx = FakerContext(locale=processor._locale, reservoir=processor._fake_reservoir)
+        self._anon_entries = _EntryTable()
+        # chunk -> analyzer results of the last anonymized input
+        self._analysis_memo = {}
+        # runtime whose spans `_analysis_memo` holds
+        self._memo_runtime = None
         self._anon_analysis = None
         self._anon_analized_text = None
         self._anonimized_text = ""
@@ -225,6 +585,9 @@ class PalimpsestSession:
         self._deanonimized_text = ""
         self._closed = False
         self._lock = RLock()
+        # per event loop, see _loop_local(); queues coroutines of this
+        # session without parking executor threads on the RLock above
+        self._async_locks = WeakKeyDictionary()
 
     @property
     def closed(self) -> bool:
@@ -235,32 +598,60 @@ class PalimpsestSession:
             raise SessionStateError(f"Palimpsest session is closed: {self.session_id!r}")
 
     def _entries(self):
-        return list(self._anon_entries_by_text.values())
+        return self._anon_entries
 
     def _store_entries(self, entries):
         for entry in entries:
-            fake_text = getattr(entry, "text", None)
-            if fake_text:
-                self._anon_entries_by_text[fake_text] = entry
+            self._anon_entries.add(entry)
 
-    def anonymize(self, text: str) -> str:
+    def anonymize(self, text: str, *, gliner_model: str = None) -> str:
         with self._lock:
             self._ensure_open()
-            return self._processor._anonymize_session(self, text)
+            return self._processor._anonymize_session(self, text, gliner_model=gliner_model)
 
     def anonimize(self, text: str) -> str:
         return self.anonymize(text)
 
-    def deanonymize(self, anonymized_text: str = None) -> str:
+    def deanonymize(self, anonymized_text: str = None, *, mode: str = None) -> str:
         with self._lock:
             self._ensure_open()
             if anonymized_text is None:
                 anonymized_text = self._anonimized_text
-            return self._processor._deanonymize_session(self, anonymized_text)
+            return self._processor._deanonymize_session(self, anonymized_text, mode=mode)
 
     def deanonimize(self, anonimized_text: str = None) -> str:
         return self.deanonymize(anonimized_text)
 
+    async def aanonymize(self, text: str, *, gliner_model: str = None) -> str:
+        """`anonymize` on the processor's executor, without blocking the event loop."""
+        return await self._processor._run_async(self, self.anonymize, text, gliner_model=gliner_model)
+
+    async def adeanonymize(self, anonymized_text: str = None, *, mode: str = None) -> str:
+        """`deanonymize` on the processor's executor, without blocking the event loop."""
+        return await self._processor._run_async(self, self.deanonymize, anonymized_text, mode=mode)
+
+    def anonymize_stream(self, source, window_size: int = STREAM_WINDOW_SIZE) -> Iterator[str]:
+        """
+        Anonymize a large string, iterable of strings, or text file object
+        window by window, yielding anonymized text as it goes. Windows are
+        sentence-aligned and at most `window_size` characters, so memory does
+        not grow with the document. The session mapping is updated after every
+        window; `deanonymize()` without arguments restores the last window.
+        """
+        from .utils.sentence_splitter import iter_windows
+
+        for window in iter_windows(source, window_size):
+            with self._lock:
+                self._ensure_open()
+                anonymized = self._processor._anonymize_session(self, window)
+            # analysis terminates the last chunk with "\n"; drop it
+            yield anonymized[:-1] if anonymized.endswith("\n") else anonymized
+
+    def stream_deanonymizer(self) -> "StreamingDeanonymizer":
+        with self._lock:
+            self._ensure_open()
+            return StreamingDeanonymizer(self)
+
     def reset(self):
         with self._lock:
             self._ensure_open()
@@ -268,7 +659,8 @@ class PalimpsestSession:
 
     def _reset_unlocked(self):
         self._ctx.reset()
-        self._anon_entries_by_text.clear()
+        self._anon_entries.clear()
+        self._analysis_memo.clear()
         self._anon_analysis = None
         self._anon_analized_text = None
         self._anonimized_text = ""
@@ -283,12 +675,197 @@ class PalimpsestSession:
                 self._closed = True
 
 
+class StreamingDeanonymizer:
+    """
+    Incremental dictionary deanonymizer for streamed LLM output.
+
+    Feed text deltas as they arrive; restored text is returned as soon as no
+    known fake of the session can still start inside it. Only the suffix that
+    may be the beginning of a fake is buffered, so memory per stream is
+    bounded by the longest fake. Restoration follows the `"dictionary"` mode:
+    fakes the model inflected or rewrote are passed through unchanged.
+    """
+
+    def __init__(self, session: PalimpsestSession):
+        self._session = session
+        self._buffer = ""
+        # last consumed input character, left context for word boundaries
+        self._context = ""
+
+    def feed(self, delta: str) -> str:
+        with self._session._lock:
+            self._session._ensure_open()
+            self._buffer += delta
+            hold = self._session._ctx.fake_prefix_length(self._buffer)
+            return self._emit(len(self._buffer) - hold)
+
+    def flush(self) -> str:
+        """Restore and return everything still buffered; call at end of stream."""
+        with self._session._lock:
+            self._session._ensure_open()
+            return self._emit(len(self._buffer))
+
+    def _emit(self, safe: int) -> str:
+        offset = len(self._context)
+        text = self._context + self._buffer
+        safe += offset
+        pieces = []
+        pos = offset
+        for start, end, entry in self._session._ctx.find_fakes(text, offset):
+            # a match starting before `safe` cannot grow any further
+            if start >= safe:
+                break
+            pieces.append(text[pos:start])
+            pieces.append(entry["true"])
+            pos = end
+        if pos < safe:
+            pieces.append(text[pos:safe])
+            pos = safe
+        if pos > offset:
+            self._context = text[pos - 1]
+            self._buffer = text[pos:]
+        return "".join(pieces)
+
+    def stream(self, deltas: Iterable[str]) -> Iterator[str]:
+        for delta in deltas:
+            restored = self.feed(delta)
+            if restored:
+                yield restored
+        restored = self.flush()
+        if restored:
+            yield restored
+
+    async def astream(self, deltas: AsyncIterable[str]) -> AsyncIterator[str]:
+        # feed/flush take the session lock, which another thread may hold, so
+        # they run on the processor executor rather than on the event loop
+        run_async = self._session._processor._run_async
+        async for delta in deltas:
+            restored = await run_async(self._session, self.feed, delta)
+            if restored:
+                yield restored
+        restored = await run_async(self._session, self.flush)
+        if restored:
+            yield restored
+
+
 class Palimpsest():
-    def __init__(self, verbose=False, run_entities: List[str] = None, locale: str = "ru-RU"):
+    def __init__(
+        self,
+        verbose=False,
+        run_entities: List[str] = None,
+        locale: str = "ru-RU",
+        batch_size: int = 8,
+        deanonymize_mode: str = "analyze",
+        analysis_cache: AnalysisCache = None,
+        nlp_mode: str = "full",
+        nlp_batch_size: int = 32,
+        recognizer_workers: int = 0,
+        batch_wait_ms: float = 0.0,
+        gliner_backend: str = "torch",
+        inference_profile: InferenceProfile = None,
+        processes: int = 0,
+        torch_threads: int = None,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        gliner_models: Sequence[str] = ("large",),
+        fake_reservoir: FakeReservoir = None,
+    ):
+        if max_in_flight < 1:
+            raise ValueError("Palimpsest max_in_flight must be positive")
+        gliner_models = list(dict.fromkeys(gliner_models))
+        if not gliner_models:
+            raise ValueError("Palimpsest gliner_models must name at least one GLiNER model")
         self._verbose = verbose
         self._locale=locale
+        self._fake_reservoir = fake_reservoir
         self._run_entities = run_entities
-        self._runtime = _runtime_factory(run_entities)
+        self._deanonymize_mode = _check_deanonymize_mode(deanonymize_mode)
+        # one runtime per GLiNER model; spaCy and the other shared models are
+        # loaded once through the model registry
+        self._runtimes = {}
+        try:
+            for gliner_model in gliner_models:
+                self._runtimes[gliner_model] = _runtime_factory(
+                    run_entities,
+                    batch_size=batch_size,
+                    analysis_cache=analysis_cache,
+                    nlp_mode=nlp_mode,
+                    nlp_batch_size=nlp_batch_size,
+                    recognizer_workers=recognizer_workers,
+                    batch_wait_ms=batch_wait_ms,
+                    gliner_backend=gliner_backend,
+                    inference_profile=inference_profile,
+                    gliner_model=gliner_model,
+                    processes=processes,
+                    torch_threads=torch_threads,
+                )
+        except Exception:
+            for runtime in self._runtimes.values():
+                runtime.close()
+            raise
+        # the first model serves calls that do not pick one
+        self._runtime = self._runtimes[gliner_models[0]]
+        self._max_in_flight = max_in_flight
+        # per event loop, see _loop_local()
+        self._in_flight = WeakKeyDictionary()
+        self._executor = None
+        self._executor_lock = Lock()
+
+    def close(self):
+        """
+        Release the models held by this processor. Models shared with other
+        live processors stay loaded; the last release unloads them.
+        """
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        for runtime in self._runtimes.values():
+            runtime.close()
+
+    def _runtime_for(self, gliner_model: str = None):
+        if gliner_model is None:
+            return self._runtime
+        runtime = self._runtimes.get(gliner_model)
+        if runtime is None:
+            raise ValueError(
+                f"GLiNER model {gliner_model!r} not loaded; expected one of {list(self._runtimes)}"
+            )
+        return runtime
+
+    def _async_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_in_flight,
+                    thread_name_prefix="palimpsest-async",
+                )
+            return self._executor
+
+    async def _run_async(self, session: PalimpsestSession, func, *args, **kwargs):
+        """
+        Run a blocking session call on the executor. Calls of one session run
+        in order; at most `max_in_flight` calls run at once and the rest wait
+        here, which is the backpressure seen by the event loop.
+
+        Cancelling a call that has not started drops it. A call that already
+        started keeps the session lock and its in-flight slot until it
+        finishes, so the next call never sees a half-updated mapping; the
+        cancellation is re-raised afterwards.
+
+        The session lock and the in-flight semaphore are per event loop, so
+        one processor can serve successive `asyncio.run` calls; calls from
+        different loops still share the `max_in_flight` executor threads.
+        """
+        async_lock = _loop_local(session._async_locks, asyncio.Lock)
+        in_flight = _loop_local(self._in_flight, lambda: asyncio.Semaphore(self._max_in_flight))
+        async with async_lock, in_flight:
+            future = self._async_executor().submit(func, *args, **kwargs)
+            try:
+                return await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                if not future.cancel():
+                    await asyncio.wait([asyncio.wrap_future(future)])
+                raise
 
     def create_session(self, session_id: str = None) -> PalimpsestSession:
         return PalimpsestSession(self, session_id=session_id)
@@ -309,38 +886,116 @@ class Palimpsest():
         session._ensure_open()
         return session
 
-    def _anonymize_session(self, session: PalimpsestSession, text: str) -> str:
-        session._anonimized_text, entries, session._anon_analized_text, session._anon_analysis = self._runtime.anonymize(session._ctx, text)
+    def _anonymize_session(self, session: PalimpsestSession, text: str, analyzed=None, gliner_model: str = None) -> str:
+        runtime = self._runtime_for(gliner_model)
+        if analyzed is None:
+            if session._memo_runtime is not runtime:
+                # the memo holds another model's spans
+                session._analysis_memo.clear()
+                session._memo_runtime = runtime
+            anonymized = runtime.anonymize(session._ctx, text, memo=session._analysis_memo)
+        else:
+            anonymized = runtime.anonymize_analyzed(session._ctx, *analyzed)
+        session._anonimized_text, entries, session._anon_analized_text, session._anon_analysis = anonymized
         session._store_entries(entries)
         if self._verbose:
             debug_log("ANONIMIZATION", text, session._anonimized_text, entries, session._ctx, session._anon_analized_text, session._anon_analysis)
         return session._anonimized_text
 
-    def _deanonymize_session(self, session: PalimpsestSession, anonymized_text: str) -> str:
-        session._deanonimized_text, deanon_entries, session._deanon_analized_text, session._deanon_analysis = self._runtime.deanonymize(
-            session._ctx,
-            anonymized_text,
-            session._entries(),
-        )
+    def _deanonymize_session(self, session: PalimpsestSession, anonymized_text: str, analyzed=None, mode: str = None) -> str:
+        mode = _check_deanonymize_mode(mode or self._deanonymize_mode)
+        if mode != "analyze":
+            deanonymized = self._runtime.deanonymize_known(
+                session._ctx,
+                anonymized_text,
+                session._entries(),
+                fallback=mode == "hybrid",
+            )
+        elif analyzed is None:
+            deanonymized = self._runtime.deanonymize(session._ctx, anonymized_text, session._entries())
+        else:
+            deanonymized = self._runtime.deanonymize_analyzed(session._ctx, *analyzed, session._entries())
+        session._deanonimized_text, deanon_entries, session._deanon_analized_text, session._deanon_analysis = deanonymized
         if self._verbose:
             debug_log("DEANONIMIZATION", anonymized_text, session._deanonimized_text, deanon_entries, session._ctx, session._deanon_analized_text, session._deanon_analysis)
         return session._deanonimized_text
 
-    def anonymize(self, text: str, *, session: PalimpsestSession = None) -> str:
-        return self._require_session(session).anonymize(text)
+    def anonymize(self, text: str, *, session: PalimpsestSession = None, gliner_model: str = None) -> str:
+        return self._require_session(session).anonymize(text, gliner_model=gliner_model)
 
     def anonimize(self, text: str, *, session: PalimpsestSession = None) -> str:
         return self.anonymize(text, session=session)
 
-    def deanonymize(self, anonymized_text: str = None, *, session: PalimpsestSession = None) -> str:
-        return self._require_session(session).deanonymize(anonymized_text)
+    def deanonymize(self, anonymized_text: str = None, *, session: PalimpsestSession = None, mode: str = None) -> str:
+        return self._require_session(session).deanonymize(anonymized_text, mode=mode)
 
     def deanonimize(self, anonimized_text: str = None, *, session: PalimpsestSession = None) -> str:
         return self.deanonymize(anonimized_text, session=session)
 
+    async def aanonymize(self, text: str, *, session: PalimpsestSession = None, gliner_model: str = None) -> str:
+        return await self._require_session(session).aanonymize(text, gliner_model=gliner_model)
+
+    async def adeanonymize(self, anonymized_text: str = None, *, session: PalimpsestSession = None, mode: str = None) -> str:
+        return await self._require_session(session).adeanonymize(anonymized_text, mode=mode)
+
+    def anonymize_stream(
+        self,
+        source,
+        *,
+        session: PalimpsestSession = None,
+        window_size: int = STREAM_WINDOW_SIZE,
+    ) -> Iterator[str]:
+        return self._require_session(session).anonymize_stream(source, window_size=window_size)
+
+    def stream_deanonymizer(self, *, session: PalimpsestSession = None) -> StreamingDeanonymizer:
+        return self._require_session(session).stream_deanonymizer()
+
     def reset_context(self, *, session: PalimpsestSession = None):
         self._require_session(session).reset()
 
+    def anonymize_many(self, requests, *, gliner_model: str = None) -> list[str]:
+        """
+        Anonymize many `(session, text)` pairs with one shared analysis pass.
+
+        Chunking and recognition run for all texts together; each session's
+        FakerContext mapping is then applied independently, in input order,
+        under that session's lock - exactly as consecutive `anonymize` calls.
+        """
+        runtime = self._runtime_for(gliner_model)
+        requests = [(self._require_session(session), text) for session, text in requests]
+        analyzed = runtime.analyze_many([text for _, text in requests])
+        anonymized = []
+        for (session, text), analysis in zip(requests, analyzed):
+            with session._lock:
+                session._ensure_open()
+                anonymized.append(self._anonymize_session(session, text, analyzed=analysis, gliner_model=gliner_model))
+        return anonymized
+
+    def deanonymize_many(self, requests, *, mode: str = None) -> list[str]:
+        """
+        Deanonymize many `(session, anonymized_text)` pairs with one shared
+        analysis pass. A `None` text restores the session's last anonymized text.
+        Dictionary and hybrid modes need no shared pass and restore per session.
+        """
+        mode = _check_deanonymize_mode(mode or self._deanonymize_mode)
+        pending = []
+        for session, anonymized_text in requests:
+            session = self._require_session(session)
+            if anonymized_text is None:
+                with session._lock:
+                    anonymized_text = session._anonimized_text
+            pending.append((session, anonymized_text))
+        if mode == "analyze":
+            analyzed = self._runtime.analyze_many([text for _, text in pending])
+        else:
+            analyzed = [None] * len(pending)
+        deanonymized = []
+        for (session, anonymized_text), analysis in zip(pending, analyzed):
+            with session._lock:
+                session._ensure_open()
+                deanonymized.append(self._deanonymize_session(session, anonymized_text, analyzed=analysis, mode=mode))
+        return deanonymized
+
 
 def debug_log(action: str, input_text: str = None, output_text: str = None, action_entries: EngineResult = None, ctx: FakerContext = None, analised_text: str = None, action_analysis: list[RecognizerResult] = None):
     debug = logger.debug
@@ -0,0 +1,112 @@
+"""
+Analyzer engine that runs the model-backed recognizers of a chunk concurrently.
+
+Presidio calls every recognizer of a chunk one after another. GLiNER (torch)
+and Natasha (numpy) spend most of that time in code that releases the GIL, so
+`ParallelAnalyzerEngine` submits them to a thread pool before presidio's loop
+starts; the loop runs the cheap regex recognizers inline and collects the
+model results when it reaches them. Results are therefore merged in registry
+order and go through the same context enhancement, score thresholds, and
+duplicate removal as sequential analysis.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, local
+from typing import List, Optional
+
+from presidio_analyzer import AnalyzerEngine, RecognizerResult
+
+# (text, {id(recognizer): future}) of the analyze() call running on this thread
+_submitted = local()
+
+
+class ConcurrentRecognizer:
+    """
+    Mixin for recognizers whose analyze() is dominated by GIL-releasing model
+    calls. Their analyze() must start with:
+
+        submitted = self.submitted_results(text)
+        if submitted is not None:
+            return submitted
+    """
+
+    def runs_concurrently(self, text: str) -> bool:
+        """Whether analyzing `text` is worth a pool thread (False when it is already known)."""
+        return True
+
+    def submitted_results(self, text: str) -> Optional[List[RecognizerResult]]:
+        """Results of the analyze() submitted for `text` by this thread's engine, if any."""
+        pending = getattr(_submitted, "futures", None)
+        if pending is None or pending[0] != text:
+            return None
+        future = pending[1].get(id(self))
+        return None if future is None else future.result()
+
+
+class ParallelAnalyzerEngine(AnalyzerEngine):
+    """
+    `AnalyzerEngine` running `ConcurrentRecognizer`s on a pool of at most
+    `max_workers` threads. Keep `max_workers` small on CPU: each torch call
+    already uses `torch.get_num_threads()` intra-op threads.
+    """
+
+    def __init__(self, *args, max_workers: int = 2, **kwargs):
+        if max_workers < 1:
+            raise ValueError("ParallelAnalyzerEngine max_workers must be positive")
+        super().__init__(*args, **kwargs)
+        self._max_workers = max_workers
+        self._executor = None
+        self._executor_lock = Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="palimpsest-recognizer",
+                )
+            return self._executor
+
+    def close(self) -> None:
+        """Shut the worker threads down; a later analyze() starts a new pool."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def analyze(self, text: str, language: str, entities: Optional[List[str]] = None, nlp_artifacts=None, **kwargs):
+        all_fields = not entities
+        recognizers = [
+            recognizer
+            for recognizer in self.registry.get_recognizers(
+                language=language,
+                entities=entities,
+                all_fields=all_fields,
+                ad_hoc_recognizers=kwargs.get("ad_hoc_recognizers"),
+            )
+            if isinstance(recognizer, ConcurrentRecognizer) and recognizer.runs_concurrently(text)
+        ]
+        if not recognizers:
+            return super().analyze(text=text, language=language, entities=entities, nlp_artifacts=nlp_artifacts, **kwargs)
+
+        # the same arguments presidio's loop would pass
+        requested = self.get_supported_entities(language=language) if all_fields else entities
+        if not nlp_artifacts:
+            nlp_artifacts = self.nlp_engine.process_text(text, language)
+        pool = self._pool()
+        futures = {}
+        for recognizer in recognizers:
+            if not recognizer.is_loaded:
+                recognizer.load()
+                recognizer.is_loaded = True
+            futures[id(recognizer)] = pool.submit(
+                recognizer.analyze, text=text, entities=requested, nlp_artifacts=nlp_artifacts
+            )
+
+        previous = getattr(_submitted, "futures", None)
+        _submitted.futures = (text, futures)
+        try:
+            return super().analyze(text=text, language=language, entities=entities, nlp_artifacts=nlp_artifacts, **kwargs)
+        finally:
+            _submitted.futures = previous
+            for future in futures.values():
+                future.cancel()
@@ -0,0 +1,326 @@
+"""
+Process-pool runtime: models are loaded once in the parent and shared
+copy-on-write with forked analysis workers.
+
+One `_PalimpsestRuntime` analyzes one chunk at a time per process: the GIL
+serializes the Python parts of presidio and torch's intra-op threads contend
+with each other. `_PooledRuntime` loads every model in the parent, freezes the
+heap with `gc.freeze()` so the workers' garbage collector never writes to (and
+thereby copies) the pages holding the weights, and forks `processes` workers
+with `torch_threads` intra-op threads each.
+
+Only analysis runs in the workers. Chunking, the session memo, the analysis
+cache, and all anonymization stay in the parent; jobs carry the pending chunk
+texts and return compact `(entity_type, start, end, score, metadata)` tuples.
+Calls with an `affinity` (the session's FakerContext) always go to the same
+worker; batch calls without one are sharded across all workers. A worker that
+dies fails the call in flight and is replaced for the next one.
+
+Forking is only safe while the process has a single thread: a fork copies
+every lock in its current state, and a lock held by another thread (logging,
+the torch allocator, the tokenizers) stays locked forever in the child. The
+parent starts recognizer, executor, reservoir, and asyncio threads soon after
+the pool is built, and objects it allocates after `gc.freeze()` would not be
+frozen in a later fork. So the parent forks exactly once, in `__init__`: a
+single-threaded zygote (`_zygote_main`) that never runs analysis and forks
+every worker, the initial ones and the replacements, from that frozen state.
+Each worker's end of its pipe is passed back to the parent over a Unix socket.
+"""
+import gc
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.connection import Connection
+from multiprocessing.reduction import recv_handle, send_handle
+from threading import Lock
+from typing import Hashable, List, Optional, Tuple
+
+from presidio_analyzer import RecognizerResult
+
+from .palimpsest import _PalimpsestRuntime
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+def _compact(results) -> list:
+    return [(r.entity_type, r.start, r.end, r.score, r.recognition_metadata) for r in results]
+
+
+def _expand(spans) -> List[RecognizerResult]:
+    return [
+        RecognizerResult(entity_type, start, end, score, recognition_metadata=metadata)
+        for entity_type, start, end, score, metadata in spans
+    ]
+
+
+def _worker_main(runtime: "_PooledRuntime", conn, torch_threads: int) -> None:
+    import torch
+
+    torch.set_num_threads(torch_threads)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        chunks, entities = job
+        try:
+            results = _PalimpsestRuntime._analyze_pending(runtime, chunks, entities)
+            conn.send((True, [_compact(chunk_results) for chunk_results in results]))
+        except Exception as exc:
+            conn.send((False, f"{type(exc).__name__}: {exc}"))
+    conn.close()
+
+
+def _reap(pid: int) -> Optional[int]:
+    try:
+        return os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1])
+    except ChildProcessError:
+        return None
+
+
+def _zygote_main(runtime: "_PooledRuntime", conn, torch_threads: int) -> None:
+    """
+    Fork a worker per request. Requests are `("spawn", dead_pid)`, answered
+    with `(pid, exit code of dead_pid)` plus the parent's pipe end as a
+    passed handle, and `("stop", None)`, which reaps the workers and exits.
+    """
+    children = set()
+    while True:
+        try:
+            command, dead_pid = conn.recv()
+        except EOFError:
+            break
+        if command == "stop":
+            break
+        exitcode = None
+        if dead_pid in children:
+            children.discard(dead_pid)
+            exitcode = _reap(dead_pid)
+        parent_end, child_end = multiprocessing.Pipe()
+        pid = os.fork()
+        if pid == 0:
+            conn.close()
+            parent_end.close()
+            code = 1
+            try:
+                _worker_main(runtime, child_end, torch_threads)
+                code = 0
+            finally:
+                os._exit(code)
+        child_end.close()
+        children.add(pid)
+        conn.send((pid, exitcode))
+        send_handle(conn, parent_end.fileno(), None)
+        parent_end.close()
+    # the parent has sent every worker its stop message or is gone
+    deadline = time.monotonic() + 10
+    while children and time.monotonic() < deadline:
+        for pid in list(children):
+            if os.waitpid(pid, os.WNOHANG)[0]:
+                children.discard(pid)
+        time.sleep(0.01)
+    for pid in children:
+        os.kill(pid, signal.SIGTERM)
+        _reap(pid)
+    conn.close()
+
+
+class _Zygote:
+    """Parent's handle on the zygote process; forks are serialized by its lock."""
+
+    def __init__(self, context, runtime: "_PooledRuntime", torch_threads: int):
+        self.lock = Lock()
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_zygote_main,
+            args=(runtime, child_conn, torch_threads),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def spawn(self, dead_pid: int = None) -> Tuple[int, Connection, Optional[int]]:
+        """A new worker as `(pid, connection)`, and the exit code of the reaped `dead_pid`."""
+        with self.lock:
+            self.conn.send(("spawn", dead_pid))
+            pid, exitcode = self.conn.recv()
+            return pid, Connection(recv_handle(self.conn)), exitcode
+
+    def stop(self) -> None:
+        with self.lock:
+            try:
+                self.conn.send(("stop", None))
+            except OSError:
+                pass
+            self.conn.close()
+        self.process.join(timeout=15)
+        if self.process.is_alive():
+            self.process.terminate()
+
+
+# OSError also covers a connection already closed by a failed replacement
+_DEAD_PIPE = (EOFError, OSError)
+
+
+class _Worker:
+    def __init__(self, zygote: _Zygote):
+        self._zygote = zygote
+        self.lock = Lock()
+        self.pid, self.conn, _ = zygote.spawn()
+
+    def _restart(self, exc: Exception) -> RuntimeError:
+        """Have the zygote fork a replacement for the dead process; returns the error for the call it failed."""
+        pid = self.pid
+        self.conn.close()
+        try:
+            # the pipe is gone, so the process is useless even if it still runs
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        exitcode = None
+        try:
+            self.pid, self.conn, exitcode = self._zygote.spawn(pid)
+            logger.warning(f"Analysis worker {pid} died (exit code {exitcode}); started {self.pid}")
+        except _DEAD_PIPE as spawn_exc:
+            # no zygote, no replacement: later calls fail the same way
+            logger.error(f"Analysis worker {pid} died and cannot be replaced: {type(spawn_exc).__name__}")
+        return RuntimeError(
+            "Palimpsest "
+            "operation=analyze "
+            "component=_PooledRuntime "
+            f"worker_pid={pid} "
+            f"exitcode={exitcode} "
+            f"error='worker process died: {type(exc).__name__}'"
+        )
+
+    def send(self, chunks: List[str], entities: List[str]) -> None:
+        error = None
+        try:
+            self.conn.send((chunks, entities))
+        except _DEAD_PIPE as exc:
+            error = self._restart(exc)
+        if error is not None:
+            # raised outside the handler: the pipe's frames must not outlive it
+            raise error
+
+    def receive(self) -> list:
+        error = None
+        try:
+            ok, payload = self.conn.recv()
+        except _DEAD_PIPE as exc:
+            error = self._restart(exc)
+        if error is not None:
+            raise error
+        if not ok:
+            raise RuntimeError(
+                "Palimpsest "
+                "operation=analyze "
+                "component=_PooledRuntime "
+                f"worker_pid={self.pid} "
+                f"error={payload!r}"
+            )
+        return [_expand(spans) for spans in payload]
+
+    def stop(self) -> None:
+        """Ask the process to exit; the zygote reaps it."""
+        with self.lock:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.conn.close()
+
+
+class _PooledRuntime(_PalimpsestRuntime):
+    _workers = ()
+    _zygote = None
+
+    def __init__(self, *args, processes: int = 2, torch_threads: int = None, **kwargs):
+        if processes < 1:
+            raise ValueError("Process pool size must be positive")
+        if kwargs.get("gliner_backend", "torch") != "torch":
+            # ONNX Runtime's intra-op thread pool does not survive a fork
+            raise ValueError("Process pool runtime needs the torch GLiNER backend")
+        super().__init__(*args, **kwargs)
+        profile = kwargs.get("inference_profile")
+        torch_threads = (
+            torch_threads
+            or (profile.threads if profile is not None else None)
+            or max(1, (os.cpu_count() or 1) // processes)
+        )
+        try:
+            import torch
+
+            if torch.cuda.is_initialized():
+                raise ValueError("Process pool runtime needs CPU models: CUDA state cannot be forked")
+            context = multiprocessing.get_context("fork")
+        except ValueError as exc:
+            exc.add_note(
+                "Palimpsest "
+                "operation=process_pool_init "
+                "component=_PooledRuntime "
+                f"processes={processes}"
+            )
+            super().close()
+            raise
+        # move everything loaded so far out of the collector's reach, so the
+        # workers' GC does not touch (and copy) the pages holding model objects
+        gc.collect()
+        gc.freeze()
+        self._zygote = _Zygote(context, self, torch_threads)
+        self._workers = [_Worker(self._zygote) for _ in range(processes)]
+        logger.info(f"Started {processes} analysis workers with {torch_threads} torch threads each")
+
+    def _analyze_pending(self, chunks: List[str], entities: List[str], affinity: Hashable = None) -> list:
+        if not chunks:
+            return []
+        if not self._workers:
+            # closed pool: the parent still holds the models
+            return super()._analyze_pending(chunks, entities, affinity)
+        if affinity is not None or len(chunks) == 1:
+            worker = self._workers[hash(affinity) % len(self._workers)]
+            with worker.lock:
+                worker.send(chunks, entities)
+                return worker.receive()
+        # contiguous shards keep similar neighbouring chunks in one GLiNER batch;
+        # locks are taken in worker order so concurrent callers cannot deadlock
+        size = -(-len(chunks) // len(self._workers))
+        shards = [chunks[i:i + size] for i in range(0, len(chunks), size)]
+        workers = self._workers[:len(shards)]
+        for worker in workers:
+            worker.lock.acquire()
+        try:
+            sent, error = [], None
+            for worker, shard in zip(workers, shards):
+                try:
+                    worker.send(shard, entities)
+                    sent.append(worker)
+                except RuntimeError as exc:
+                    error = error or exc
+            # drain every reply before raising so no pipe is left out of step
+            replies = []
+            for worker in sent:
+                try:
+                    replies.extend(worker.receive())
+                except RuntimeError as exc:
+                    error = error or exc
+            if error is not None:
+                raise error
+            return replies
+        finally:
+            for worker in workers:
+                worker.lock.release()
+
+    def close(self):
+        """Stop the workers, then release the parent's model references."""
+        workers, self._workers = self._workers, ()
+        zygote, self._zygote = self._zygote, None
+        for worker in workers:
+            worker.stop()
+        if zygote is not None:
+            zygote.stop()
+        super().close()
@@ -0,0 +1,42 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, List, Optional
+
+
+class BatchPrefetchRecognizer(ABC):
+    """
+    Mixin for recognizers that can predict many chunks in one batched model
+    call. Subclasses implement `predict_batch(texts, batch_size)`, returning
+    raw predictions per text in input order, and create
+    `self._prefetched = threading.local()` in __init__ - thread-local because
+    one runtime serves many sessions concurrently. Their analyze() then
+    reuses `prefetched(text)` when it is not None. A subclass without
+    `predict_batch` cannot be instantiated.
+    """
+
+    @abstractmethod
+    def predict_batch(self, texts: List[str], batch_size: Optional[int] = None) -> List[Any]:
+        """Raw predictions for `texts`, one per text in input order."""
+
+    @contextmanager
+    def prefetch(self, texts: List[str], batch_size: Optional[int] = None):
+        """
+        Predict all `texts` in batches up front; analyze() calls made inside
+        the block for one of these texts reuse the batched prediction.
+        """
+        unique = list(dict.fromkeys(texts))
+        previous = getattr(self._prefetched, "spans", None)
+        self._prefetched.spans = dict(zip(unique, self.predict_batch(unique, batch_size)))
+        try:
+            yield self
+        finally:
+            self._prefetched.spans = previous
+
+    def prefetched(self, text: str) -> Optional[Any]:
+        """Prediction for `text` from the enclosing prefetch() block, if any."""
+        spans = getattr(self._prefetched, "spans", None)
+        return None if spans is None else spans.get(text)
+
+    def runs_concurrently(self, text: str) -> bool:
+        # prefetched predictions are a dict lookup, not worth a pool thread
+        return self.prefetched(text) is None
@@ -12,6 +12,8 @@ from presidio_analyzer.nlp_engine import NlpArtifacts
 from flair.data import Sentence
 from flair.models import SequenceTagger
 
+from ..utils.inference_profile import DEFAULT_INFERENCE_PROFILE, InferenceProfile
+
 import logging
 logger = logging.getLogger(__name__)
 
@@ -73,6 +75,7 @@ class FlairRecognizer(EntityRecognizer):
         check_label_groups: Optional[Tuple[Set, Set]] = None,
         model: SequenceTagger = None,
         model_path: Optional[str] = None,
+        profile: Optional[InferenceProfile] = None,
     ):
         self.check_label_groups = (
             check_label_groups if check_label_groups else self.CHECK_LABEL_GROUPS
@@ -93,6 +96,10 @@ class FlairRecognizer(EntityRecognizer):
                 self.MODEL_LANGUAGES.get(supported_language)
             )
 
+        self.profile = profile or DEFAULT_INFERENCE_PROFILE
+        self.profile.apply_threads()
+        self.model = self.profile.prepare(self.model)
+
         super().__init__(
             supported_entities=supported_entities,
             supported_language=supported_language,
@@ -129,7 +136,8 @@ class FlairRecognizer(EntityRecognizer):
         results = []
 
         sentences = Sentence(text)
-        self.model.predict(sentences)
+        with self.profile.context():
+            self.model.predict(sentences)
 
         # If there are no specific list of entities, we will look for all of it.
         if not entities:
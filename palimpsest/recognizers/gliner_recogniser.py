@@ -1,4 +1,10 @@
+from pathlib import Path
 from typing import Optional, List, Tuple, Set
+import importlib.util
+import os
+import shutil
+import tempfile
+import threading
 
 import torch
 
@@ -7,6 +13,12 @@ from presidio_analyzer import AnalyzerEngine, EntityRecognizer, RecognizerResult
 from gliner import GLiNER
 import re
 
+from .. import model_registry
+from ..parallel_analyzer import ConcurrentRecognizer
+from ..utils.inference_profile import DEFAULT_INFERENCE_PROFILE, InferenceProfile
+from ..utils.micro_batcher import MicroBatcher
+from .batching import BatchPrefetchRecognizer
+
 import logging
 logger = logging.getLogger(__name__)
 
@@ -35,15 +47,109 @@ def merge_spans(results, entity_type, text, delim_pattern=r'^[\s,;:\-]+$'):
         merged.append(cur)
     return others + merged
 
-class GlinerRecognizer(EntityRecognizer):
+# ONNX exports are made once per model and reused by every later process
+ONNX_CACHE_DIR = os.environ.get("PALIMPSEST_ONNX_CACHE", "~/.cache/palimpsest/onnx")
+# backend -> artifact inside the export directory; "torch" loads the checkpoint as is
+_ONNX_FILES = {
+    "onnx": "model.onnx",
+    "onnx-int8": "model_quantized.onnx",
+}
+
+
+def _onnxruntime_available() -> bool:
+    return importlib.util.find_spec("onnxruntime") is not None
+
+
+def _onnx_dir(model_path: str) -> Path:
+    return Path(os.path.expanduser(ONNX_CACHE_DIR)) / model_path.replace("/", "--")
+
+
+def _export_onnx(model_path: str, backend: str) -> Path:
+    """
+    Directory holding the ONNX export of `model_path` for `backend`, exporting
+    (and for "onnx-int8" dynamically quantizing) the checkpoint on first use.
+    The export is written to a scratch directory and moved in file by file,
+    artifact last, so a concurrent loader never sees a half-written model.
+    """
+    directory = _onnx_dir(model_path)
+    artifact = _ONNX_FILES[backend]
+    if (directory / artifact).exists():
+        return directory
+    if not _onnxruntime_available():
+        raise ImportError(f"GLiNER backend {backend!r} requires the onnxruntime package")
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    scratch = Path(tempfile.mkdtemp(prefix=directory.name + ".", dir=directory.parent))
+    try:
+        logger.info(f"Exporting GLiNER {model_path} to ONNX ({backend}) in {directory}")
+        exported = GLiNER.from_pretrained(model_path).export_to_onnx(
+            scratch, quantize=backend == "onnx-int8"
+        )
+        if backend == "onnx-int8" and exported["quantized_path"] is None:
+            raise RuntimeError(f"int8 quantization of the GLiNER ONNX export of {model_path} failed")
+        directory.mkdir(exist_ok=True)
+        files = sorted(scratch.iterdir(), key=lambda f: f.name in _ONNX_FILES.values())
+        for file in files:
+            os.replace(file, directory / file.name)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return directory
+
+
+def _load_gliner(model_path: str, backend: str = "torch") -> GLiNER:
+    try:
+        if backend == "torch":
+            model = GLiNER.from_pretrained(model_path) #, local_files_only=True)
+        else:
+            model = GLiNER.from_pretrained(
+                str(_export_onnx(model_path, backend)),
+                runtime="onnxruntime",
+                runtime_model_file=_ONNX_FILES[backend],
+            )
+    except Exception as exc:
+        exc.add_note(
+            "Palimpsest "
+            "operation=gliner_model_load "
+            "component=GlinerRecognizer "
+            f"model_path={model_path!r} "
+            f"backend={backend!r}"
+        )
+        raise
+    if backend != "torch":
+        # ONNX Runtime sessions run on the CPU execution provider
+        return model
+    # Move model to device explicitly
+    try:
+        model.to(device)
+    except Exception:
+        logger.warning(f"Could not move GLiNER model to device {device}")
+    return model
+
+
+def _prepare(model: GLiNER, profile: InferenceProfile) -> GLiNER:
+    # GLiNER.inference calls its inner model, so that is what gets compiled
+    return profile.prepare(model, core=getattr(model, "model", None))
+
+
+class GlinerRecognizer(BatchPrefetchRecognizer, ConcurrentRecognizer, EntityRecognizer):
+    _batcher = None
+    _profile = DEFAULT_INFERENCE_PROFILE
+
     def __init__(
         self,
         supported_language: str = "ru",
         run_entities: Optional[List[str]] = None,
         check_label_groups: Optional[Tuple[Set, Set]] = None,
         model_path: Optional[str] = "gliner-community/gliner_large-v2.5",
-        
+        batch_size: int = 8,
+        batch_wait_ms: float = 0.0,
+        backend: str = "torch",
+        profile: Optional[InferenceProfile] = None,
     ):
+        if backend != "torch" and backend not in _ONNX_FILES:
+            raise ValueError(f"GLiNER backend {backend} not supported")
+        profile = profile or DEFAULT_INFERENCE_PROFILE
+        if backend != "torch" and (profile.bf16 or profile.compile):
+            raise ValueError("bf16 and compile inference options need the torch GLiNER backend")
         # map them to the Presidio-standard types:
 
         self.label_map  = {
@@ -61,35 +167,84 @@ class GlinerRecognizer(EntityRecognizer):
         
         supported_entities = list(set(self.label_map.values()))
         self.raw_labels = list(self.label_map.keys())
+        self.batch_size = batch_size
+        self.threshold = 0.35
+        self._profile = profile
+        profile.apply_threads()
+        # predictions computed ahead of presidio's per-chunk analyze() calls;
+        # thread-local because one runtime serves many sessions concurrently
+        self._prefetched = threading.local()
+        # with a deadline, prefetches of concurrent callers share GLiNER batches
+        self._batcher = None
+        if batch_wait_ms > 0:
+            self._batcher = MicroBatcher(
+                self._predict_sorted,
+                max_batch_size=batch_size,
+                max_wait=batch_wait_ms / 1000,
+            )
         super().__init__(
             supported_entities=supported_entities,
             supported_language="en",
             name="GlinerRecognizer",
         )
-        try:
-            self._model = GLiNER.from_pretrained(model_path) #, local_files_only=True)
-        except Exception as exc:
-            exc.add_note(
-                "Palimpsest "
-                "operation=gliner_model_load "
-                "component=GlinerRecognizer "
-                f"model_path={model_path!r}"
-            )
-            raise
-        # Move model to device explicitly
-        try:
-            self._model.to(device)
-        except Exception:
-            logger.warning(f"Could not move GLiNER model to device {device}")
+        # weights are shared by every recognizer using the same model_path and
+        # backend; the label set above stays per instance
+        variant = profile.weights_key if backend == "torch" else (backend,)
+        self._model = model_registry.acquire(
+            ("gliner", model_path, *variant),
+            lambda: _prepare(_load_gliner(model_path, backend), profile),
+        )
 
     def is_language_supported(self, language: str) -> bool:
         # Принудительно говорим Presidio: "вызывайте меня всегда"
         return True
 
-    def analyze(self, text: str, entities=None, **kwargs):
-        # запускаем Natasha NER
-        spans = self._model.predict_entities(text=text, labels = self.raw_labels, flat_ner=True, threshold=0.35, multi_label=False)
+    def _predict(self, texts: List[str], batch_size: Optional[int] = None) -> List[List[dict]]:
+        with self._profile.context():
+            return self._model.inference(
+                texts,
+                labels=self.raw_labels,
+                flat_ner=True,
+                threshold=self.threshold,
+                multi_label=False,
+                batch_size=batch_size or self.batch_size,
+            )
+
+    @property
+    def micro_batching(self) -> bool:
+        return self._batcher is not None
+
+    def close(self) -> None:
+        if self._batcher is not None:
+            self._batcher.close()
+
+    def predict_batch(self, texts: List[str], batch_size: Optional[int] = None) -> List[List[dict]]:
+        """
+        Run GLiNER over many texts in batches and return raw spans per text.
+        Texts are bucketed by length (longest first) so every batch pads to
+        similar lengths; results are returned in the original order.
+        With micro-batching the texts are queued together with those of
+        concurrent callers instead.
+        """
+        if self._batcher is not None:
+            return self._batcher.submit(texts)
+        return self._predict_sorted(texts, batch_size)
 
+    def _predict_sorted(self, texts: List[str], batch_size: Optional[int] = None) -> List[List[dict]]:
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        predicted = self._predict([texts[i] for i in order], batch_size) if order else []
+        spans: List[List[dict]] = [[] for _ in texts]
+        for idx, text_spans in zip(order, predicted):
+            spans[idx] = text_spans
+        return spans
+
+    def analyze_batch(self, texts: List[str], entities=None, batch_size: Optional[int] = None) -> List[List[RecognizerResult]]:
+        return [
+            self._to_results(text, spans, entities)
+            for text, spans in zip(texts, self.predict_batch(texts, batch_size))
+        ]
+
+    def _to_results(self, text: str, spans: List[dict], entities=None) -> List[RecognizerResult]:
         results = []
         for span in spans:
             # Переводим PER/LOC/ORG → Presidio-тизеры
@@ -113,6 +268,15 @@ class GlinerRecognizer(EntityRecognizer):
 
         return results
 
+    def analyze(self, text: str, entities=None, **kwargs):
+        submitted = self.submitted_results(text)
+        if submitted is not None:
+            return submitted
+        spans = self.prefetched(text)
+        if spans is None:
+            with self._profile.context():
+                spans = self._model.predict_entities(text=text, labels = self.raw_labels, flat_ner=True, threshold=self.threshold, multi_label=False)
+        return self._to_results(text, spans, entities)
 
 if __name__ == "__main__":
     #from ..sentence_splitter import chunk_sentences
@@ -2,10 +2,16 @@ from presidio_analyzer import AnalyzerEngine, EntityRecognizer, RecognizerResult
 from navec import Navec
 from slovnet import NER
 
+from typing import List, Optional
+import threading
+
+from .batching import BatchPrefetchRecognizer
+from .natasha_recogniser import _ner_spans
+
 import logging
 logger = logging.getLogger(__name__)
 
-class SlovnetRecognizer(EntityRecognizer):
+class SlovnetRecognizer(BatchPrefetchRecognizer, EntityRecognizer):
     def __init__(self):
         # мы отдаем только три базовых типа из Natasha: PER, LOC, ORG
         supported_entities = ["PERSON", "LOCATION", "ORGANIZATION"]
@@ -16,18 +22,23 @@ class SlovnetRecognizer(EntityRecognizer):
         self._navec = Navec.load('data/navec_news_v1_1B_250K_300d_100q.tar')
         self._ner = NER.load('data/slovnet_ner_news_v1.tar')
         self._ner.navec(self._navec)
-        # инициализируем Natasha-пайплайн
+        self._prefetched = threading.local()
 
     def is_language_supported(self, language: str) -> bool:
         # Принудительно говорим Presidio: "вызывайте меня всегда"
         return True
 
+    def predict_batch(self, texts: List[str], batch_size: Optional[int] = None) -> List[list]:
+        return _ner_spans(self._ner, texts)
+
     def analyze(self, text: str, entities=None, **kwargs):
         # запускаем Natasha NER
-        doc = self._ner(text)
+        spans = self.prefetched(text)
+        if spans is None:
+            spans = self.predict_batch([text])[0]
 
         results = []
-        for span in doc.spans:
+        for span in spans:
             # Переводим PER/LOC/ORG → Presidio-тизеры
             label = span.type  # "PER", "LOC", "ORG"
             presidio_label = {
@@ -0,0 +1,154 @@
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+Match = Tuple[int, int, Any]
+
+
+class AhoCorasick:
+    """
+    Incremental Aho–Corasick automaton mapping string patterns to payloads.
+
+    Patterns go into the trie as they arrive; failure links are rebuilt
+    lazily before the next scan, so growing the table between scans is
+    cheap. `find` returns leftmost-longest, non-overlapping matches.
+
+    With `word_boundaries=True` a match must not continue a word: a pattern
+    starting (ending) with a letter or digit is rejected when the text has a
+    letter or digit right before (after) it, so "Анна" does not match inside
+    "Анналы".
+    """
+
+    def __init__(self, word_boundaries: bool = True):
+        self._word_boundaries = word_boundaries
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._depth: List[int] = [0]
+        # payload of the pattern ending exactly at the state
+        self._payload: List[Optional[Tuple[Any]]] = [None]
+        # nearest state on the failure chain that ends a pattern
+        self._output_link: List[int] = [0]
+        self._patterns = 0
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return self._patterns
+
+    def __bool__(self) -> bool:
+        return self._patterns > 0
+
+    def add(self, pattern: str, payload: Any = None) -> None:
+        """Insert `pattern`; re-adding a pattern replaces its payload."""
+        if not pattern:
+            raise ValueError("AhoCorasick patterns must be non-empty strings")
+        state = 0
+        for char in pattern:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._depth.append(self._depth[state] + 1)
+                self._payload.append(None)
+                self._output_link.append(0)
+                self._dirty = True
+            state = nxt
+        if self._payload[state] is None:
+            self._patterns += 1
+            # states whose failure chain passes here need their output links rebuilt
+            self._dirty = True
+        self._payload[state] = (payload,)
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            fail = self._fail[state]
+            self._output_link[state] = fail if self._payload[fail] is not None else self._output_link[fail]
+            for char, nxt in self._goto[state].items():
+                f = fail
+                while f and char not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                queue.append(nxt)
+        self._dirty = False
+
+    def step(self, state: int, char: str) -> int:
+        """Advance the automaton by one character."""
+        if self._dirty:
+            self._build()
+        while state and char not in self._goto[state]:
+            state = self._fail[state]
+        return self._goto[state].get(char, 0)
+
+    def depth(self, state: int) -> int:
+        """Length of the longest text suffix that is a prefix of some pattern."""
+        return self._depth[state]
+
+    def open_prefix(self, text: str) -> int:
+        """Length of the longest suffix of text that may still grow into a match."""
+        state = 0
+        for char in text:
+            state = self.step(state, char)
+        return self._depth[state]
+
+    def iter_matches(self, text: str) -> Iterator[Match]:
+        """Yield every occurrence `(start, end, payload)`, overlapping ones included."""
+        if not self._patterns:
+            return
+        state = 0
+        for pos, char in enumerate(text):
+            state = self.step(state, char)
+            out = state if self._payload[state] is not None else self._output_link[state]
+            while out:
+                end = pos + 1
+                yield end - self._depth[out], end, self._payload[out][0]
+                out = self._output_link[out]
+
+    def _at_boundary(self, text: str, start: int, end: int) -> bool:
+        if not self._word_boundaries:
+            return True
+        if start > 0 and text[start].isalnum() and text[start - 1].isalnum():
+            return False
+        if end < len(text) and text[end - 1].isalnum() and text[end].isalnum():
+            return False
+        return True
+
+    def find(self, text: str, start: int = 0) -> List[Match]:
+        """
+        Leftmost-longest, non-overlapping matches in text order.
+
+        Matches starting before `start` are ignored; `text[:start]` only serves
+        as left context for the word-boundary check.
+        """
+        candidates = sorted(
+            (
+                m
+                for m in self.iter_matches(text)
+                if m[0] >= start and self._at_boundary(text, m[0], m[1])
+            ),
+            key=lambda m: (m[0], -m[1]),
+        )
+        matches: List[Match] = []
+        covered = 0
+        for match in candidates:
+            if match[0] >= covered:
+                matches.append(match)
+                covered = match[1]
+        return matches
+
+    def replace(self, text: str) -> str:
+        """Rewrite every `find` match with its payload in a single pass."""
+        pieces = []
+        pos = 0
+        for start, end, payload in self.find(text):
+            pieces.append(text[pos:start])
+            pieces.append(payload)
+            pos = end
+        if not pos:
+            return text
+        pieces.append(text[pos:])
+        return "".join(pieces)
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+from typing import Iterable, List, Optional, Tuple
+
+from presidio_analyzer import RecognizerResult
+
+# (entity_type, start, end, score, recognition_metadata), chunk-relative
+Span = Tuple[str, int, int, float, Optional[dict]]
+
+# bump when the stored span format or the analysis pipeline changes in a way
+# the package versions below do not capture
+CACHE_VERSION = 1
+_VERSIONED_PACKAGES = ("palimpsest", "presidio-analyzer", "gliner", "natasha", "slovnet", "spacy")
+
+
+@lru_cache(maxsize=None)
+def cache_fingerprint() -> str:
+    """What cached spans depend on besides the model: CACHE_VERSION and the versions of the recognizer packages."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    parts = [f"analysis_cache {CACHE_VERSION}"]
+    for package in _VERSIONED_PACKAGES:
+        try:
+            parts.append(f"{package} {version(package)}")
+        except PackageNotFoundError:
+            parts.append(f"{package} missing")
+    return ";".join(parts)
+
+
+class AnalysisCache:
+    """
+    Content-addressed cache of analyzer results for single chunks.
+
+    Keys hash the chunk text together with the requested entity set, the
+    model identity and `cache_fingerprint()`, so the cache never serves spans
+    produced by another model, for other entities, or by an older release of
+    the recognizers. Values are chunk-relative spans only - no text is
+    stored, in memory or on disk.
+
+    The memory tier is an LRU bounded by `max_entries`. With `path` set, an
+    SQLite file backs it as a second tier that survives restarts; disk hits
+    are promoted into memory. Writes of one `put_many` go to disk in a single
+    transaction. Safe to share between threads and runtimes.
+    """
+
+    def __init__(self, max_entries: int = 10000, path: str = None):
+        if max_entries < 1:
+            raise ValueError("AnalysisCache max_entries must be positive")
+        self._max_entries = max_entries
+        self._memory: "OrderedDict[str, Tuple[Span, ...]]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._db = None
+        if path:
+            path = os.path.expanduser(path)
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            try:
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS analysis (key TEXT PRIMARY KEY, spans TEXT NOT NULL)"
+                )
+                self._db.commit()
+            except sqlite3.Error as exc:
+                exc.add_note(
+                    "Palimpsest "
+                    "operation=analysis_cache_init "
+                    "component=AnalysisCache "
+                    f"path={path!r}"
+                )
+                raise
+
+    @staticmethod
+    def key(chunk: str, entities: Iterable[str], model_id: str) -> str:
+        digest = hashlib.sha256()
+        for part in (cache_fingerprint(), model_id, ",".join(sorted(set(entities))), chunk):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[List[RecognizerResult]]:
+        with self._lock:
+            spans = self._memory.get(key)
+            if spans is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._results(spans)
+            if self._db is not None:
+                row = self._db.execute("SELECT spans FROM analysis WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    spans = tuple(tuple(span) for span in json.loads(row[0]))
+                    self._remember(key, spans)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return self._results(spans)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, results: Iterable[RecognizerResult]) -> None:
+        self.put_many([(key, results)])
+
+    def put_many(self, items: Iterable[Tuple[str, Iterable[RecognizerResult]]]) -> None:
+        """Store several `(key, results)` pairs; the disk tier commits once for all of them."""
+        entries = [
+            (key, tuple((r.entity_type, r.start, r.end, r.score, r.recognition_metadata) for r in results))
+            for key, results in items
+        ]
+        if not entries:
+            return
+        with self._lock:
+            for key, spans in entries:
+                self._remember(key, spans)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO analysis (key, spans) VALUES (?, ?)",
+                    [(key, json.dumps(spans, default=str)) for key, spans in entries],
+                )
+                self._db.commit()
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers; counters are kept."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM analysis")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self._memory),
+                "max_entries": self._max_entries,
+            }
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _remember(self, key: str, spans: Tuple[Span, ...]) -> None:
+        self._memory[key] = spans
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _results(spans: Tuple[Span, ...]) -> List[RecognizerResult]:
+        return [
+            RecognizerResult(entity_type, start, end, score, recognition_metadata=metadata)
+            for entity_type, start, end, score, metadata in spans
+        ]
@@ -0,0 +1,102 @@
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _bf16_supported() -> bool:
+    """Whether the CPU has native bf16 matmuls (AVX512-BF16 or AMX); elsewhere bf16 is emulated and slower."""
+    import torch
+
+    return torch.backends.mkldnn.is_available() and (
+        torch.cpu._is_avx512_bf16_supported() or torch.cpu._is_amx_tile_supported()
+    )
+
+
+@dataclass(frozen=True)
+class InferenceProfile:
+    """
+    How the torch-backed recognizers (GLiNER, Flair) run inference on the CPU.
+
+    `threads` / `interop_threads` set torch's intra-/inter-op thread pools;
+    both are process-wide, `None` keeps torch's defaults. `inference_mode`
+    wraps every prediction in `torch.inference_mode()`. `compile` runs the
+    model's forward through `torch.compile`, and `bf16` casts the weights to
+    bfloat16 when the CPU supports it natively. The default profile changes
+    nothing but the inference mode.
+    """
+
+    threads: Optional[int] = None
+    interop_threads: Optional[int] = None
+    inference_mode: bool = True
+    compile: bool = False
+    bf16: bool = False
+
+    def __post_init__(self):
+        for name in ("threads", "interop_threads"):
+            value = getattr(self, name)
+            if value is not None and value < 1:
+                raise ValueError(f"InferenceProfile {name} must be positive")
+
+    @property
+    def casts_bf16(self) -> bool:
+        """Whether `prepare` really casts to bfloat16: requested and native on this CPU."""
+        return self.bf16 and _bf16_supported()
+
+    @property
+    def weights_key(self) -> Tuple[str, ...]:
+        """
+        Options that change the model object itself, as applied by `prepare`;
+        models prepared differently are never shared. bf16 requested on a CPU
+        without native support keeps fp32 weights and is not part of the key.
+        """
+        return tuple(name for name, applied in (("bf16", self.casts_bf16), ("compile", self.compile)) if applied)
+
+    def apply_threads(self) -> None:
+        import torch
+
+        if self.threads is not None and torch.get_num_threads() != self.threads:
+            torch.set_num_threads(self.threads)
+        if self.interop_threads is not None and torch.get_num_interop_threads() != self.interop_threads:
+            try:
+                torch.set_num_interop_threads(self.interop_threads)
+            except RuntimeError:
+                # torch allows it only before the first inter-op parallel work
+                logger.warning(
+                    f"Could not set torch inter-op threads to {self.interop_threads}; "
+                    f"keeping {torch.get_num_interop_threads()}"
+                )
+
+    def prepare(self, model, core=None):
+        """
+        Apply the weight options to a freshly loaded `model` and return it.
+        `core` is the submodule whose forward does the heavy lifting (default:
+        `model`); only it is compiled.
+        """
+        if not (self.bf16 or self.compile):
+            return model
+        import torch
+
+        if self.casts_bf16:
+            model.to(torch.bfloat16)
+        elif self.bf16:
+            logger.warning("CPU has no native bf16 support; keeping float32 weights")
+        if self.compile:
+            core = model if core is None else core
+            core.forward = torch.compile(core.forward, dynamic=True)
+        return model
+
+    def context(self):
+        """Context manager to run one prediction in."""
+        if not self.inference_mode:
+            return nullcontext()
+        import torch
+
+        return torch.inference_mode()
+
+
+DEFAULT_INFERENCE_PROFILE = InferenceProfile()
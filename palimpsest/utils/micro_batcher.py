@@ -0,0 +1,107 @@
+import time
+from queue import Empty, SimpleQueue
+from threading import Event, Lock, Thread
+from typing import Callable, List, Sequence
+
+_STOP = object()
+
+
+class _Request:
+    __slots__ = ("results", "remaining", "error", "done")
+
+    def __init__(self, size: int):
+        self.results = [None] * size
+        self.remaining = size
+        self.error = None
+        self.done = Event()
+
+
+class MicroBatcher:
+    """
+    Dynamic batching of items submitted by concurrent callers.
+
+    `submit` blocks its caller while a single worker thread gathers items from
+    every caller into batches of at most `max_batch_size`. A batch is closed
+    when it is full or `max_wait` seconds after its first item arrived, then
+    `fn(items)` runs once and every caller gets the results of its own items,
+    in order. Identical items in one batch are computed once. An exception
+    raised by `fn` is re-raised in every caller of that batch.
+    """
+
+    def __init__(self, fn: Callable[[List], List], max_batch_size: int = 8, max_wait: float = 0.005):
+        if max_batch_size < 1:
+            raise ValueError("MicroBatcher max_batch_size must be positive")
+        if max_wait < 0:
+            raise ValueError("MicroBatcher max_wait must not be negative")
+        self._fn = fn
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._queue = SimpleQueue()
+        self._lock = Lock()
+        self._worker = None
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, items: Sequence) -> List:
+        if not items:
+            return []
+        request = _Request(len(items))
+        self._start()
+        for index, item in enumerate(items):
+            self._queue.put((item, request, index))
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.results
+
+    def close(self) -> None:
+        """Finish the queued batches and stop the worker; a later submit restarts it."""
+        with self._lock:
+            worker, self._worker = self._worker, None
+            if worker is not None:
+                self._queue.put(_STOP)
+        if worker is not None:
+            worker.join()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._worker is None:
+                self._worker = Thread(target=self._run, name="palimpsest-micro-batcher", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self._max_wait
+            while len(batch) < self._max_batch_size:
+                try:
+                    entry = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: list) -> None:
+        unique = list(dict.fromkeys(item for item, _, _ in batch))
+        try:
+            computed = dict(zip(unique, self._fn(unique)))
+            error = None
+        except Exception as exc:
+            computed, error = {}, exc
+        self.batches += 1
+        self.items += len(batch)
+        for item, request, index in batch:
+            if error is not None:
+                request.error = error
+            else:
+                request.results[index] = computed[item]
+            request.remaining -= 1
+            if request.remaining == 0:
+                request.done.set()
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Any, Callable, List, Tuple
+from typing import Any, Callable, Iterable, Iterator, List, Tuple, Union
 
 from nltk.tokenize import word_tokenize, sent_tokenize
 
@@ -173,3 +173,47 @@ def split_text(text: str, max_chunk_size: int, _len: Callable[[str], int] = len)
         else:
             chunks.append(line)
     return chunks
+
+# ---------------------
+# Streaming: cut an arbitrarily large source into sentence-aligned windows.
+def _window_cut(text: str, window_size: int) -> int:
+    # Prefer the last line break, then the last sentence start, then the last
+    # whitespace inside the window; cut hard only when there is none.
+    cut = text.rfind("\n", 0, window_size) + 1
+    if cut:
+        return cut
+    head = text[:window_size]
+    sentences = sent_tokenize(head, language='russian')
+    if len(sentences) > 1:
+        cut = head.rfind(sentences[-1])
+        if cut > 0:
+            return cut
+    cut = max(head.rfind(" "), head.rfind("\t")) + 1
+    return cut or window_size
+
+
+def iter_windows(source: Union[str, Iterable[str], Any], window_size: int) -> Iterator[str]:
+    """
+    Yield consecutive windows of at most `window_size` characters from `source`
+    (a string, an iterable of strings, or a text file object), breaking at line
+    or sentence boundaries. Concatenating the windows restores the source;
+    at most about two windows of text are held in memory.
+    """
+    if isinstance(source, str):
+        pieces = [source]
+    elif callable(getattr(source, "read", None)):
+        pieces = iter(lambda: source.read(window_size), "")
+    else:
+        pieces = source
+
+    buffer = ""
+    for piece in pieces:
+        buffer += piece
+        pos = 0
+        while len(buffer) - pos > window_size:
+            cut = _window_cut(buffer[pos:pos + window_size], window_size)
+            yield buffer[pos:pos + cut]
+            pos += cut
+        buffer = buffer[pos:]
+    if buffer:
+        yield buffer
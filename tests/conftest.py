@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import re
 import sys
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 from types import SimpleNamespace
@@ -46,6 +48,87 @@ class StubEngineItem:
         }
 
 
+class CountingContext:
+    """Deterministic FakerContext stand-in: PersonN fakes, exact restore."""
+
+    def __init__(self):
+        self.true_to_fake = {}
+        self.fake_to_true = {}
+
+    def fake(self, value):
+        if value not in self.true_to_fake:
+            fake = f"Person{len(self.true_to_fake) + 1}"
+            self.true_to_fake[value] = fake
+            self.fake_to_true[fake] = value
+        return self.true_to_fake[value]
+
+    def defake(self, value):
+        return self.fake_to_true.get(value, value)
+
+    def reset(self):
+        self.true_to_fake.clear()
+        self.fake_to_true.clear()
+
+    def __getattr__(self, name):
+        if name.startswith("fake_"):
+            return self.fake
+        if name.startswith("defake"):
+            return self.defake
+        raise AttributeError(name)
+
+
+class PrefetchRecognizer:
+    """Batch recognizer stand-in that records the chunks it is asked to prefetch."""
+
+    supported_entities = ["PERSON"]
+
+    def __init__(self):
+        self.prefetched = []
+
+    @contextmanager
+    def prefetch(self, texts, batch_size=None):
+        self.prefetched.append(list(texts))
+        yield self
+
+
+class RegexAnalyzer:
+    """Analyzer stand-in: every match of `pattern` is a PERSON; analyzed chunks are recorded."""
+
+    def __init__(self, pattern: str, recognizers=()):
+        self.pattern = re.compile(pattern)
+        self.registry = SimpleNamespace(recognizers=list(recognizers))
+        self.analyzed = []
+
+    def analyze(self, text, entities, language, return_decision_process):
+        from presidio_analyzer import RecognizerResult
+
+        self.analyzed.append(text)
+        return [
+            RecognizerResult("PERSON", m.start(), m.end(), 0.9)
+            for m in self.pattern.finditer(text)
+        ]
+
+
+def make_stub_runtime(analyzer, batch_size: int = 1):
+    """A PERSON-only `_PalimpsestRuntime` around `analyzer`, built without loading models."""
+    from presidio_anonymizer import AnonymizerEngine
+
+    import palimpsest.palimpsest as palimpsest_module
+
+    runtime = palimpsest_module._PalimpsestRuntime.__new__(
+        palimpsest_module._PalimpsestRuntime
+    )
+    runtime._run_entities = ["PERSON"]
+    runtime._analyzer = analyzer
+    runtime._analyzer_entities = ["PERSON"]
+    runtime._calc_len = len
+    runtime._batch_size = batch_size
+    runtime._batch_recognizers = palimpsest_module._batch_recognizers(analyzer)
+    runtime._engine = AnonymizerEngine()
+    runtime._cr_key = None
+    return runtime
+
+
 def exception_notes(exc: BaseException) -> str:
     return "\n".join(getattr(exc, "__notes__", ()))
 
@@ -68,10 +151,10 @@ def lightweight_palimpsest_factory(monkeypatch):
     }
 
     class FakeRuntime:
-        def __init__(self, run_entities=None):
+        def __init__(self, run_entities=None, **options):
             calls["run_entities"] = run_entities
 
-        def anonymize(self, ctx, text):
+        def anonymize(self, ctx, text, **options):
             if not isinstance(text, str):
                 raise TypeError("text must be str")
             anon_calls = calls["anon"]
@@ -104,6 +187,9 @@ def lightweight_palimpsest_factory(monkeypatch):
         def analyze(self, text):
             return text, []
 
+        def close(self):
+            pass
+
     monkeypatch.setattr(palimpsest_module, "_runtime_factory", FakeRuntime)
     return calls
 
@@ -114,6 +200,7 @@ def deterministic_faker_context(monkeypatch):
 
     monkeypatch.setattr(context_module, "fake_factory", lambda locale=None: None)
     monkeypatch.setattr(context_module, "calc_hash", lambda value: f"h:{value}".lower())
+    monkeypatch.setattr(context_module, "calc_hashes", lambda values: [f"h:{value}".lower() for value in values])
 
     class FakeModule:
         counter = 0
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from tests.conftest import PrefetchRecognizer
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.state]
+
+
+def result(start, end, entity_type="PERSON"):
+    from presidio_analyzer import RecognizerResult
+
+    return RecognizerResult(entity_type, start, end, 0.9, recognition_metadata={"recognizer_name": "test"})
+
+
+def test_cache_keys_cover_content_entities_and_model():
+    from palimpsest import AnalysisCache
+
+    key = AnalysisCache.key("Alice", ["PERSON", "URL"], "gliner:a")
+
+    assert key == AnalysisCache.key("Alice", ["URL", "PERSON"], "gliner:a")
+    assert key != AnalysisCache.key("Alice ", ["PERSON", "URL"], "gliner:a")
+    assert key != AnalysisCache.key("Alice", ["PERSON"], "gliner:a")
+    assert key != AnalysisCache.key("Alice", ["PERSON", "URL"], "gliner:b")
+
+
+def test_cache_keys_change_with_the_recognizer_versions(monkeypatch):
+    import palimpsest.utils.analysis_cache as cache_module
+
+    key = cache_module.AnalysisCache.key("Alice", ["PERSON"], "gliner:a")
+    monkeypatch.setattr(cache_module, "cache_fingerprint", lambda: "gliner 99")
+
+    assert key != cache_module.AnalysisCache.key("Alice", ["PERSON"], "gliner:a")
+
+
+def test_memory_tier_is_lru_bounded_and_counts_hits():
+    from palimpsest import AnalysisCache
+
+    cache = AnalysisCache(max_entries=2)
+    cache.put("a", [result(0, 5)])
+    cache.put("b", [])
+    assert [(r.entity_type, r.start, r.end) for r in cache.get("a")] == [("PERSON", 0, 5)]
+    cache.put("c", [])
+
+    assert cache.get("b") is None
+    assert cache.get("c") == []
+    assert cache.stats() == {"hits": 2, "disk_hits": 0, "misses": 1, "entries": 2, "max_entries": 2}
+    with pytest.raises(ValueError):
+        AnalysisCache(max_entries=0)
+
+
+def test_disk_tier_survives_restarts_without_storing_text(tmp_path):
+    from palimpsest import AnalysisCache
+
+    path = tmp_path / "cache" / "analysis.sqlite"
+    key = AnalysisCache.key("secret Alice", ["PERSON"], "gliner:a")
+    AnalysisCache(path=str(path)).put(key, [result(7, 12)])
+
+    restarted = AnalysisCache(path=str(path))
+    cached = restarted.get(key)
+
+    assert [(r.start, r.end, r.recognition_metadata) for r in cached] == [
+        (7, 12, {"recognizer_name": "test"})
+    ]
+    assert restarted.stats()["disk_hits"] == 1
+    assert b"secret Alice" not in path.read_bytes()
+
+
+def test_disk_tier_writes_a_batch_in_one_transaction(tmp_path):
+    from palimpsest import AnalysisCache
+
+    cache = AnalysisCache(path=str(tmp_path / "analysis.sqlite"))
+    statements = []
+    cache._db.set_trace_callback(statements.append)
+    cache.put_many((f"k{i}", [result(0, i + 1)]) for i in range(50))
+
+    assert statements.count("COMMIT") == 1
+    restarted = AnalysisCache(path=str(tmp_path / "analysis.sqlite"))
+    assert [(r.start, r.end) for r in restarted.get("k49")] == [(0, 50)]
+    assert len(cache) == 50
+
+
+def test_runtime_analyzes_repeated_chunks_once_and_skips_their_prefetch(monkeypatch):
+    import palimpsest.palimpsest as palimpsest_module
+    import palimpsest.utils.sentence_splitter as splitter_module
+    from palimpsest import AnalysisCache
+
+    analyzed = []
+    recognizer = PrefetchRecognizer()
+
+    class FakeAnalyzer:
+        registry = SimpleNamespace(recognizers=[recognizer])
+
+        def analyze(self, text, entities, language, return_decision_process):
+            analyzed.append(text)
+            return [result(0, 5)] if text.startswith("Alice") else []
+
+    monkeypatch.setattr(splitter_module, "split_text", lambda text, **kwargs: text.split("|"))
+    runtime = palimpsest_module._PalimpsestRuntime.__new__(
+        palimpsest_module._PalimpsestRuntime
+    )
+    runtime._analyzer = FakeAnalyzer()
+    runtime._analyzer_entities = ["PERSON"]
+    runtime._calc_len = len
+    runtime._batch_size = 8
+    runtime._batch_recognizers = palimpsest_module._batch_recognizers(runtime._analyzer)
+    runtime._analysis_cache = AnalysisCache()
+    runtime._model_id = "gliner:test"
+
+    first = runtime.analyze("Disclaimer|Alice wrote")
+    second = runtime.analyze_many(["Disclaimer|Alice again", "Disclaimer"])
+
+    assert analyzed == ["Disclaimer", "Alice wrote", "Alice again"]
+    assert recognizer.prefetched == [["Disclaimer", "Alice wrote"]]
+    assert [(r.start, r.end) for r in first[1]] == [(11, 16)]
+    assert second[0][0] == "Disclaimer\nAlice again\n"
+    assert [(r.start, r.end) for r in second[0][1]] == [(11, 16)]
+    assert runtime._analysis_cache.stats()["hits"] == 1
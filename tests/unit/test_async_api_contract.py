@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.state]
+
+
+class GatedRuntime:
+    """Runtime whose anonymize() blocks its executor thread until `gate` is set."""
+
+    def __init__(self, *args, **kwargs):
+        self.gate = threading.Event()
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+        self.started = []
+        self.finished = []
+
+    def anonymize(self, ctx, text, **options):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.started.append(text)
+        self.gate.wait(5)
+        with self.lock:
+            self.running -= 1
+            self.finished.append(text)
+        return f"anon:{text}", [], text, []
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def gated(monkeypatch):
+    import palimpsest.palimpsest as palimpsest_module
+
+    runtimes = []
+
+    def factory(*args, **kwargs):
+        runtimes.append(GatedRuntime())
+        return runtimes[-1]
+
+    monkeypatch.setattr(palimpsest_module, "_runtime_factory", factory)
+    return runtimes
+
+
+async def until(condition):
+    for _ in range(500):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+def test_async_round_trip_requires_session(lightweight_palimpsest_factory):
+    from palimpsest import Palimpsest, SessionRequiredError
+
+    processor = Palimpsest()
+    session = processor.create_session()
+
+    async def main():
+        anonymized = await processor.aanonymize("secret", session=session)
+        return anonymized, await session.adeanonymize(anonymized)
+
+    assert asyncio.run(main()) == ("FAKE_VALUE_1", "secret")
+    with pytest.raises(SessionRequiredError):
+        asyncio.run(processor.aanonymize("secret"))
+    processor.close()
+
+
+def test_loop_stays_free_and_in_flight_calls_are_capped(gated):
+    from palimpsest import Palimpsest
+
+    processor = Palimpsest(max_in_flight=2)
+    runtime = gated[0]
+    sessions = [processor.create_session() for _ in range(3)]
+
+    async def main():
+        tasks = [asyncio.create_task(s.aanonymize(f"t{i}")) for i, s in enumerate(sessions)]
+        await until(lambda: len(runtime.started) == 2)
+        await asyncio.sleep(0.05)
+        waiting = len(runtime.started)
+        runtime.gate.set()
+        return waiting, await asyncio.gather(*tasks)
+
+    waiting, results = asyncio.run(main())
+
+    assert waiting == 2
+    assert runtime.peak == 2
+    assert results == ["anon:t0", "anon:t1", "anon:t2"]
+    processor.close()
+
+
+def test_calls_of_one_session_run_in_order(gated):
+    from palimpsest import Palimpsest
+
+    processor = Palimpsest(max_in_flight=4)
+    runtime = gated[0]
+    session = processor.create_session()
+
+    async def main():
+        tasks = [asyncio.create_task(session.aanonymize(text)) for text in ("a", "b", "c")]
+        await until(lambda: runtime.started)
+        await asyncio.sleep(0.05)
+        assert runtime.started == ["a"]
+        runtime.gate.set()
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(main()) == ["anon:a", "anon:b", "anon:c"]
+    assert runtime.peak == 1
+    assert session._anonimized_text == "anon:c"
+    processor.close()
+
+
+def test_processor_serves_successive_event_loops(gated):
+    from palimpsest import Palimpsest
+
+    processor = Palimpsest(max_in_flight=1)
+    runtime = gated[0]
+    session = processor.create_session()
+    other = processor.create_session()
+    runtime.gate.set()
+
+    async def main(tag):
+        # contend on both the session lock and the in-flight semaphore
+        texts = [(session, f"{tag}a"), (session, f"{tag}b"), (other, f"{tag}c")]
+        return await asyncio.gather(*(s.aanonymize(text) for s, text in texts))
+
+    assert asyncio.run(main("1")) == ["anon:1a", "anon:1b", "anon:1c"]
+    assert asyncio.run(main("2")) == ["anon:2a", "anon:2b", "anon:2c"]
+    assert runtime.peak == 1
+    processor.close()
+
+
+def test_cancellation_drops_queued_calls_and_waits_for_running_ones(gated):
+    from palimpsest import Palimpsest
+
+    processor = Palimpsest(max_in_flight=1)
+    runtime = gated[0]
+    session = processor.create_session()
+    other = processor.create_session()
+
+    async def main():
+        running = asyncio.create_task(session.aanonymize("running"))
+        queued = asyncio.create_task(other.aanonymize("queued"))
+        await until(lambda: runtime.started)
+        queued.cancel()
+        running.cancel()
+        await asyncio.sleep(0.05)
+        assert not running.done()
+        runtime.gate.set()
+        for task in (running, queued):
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        return await other.aanonymize("after")
+
+    assert asyncio.run(main()) == "anon:after"
+    assert runtime.started == ["running", "after"]
+    assert session._anonimized_text == "anon:running"
+    with pytest.raises(ValueError):
+        Palimpsest(max_in_flight=0)
+    processor.close()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from tests.conftest import CountingContext, PrefetchRecognizer, RegexAnalyzer, make_stub_runtime
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.state]
+
+
+@pytest.fixture
+def batch_processor(monkeypatch):
+    import palimpsest.palimpsest as palimpsest_module
+    from palimpsest import Palimpsest
+
+    recognizer = PrefetchRecognizer()
+    runtime = make_stub_runtime(RegexAnalyzer(r"Alice|Bob|Person\d+", [recognizer]), batch_size=8)
+    monkeypatch.setattr(palimpsest_module, "_runtime_factory", lambda *args, **kwargs: runtime)
+
+    def create_session(processor, session_id):
+        session = processor.create_session(session_id=session_id)
+        session._ctx = CountingContext()
+        return session
+
+    processor = Palimpsest()
+    return SimpleNamespace(processor=processor, prefetched=recognizer.prefetched, create_session=create_session)
+
+
+def test_anonymize_many_matches_sequential_single_calls(batch_processor):
+    processor = batch_processor.processor
+    one = batch_processor.create_session(processor, "one")
+    two = batch_processor.create_session(processor, "two")
+    single_one = batch_processor.create_session(processor, "single-one")
+    single_two = batch_processor.create_session(processor, "single-two")
+    texts = [(one, "Alice met Bob"), (two, "Bob called"), (one, "Bob and Alice again")]
+
+    batched = processor.anonymize_many(texts)
+    batch_prefetches = list(batch_processor.prefetched)
+    sequential = [
+        single_one.anonymize("Alice met Bob"),
+        single_two.anonymize("Bob called"),
+        single_one.anonymize("Bob and Alice again"),
+    ]
+
+    assert batched == sequential
+    assert batched == ["Person2 met Person1\n", "Person1 called\n", "Person1 and Person2 again\n"]
+    assert batch_prefetches == [["Alice met Bob", "Bob called", "Bob and Alice again"]]
+    assert one._ctx.true_to_fake == single_one._ctx.true_to_fake
+    assert {entry.text for entry in one._entries()} == {"Person1", "Person2"}
+
+
+def test_deanonymize_many_restores_each_session_with_its_own_mapping(batch_processor):
+    processor = batch_processor.processor
+    one = batch_processor.create_session(processor, "one")
+    two = batch_processor.create_session(processor, "two")
+
+    anon_one, anon_two = processor.anonymize_many([(one, "Alice"), (two, "Bob")])
+    restored = processor.deanonymize_many([(one, anon_one), (two, None), (two, anon_one)])
+
+    assert anon_one.strip() == anon_two.strip() == "Person1"
+    assert [text.strip() for text in restored] == ["Alice", "Bob", "Bob"]
+
+
+def test_batch_api_validates_every_session_before_analysis(batch_processor):
+    from palimpsest import Palimpsest, SessionStateError
+
+    processor = batch_processor.processor
+    own = batch_processor.create_session(processor, "own")
+    foreign = Palimpsest().create_session(session_id="foreign")
+    foreign._processor = object()
+
+    with pytest.raises(SessionStateError):
+        processor.anonymize_many([(own, "Alice"), (foreign, "Bob")])
+
+    assert batch_processor.prefetched == []
+    assert own._anonimized_text == ""
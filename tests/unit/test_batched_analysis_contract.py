@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.recognizer]
+
+
+class FakeGlinerModel:
+    def __init__(self):
+        self.inference_calls = []
+        self.single_calls = []
+
+    @staticmethod
+    def _spans(text):
+        return [{"label": "person", "start": 0, "end": len(text), "score": 0.9}]
+
+    def inference(self, texts, labels, flat_ner, threshold, multi_label, batch_size):
+        self.inference_calls.append((list(texts), batch_size))
+        return [self._spans(text) for text in texts]
+
+    def predict_entities(self, text, labels, flat_ner, threshold, multi_label):
+        self.single_calls.append(text)
+        return self._spans(text)
+
+
+def make_gliner_recognizer(batch_size=2):
+    import palimpsest.recognizers.gliner_recogniser as gliner_module
+
+    recognizer = gliner_module.GlinerRecognizer.__new__(gliner_module.GlinerRecognizer)
+    recognizer.label_map = {"person": "PERSON"}
+    recognizer.raw_labels = ["person"]
+    recognizer.supported_entities = ["PERSON"]
+    recognizer.batch_size = batch_size
+    recognizer.threshold = 0.35
+    recognizer._prefetched = threading.local()
+    recognizer._model = FakeGlinerModel()
+    return recognizer
+
+
+def test_gliner_batch_prediction_buckets_by_length_and_restores_order():
+    recognizer = make_gliner_recognizer(batch_size=2)
+    texts = ["bb", "a", "dddd", "ccc"]
+
+    results = recognizer.analyze_batch(texts, entities=["PERSON"])
+
+    assert recognizer._model.inference_calls == [(["dddd", "ccc", "bb", "a"], 2)]
+    assert [[(r.start, r.end) for r in chunk] for chunk in results] == [
+        [(0, 2)],
+        [(0, 1)],
+        [(0, 4)],
+        [(0, 3)],
+    ]
+
+
+def test_gliner_analyze_reuses_prefetched_predictions_only_inside_block():
+    recognizer = make_gliner_recognizer()
+
+    with recognizer.prefetch(["Alice", "Bob", "Alice"]):
+        inside = recognizer.analyze("Bob", entities=["PERSON"])
+    outside = recognizer.analyze("Bob", entities=["PERSON"])
+
+    assert recognizer._model.inference_calls == [(["Alice", "Bob"], 2)]
+    assert recognizer._model.single_calls == ["Bob"]
+    assert [(r.entity_type, r.start, r.end) for r in inside] == [("PERSON", 0, 3)]
+    assert [(r.entity_type, r.start, r.end) for r in outside] == [("PERSON", 0, 3)]
+
+
+def test_batch_recognizer_without_predict_batch_fails_when_built():
+    from presidio_analyzer import EntityRecognizer
+
+    from palimpsest.recognizers.batching import BatchPrefetchRecognizer
+
+    class Forgetful(BatchPrefetchRecognizer, EntityRecognizer):
+        def load(self):
+            pass
+
+        def analyze(self, text, entities, nlp_artifacts=None):
+            return []
+
+    with pytest.raises(TypeError, match="predict_batch"):
+        Forgetful(supported_entities=["PERSON"])
+
+
+def test_runtime_prefetches_all_chunks_and_keeps_chunk_offsets(monkeypatch):
+    from presidio_analyzer import RecognizerResult
+
+    import palimpsest.palimpsest as palimpsest_module
+    import palimpsest.utils.sentence_splitter as splitter_module
+
+    prefetched = []
+
+    class BatchRecognizer:
+        supported_entities = ["PERSON"]
+
+        def __init__(self):
+            self.cache = None
+
+        @contextmanager
+        def prefetch(self, texts, batch_size=None):
+            prefetched.append((list(texts), batch_size))
+            self.cache = {text: [RecognizerResult("PERSON", 0, len(text), 0.9)] for text in texts}
+            try:
+                yield self
+            finally:
+                self.cache = None
+
+    recognizer = BatchRecognizer()
+
+    class FakeAnalyzer:
+        registry = SimpleNamespace(recognizers=[recognizer])
+
+        def analyze(self, text, entities, language, return_decision_process):
+            assert recognizer.cache is not None
+            return recognizer.cache[text]
+
+    monkeypatch.setattr(
+        splitter_module,
+        "split_text",
+        lambda text, **kwargs: ["Alice", "Bob"],
+    )
+    runtime = palimpsest_module._PalimpsestRuntime.__new__(
+        palimpsest_module._PalimpsestRuntime
+    )
+    runtime._analyzer = FakeAnalyzer()
+    runtime._analyzer_entities = ["PERSON"]
+    runtime._calc_len = len
+    runtime._batch_size = 4
+    runtime._batch_recognizers = palimpsest_module._batch_recognizers(runtime._analyzer)
+
+    final_text, results = runtime.analyze("ignored")
+
+    assert prefetched == [(["Alice", "Bob"], 4)]
+    assert recognizer.cache is None
+    assert [final_text[r.start : r.end] for r in results] == ["Alice", "Bob"]
+
+
+def test_runtime_batch_size_one_keeps_per_chunk_inference():
+    import palimpsest.palimpsest as palimpsest_module
+
+    class NeverPrefetched:
+        supported_entities = ["PERSON"]
+
+        def prefetch(self, texts, batch_size=None):
+            raise AssertionError("prefetch must not run when batch_size=1")
+
+    runtime = palimpsest_module._PalimpsestRuntime.__new__(
+        palimpsest_module._PalimpsestRuntime
+    )
+    runtime._batch_size = 1
+    runtime._batch_recognizers = [NeverPrefetched()]
+
+    with runtime._prefetch(["Alice", "Bob"], ["PERSON"]):
+        pass
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import pytest
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.state]
+
+
+@pytest.fixture
+def light_backend(monkeypatch):
+    import palimpsest.fakers.faker_utils as utils
+
+    def no_pipeline():
+        raise AssertionError("the light backend must not load ru_core_news_sm")
+
+    monkeypatch.setattr(utils, "HASH_BACKEND", "light")
+    monkeypatch.setattr(utils, "get_nlp", no_pipeline)
+    utils.calc_hash.cache_clear()
+    yield utils
+    utils.calc_hash.cache_clear()
+
+
+def test_calc_hash_defaults_to_the_spacy_reference(monkeypatch):
+    import palimpsest.fakers.faker_utils as utils
+
+    class Token:
+        def __init__(self, lemma):
+            self.lemma_ = lemma
+
+    def nlp(text):
+        return [Token(word.lower()) for word in text.split()]
+
+    nlp.pipe = lambda texts: map(nlp, texts)
+    monkeypatch.setattr(utils, "get_nlp", lambda: nlp)
+    utils.calc_hash.cache_clear()
+    try:
+        assert utils.HASH_BACKEND == "spacy"
+        assert utils.calc_hash("Иван Иванов") == "иваниванов"
+        assert utils.calc_hashes(["Иван Иванов", "Газпром"]) == ["иваниванов", "газпром"]
+    finally:
+        utils.calc_hash.cache_clear()
+
+
+def test_calc_hash_collapses_case_forms_without_the_spacy_pipeline(light_backend):
+    utils = light_backend
+
+    assert utils.calc_hash("Ивана Иванова") == utils.calc_hash("Иван Иванов") == utils.calc_hash("Ивану Иванову")
+    # pymorphy3 ranks the indeclinable name "Анне" first; the declinable reading wins
+    assert utils.calc_hash("Анне Петровой") == utils.calc_hash("Анна Петрова") == utils.calc_hash("Анной Петровой")
+    assert utils.light_lemma("мира") == "мир"
+    assert utils.calc_hash("ПАО «Газпромом»") == utils.calc_hash("ПАО «Газпром»") == "пао газпром"
+    assert utils.calc_hash("ООО \"Ромашки\"") == "ооо ромашка"
+    assert utils.light_lemma("в") == "в"
+    assert utils.light_lemma("12") == "12"
+
+
+def test_calc_hash_is_memoized_in_one_bounded_process_wide_cache(light_backend):
+    from palimpsest.fakers import faker_utils
+    from palimpsest.fakers.faker_context import calc_hash
+
+    assert calc_hash is faker_utils.calc_hash
+    first = calc_hash("Степан Степанов")
+    second = calc_hash("Степан Степанов")
+    info = calc_hash.cache_info()
+
+    assert first == second
+    assert (info.hits, info.misses) == (1, 1)
+    assert info.maxsize == faker_utils.HASH_CACHE_SIZE
+
+
+def test_calc_hashes_matches_calc_hash_for_every_value_in_order(light_backend):
+    from palimpsest.fakers.faker_utils import calc_hash, calc_hashes
+
+    values = ["Ивана Иванова", "ООО «Ромашка»", "Ивана Иванова", "", "ПАО Газпромом"]
+
+    assert calc_hashes(values) == [calc_hash(value) for value in values]
+    assert calc_hashes([]) == []
+
+
+def test_calc_hashes_pipes_only_values_missing_from_the_calc_hash_memo(light_backend, monkeypatch):
+    utils = light_backend
+    tokenizer = utils.get_tokenizer()
+    piped = []
+
+    class CountingTokenizer:
+        def __call__(self, text):
+            return tokenizer(text)
+
+        def pipe(self, texts):
+            texts = list(texts)
+            piped.append(texts)
+            return tokenizer.pipe(texts)
+
+    counting = CountingTokenizer()
+    monkeypatch.setattr(utils, "get_tokenizer", lambda: counting)
+    first = utils.calc_hashes(["Ивана Иванова", "ООО «Ромашка»"])
+    second = utils.calc_hashes(["ООО «Ромашка»", "Ивана Иванова"])
+    utils.calc_hash("Анне Петровой")
+    third = utils.calc_hashes(["Анне Петровой", "Ивана Иванова", "Газпром"])
+
+    assert piped == [["Ивана Иванова", "ООО «Ромашка»"], ["Газпром"]]
+    assert second == first[::-1]
+    assert third[:2] == [utils.calc_hash("Анне Петровой"), first[0]]
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import pytest
+
+from tests.conftest import RegexAnalyzer, make_stub_runtime
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.state]
+
+
+class NameModule:
+    generated = iter(["Иван Петров", "Анна Смирнова", "Олег Кузнецов"])
+
+    @staticmethod
+    def fake_name(value):
+        return next(NameModule.generated)
+
+
+@pytest.fixture
+def name_context(deterministic_faker_context):
+    from palimpsest.fakers.faker_context import FakerContext
+
+    NameModule.generated = iter(["Иван Петров", "Анна Смирнова", "Олег Кузнецов"])
+    ctx = FakerContext(module=NameModule)
+    assert ctx.fake_name("Степан Степанов") == "Иван Петров"
+    assert ctx.fake_name("Мария Иванова") == "Анна Смирнова"
+    return ctx
+
+
+def test_faker_context_indexes_generated_fakes_for_exact_scanning(name_context):
+    matches = name_context.find_fakes("Иван Петров и Анна Смирнова; Иван Петровский")
+
+    assert [(start, end, entry["true"]) for start, end, entry in matches] == [
+        (0, 11, "Степан Степанов"),
+        (14, 27, "Мария Иванова"),
+    ]
+    name_context.reset()
+    assert name_context.find_fakes("Иван Петров") == []
+
+
+def test_dictionary_mode_restores_known_fakes_without_analysis(name_context):
+    runtime = make_stub_runtime(RegexAnalyzer("Ивану Петрову"))
+    analyzed = runtime._analyzer.analyzed
+
+    text, items, analized_text, results = runtime.deanonymize_known(
+        name_context,
+        "Позвоните Иван Петров, копия Анна Смирнова.\nСпасибо",
+        entities=[],
+    )
+
+    assert text == "Позвоните Степан Степанов, копия Мария Иванова.\nСпасибо"
+    assert analyzed == []
+    assert analized_text == "Позвоните Иван Петров, копия Анна Смирнова.\nСпасибо"
+    assert [text[item.start : item.end] for item in items] == ["Степан Степанов", "Мария Иванова"]
+    assert [analized_text[r.start : r.end] for r in results] == ["Иван Петров", "Анна Смирнова"]
+
+
+def test_hybrid_mode_analyzes_only_residual_lines_with_fake_stems(name_context):
+    runtime = make_stub_runtime(RegexAnalyzer("Ивану Петрову"))
+    analyzed = runtime._analyzer.analyzed
+
+    text, _, _, _ = runtime.deanonymize_known(
+        name_context,
+        "Анна Смирнова согласна.\nПередайте Ивану Петрову документы.\nДо встречи.",
+        entities=[],
+        fallback=True,
+    )
+
+    assert analyzed == ["Передайте Ивану Петрову документы.\n"]
+    assert text == "Мария Иванова согласна.\nПередайте Степан Степанов документы.\nДо встречи."
+
+
+def test_processor_routes_deanonymize_mode_and_rejects_unknown_modes(
+    lightweight_palimpsest_factory,
+):
+    from palimpsest import Palimpsest
+
+    with pytest.raises(ValueError, match="Deanonymize mode 'bogus' not supported"):
+        Palimpsest(deanonymize_mode="bogus")
+
+    processor = Palimpsest()
+    session = processor.create_session(session_id="modes")
+    with pytest.raises(ValueError, match="not supported"):
+        session.deanonymize("text", mode="bogus")
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pytest
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.state]
+
+
+def entry(text, operator="encrypt"):
+    from presidio_anonymizer.entities import OperatorResult
+
+    return OperatorResult(0, len(text), "PERSON", text, operator)
+
+
+def test_aho_corasick_replace_prefers_longest_match_in_one_pass():
+    from palimpsest.utils.aho_corasick import AhoCorasick
+
+    automaton = AhoCorasick(word_boundaries=False)
+    automaton.add("Ann", "Mary")
+    automaton.add("Anna Lee", "Kate Moss")
+    automaton.add("Mary", "never rewritten twice")
+
+    assert automaton.replace("Anna Lee met Ann.") == "Kate Moss met Mary."
+    assert automaton.replace("nothing here") == "nothing here"
+
+
+def test_aho_corasick_finds_patterns_added_on_existing_states_after_a_scan():
+    from palimpsest.utils.aho_corasick import AhoCorasick
+
+    automaton = AhoCorasick(word_boundaries=False)
+    automaton.add("xabq", "long")
+    automaton.add("abc", "other")
+    assert automaton.find("xabz") == []
+
+    # "ab" ends on a state both patterns already created
+    automaton.add("ab", "short")
+    assert automaton.find("xabz") == [(1, 3, "short")]
+    assert automaton.find("x ab") == [(2, 4, "short")]
+
+
+def test_entry_table_compiles_new_entries_incrementally():
+    import palimpsest.palimpsest as palimpsest_module
+
+    restored = []
+
+    def restore(item):
+        restored.append(item.text)
+        return item.text.upper()
+
+    table = palimpsest_module._EntryTable([entry("ab")])
+    assert table.replace("ab abc", restore) == "AB ABc"
+
+    table.add(entry("abc"))
+    assert table.replace("ab abc", restore) == "AB ABC"
+    assert restored == ["ab", "abc"]
+    assert [item.text for item in table] == ["ab", "abc"]
+
+    table.clear()
+    assert len(table) == 0
+    assert table.replace("ab abc", restore) == "ab abc"
+
+
+def test_identity_entries_shield_longer_fakes_from_shorter_rewrites():
+    import palimpsest.palimpsest as palimpsest_module
+
+    table = palimpsest_module._EntryTable([entry("Ann", "encrypt"), entry("Anna Lee", "custom")])
+
+    def restore(item):
+        return "Mary" if item.operator == "encrypt" else item.text
+
+    assert table.replace("Anna Lee and Ann", restore) == "Anna Lee and Mary"
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import ipaddress
+import random
+import re
+
+import pytest
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.state]
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 100, 4097])
+def test_index_allocator_hands_out_every_index_once_then_raises(size):
+    from palimpsest.fakers.allocators import IndexAllocator
+
+    allocator = IndexAllocator(size, random.Random(size))
+    drawn = [allocator() for _ in range(size)]
+
+    assert sorted(drawn) == list(range(size))
+    assert len(allocator) == size
+    with pytest.raises(ValueError, match="exhausted"):
+        allocator()
+
+
+def test_index_allocator_is_reproducible_and_scrambled():
+    from palimpsest.fakers.allocators import IndexAllocator
+
+    first = IndexAllocator(10**14, random.Random(7))
+    second = IndexAllocator(10**14, random.Random(7))
+    drawn = [first() for _ in range(50)]
+
+    assert drawn == [second() for _ in range(50)]
+    steps = {b - a for a, b in zip(drawn, drawn[1:])}
+    assert len(steps) > 1
+    with pytest.raises(ValueError):
+        IndexAllocator(0)
+
+
+def test_structured_fakes_are_unique_valid_and_never_retried(monkeypatch):
+    import petrovna
+
+    import palimpsest.fakers.faker_context as context_module
+    from palimpsest.fakers.faker_context import FakerContext
+    from palimpsest.fakers.faker_utils import normalize_phone
+    from palimpsest.recognizers.regex_recognisers import validate_card, validate_inn
+
+    monkeypatch.setattr(context_module, "calc_hash", lambda value: f"h:{value}")
+    monkeypatch.setattr(context_module, "MAX_FAKE_GENERATION_ATTEMPTS", 1)
+    ctx = FakerContext()
+    count = 3000
+
+    phones = [ctx.fake_phone(f"+7 (900) {i:07d}") for i in range(count)]
+    cards = [ctx.fake_card(f"card-{i}") for i in range(count)]
+    inns = [ctx.fake_inn(f"inn-{i}") for i in range(count)]
+    snils = [ctx.fake_snils(f"snils-{i}") for i in range(count)]
+    passports = [ctx.fake_ru_passport(f"passport-{i}") for i in range(count)]
+    accounts = [ctx.fake_account(f"account-{i}") for i in range(count)]
+    accounts += [ctx.fake_ru_bank_account(f"ru-account-{i}") for i in range(count)]
+    ips = [ctx.fake_ip(f"ip-{i}") for i in range(count)]
+
+    assert len(set(map(normalize_phone, phones))) == count
+    assert all(re.fullmatch(r"(\+7|8)[\d ()-]{10,}", phone) for phone in phones)
+    for values in (cards, inns, snils, passports, accounts, ips):
+        assert len(set(values)) == len(values)
+    assert all(re.fullmatch(r"4\d{15}", card) and validate_card(card) for card in cards)
+    assert all(validate_inn(inn) for inn in inns)
+    assert all(petrovna.validate_snils(number) for number in snils)
+    assert all(re.fullmatch(r"(\d{4} \d{6})|(\d{2} \d{2} \d{6})", number) for number in passports)
+    assert all(re.fullmatch(r"\d{20}", account) for account in accounts)
+    assert all(ipaddress.IPv4Address(ip).is_global for ip in ips)
+    assert ctx.defake_phone(phones[42]) == "+7 (900) 0000042"
+    assert ctx.defake(inns[42]) == "inn-42"
+
+
+def test_allocated_fakers_bypass_the_reservoir_and_exhaust_loudly(monkeypatch):
+    import palimpsest.fakers.faker_context as context_module
+    from palimpsest.fakers import fakers_funcs
+    from palimpsest.fakers.fake_reservoir import FakeReservoir
+    from palimpsest.fakers.faker_context import FakerContext
+
+    monkeypatch.setitem(
+        fakers_funcs.ALLOCATED_FAKERS,
+        "fake_passport",
+        ("tiny", 2, fakers_funcs._allocated_passport),
+    )
+    monkeypatch.setattr(context_module, "calc_hash", lambda value: f"h:{value}")
+    reservoir = FakeReservoir()
+    ctx = FakerContext(reservoir=reservoir)
+    ctx.fake_passport("first")
+    ctx.fake_passport("second")
+    reservoir.close()
+
+    assert reservoir.stats()["pools"] == {}
+    with pytest.raises(ValueError, match="exhausted"):
+        ctx.fake_passport("third")
+
+
+def test_reset_starts_a_new_numbering_and_drops_cached_hashes(monkeypatch):
+    import palimpsest.fakers.faker_context as context_module
+    from palimpsest.fakers import fakers_funcs
+    from palimpsest.fakers.faker_context import FakerContext
+
+    monkeypatch.setitem(
+        fakers_funcs.ALLOCATED_FAKERS,
+        "fake_passport",
+        ("tiny", 2, fakers_funcs._allocated_passport),
+    )
+    monkeypatch.setattr(context_module, "calc_hash", lambda value: f"h:{value}")
+    ctx = FakerContext()
+    ctx.fake_passport("first")
+    ctx.fake_passport("second")
+    ctx._hashes["first"] = "stale"
+
+    ctx.reset()
+
+    assert ctx._hashes == {}
+    assert ctx.fake_passport("third")
+    assert ctx.fake_passport("fourth")
+    with pytest.raises(ValueError, match="exhausted"):
+        ctx.fake_passport("fifth")
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.state]
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "reservoir did not refill in time"
+        time.sleep(0.001)
+
+
+def test_pools_refill_between_watermarks_and_count_misses():
+    from palimpsest.fakers.fake_reservoir import FakeReservoir
+
+    counter = iter(range(1000))
+    reservoir = FakeReservoir(low_watermark=2, high_watermark=4)
+    assert reservoir.take("unknown") is None
+
+    reservoir.register("names", lambda: f"fake-{next(counter)}", str.upper)
+    wait_for(lambda: reservoir.stats()["pools"]["names"]["size"] == 4)
+    drawn = [reservoir.take("names") for _ in range(3)]
+    wait_for(lambda: reservoir.stats()["pools"]["names"]["size"] == 4)
+    reservoir.close()
+
+    assert drawn == [("fake-0", "FAKE-0"), ("fake-1", "FAKE-1"), ("fake-2", "FAKE-2")]
+    for _ in range(4):
+        assert reservoir.take("names") is not None
+    assert reservoir.take("names") is None
+    stats = reservoir.stats()
+    assert (stats["hits"], stats["misses"], stats["generated"]) == (7, 1, 7)
+    assert stats["pools"]["names"] == {"size": 0, "misses": 1}
+
+    with pytest.raises(ValueError):
+        FakeReservoir(low_watermark=4, high_watermark=4)
+    with pytest.raises(ValueError):
+        FakeReservoir(low_watermark=-1)
+
+
+def test_refill_errors_are_counted_and_left_to_the_inline_path():
+    from palimpsest.fakers.fake_reservoir import FakeReservoir
+
+    def fail():
+        raise RuntimeError("provider failed")
+
+    reservoir = FakeReservoir(low_watermark=1, high_watermark=2)
+    reservoir.register("broken", fail, str)
+    wait_for(lambda: reservoir.stats()["errors"] >= 1)
+    reservoir.close()
+
+    assert reservoir.take("broken") is None
+
+
+def test_faker_context_draws_pre_hashed_fakes_and_skips_collisions(deterministic_faker_context, monkeypatch):
+    from palimpsest.fakers.fake_reservoir import FakeReservoir
+    from palimpsest.fakers.faker_context import FakerContext
+
+    module = deterministic_faker_context.module
+    reservoir = FakeReservoir(low_watermark=1, high_watermark=3)
+    ctx = FakerContext(module=module, reservoir=reservoir)
+    key = (module.__name__, "ru_RU", "fake_account")
+    assert reservoir.stats()["pools"] == {}
+
+    # the first fake of an entity type registers its pool and is generated inline
+    assert ctx.fake_account("account-0") == "fake-account-1"
+    wait_for(lambda: reservoir.stats()["pools"].get(key, {}).get("size") == 3)
+    reservoir.close()
+    assert list(reservoir.stats()["pools"]) == [key]
+
+    hashed = []
+
+    def calc_hash(value):
+        hashed.append(value)
+        return f"h:{value}"
+
+    monkeypatch.setattr(deterministic_faker_context.context_module, "calc_hash", calc_hash)
+    ctx._faked["h:fake-account-2"] = {"true": "taken", "fake": "fake-account-2"}
+
+    assert ctx.fake_account("account-1") == "fake-account-3"
+    # only the true value is hashed on the request path
+    assert hashed == ["account-1"]
+    assert ctx.defake("fake-account-3") == "account-1"
+    stats = reservoir.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_processor_hands_its_reservoir_to_every_session(lightweight_palimpsest_factory, monkeypatch):
+    import palimpsest.palimpsest as palimpsest_module
+    from palimpsest import FakeReservoir, Palimpsest
+
+    contexts = []
+
+    def faker_context(**options):
+        contexts.append(options)
+        return object()
+
+    monkeypatch.setattr(palimpsest_module, "FakerContext", faker_context)
+    reservoir = FakeReservoir()
+    processor = Palimpsest(fake_reservoir=reservoir)
+    processor.create_session()
+    processor.create_session()
+
+    assert [options["reservoir"] for options in contexts] == [reservoir, reservoir]
+
+
+def test_pool_refills_use_their_own_faker_seeded_from_the_context(monkeypatch):
+    from faker import Faker
+
+    import palimpsest.fakers.faker_context as context_module
+    import palimpsest.fakers.fakers_funcs as fakers_funcs
+    from palimpsest.fakers.fake_reservoir import FakeReservoir
+    from palimpsest.fakers.faker_context import FakerContext
+
+    def seeded_factory(locale=None):
+        faker = Faker(locale=locale.replace("-", "_"))
+        faker.seed_instance(7)
+        return faker
+
+    monkeypatch.setattr(context_module, "fake_factory", seeded_factory)
+
+    def pooled_run():
+        reservoir = FakeReservoir(low_watermark=1, high_watermark=5)
+        ctx = FakerContext(module=fakers_funcs, reservoir=reservoir)
+        context_faker = ctx._faker_by_locale["default"]
+        key = ctx._reserve("fake_city", fakers_funcs.fake_city, str)
+        assert key in reservoir
+        state = context_faker.random.getstate()
+        wait_for(lambda: reservoir.stats()["pools"][key]["size"] == 5)
+        reservoir.close()
+        # refills draw from the pool Faker, never from the context one
+        assert context_faker.random.getstate() == state
+        source = reservoir._sources[key][0]
+        assert source._faker is not None and source._faker is not context_faker
+        return [reservoir.take(key) for _ in range(5)]
+
+    assert pooled_run() == pooled_run()
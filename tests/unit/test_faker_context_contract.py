@@ -299,3 +299,62 @@ def test_address_dependency_failure_rethrows_original_with_context_note(
         ctx.address_hash("Broken address")
 
     assert_note_contains(exc_info.value, "address", "libpostal", "Broken address")
+
+
+def test_precomputed_hashes_are_batched_once_per_document(deterministic_faker_context, monkeypatch):
+    from palimpsest.fakers.faker_context import FakerContext
+
+    context_module = deterministic_faker_context.context_module
+    batches = []
+
+    def calc_hashes(values):
+        batches.append(list(values))
+        return [f"h:{value}".lower() for value in values]
+
+    single = []
+
+    def calc_hash(value):
+        single.append(value)
+        return f"h:{value}".lower()
+
+    monkeypatch.setattr(context_module, "calc_hashes", calc_hashes)
+    monkeypatch.setattr(context_module, "calc_hash", calc_hash)
+    ctx = FakerContext(module=deterministic_faker_context.module)
+
+    with ctx.precomputed_hashes(["account-1", "account-2", "account-1", "PII"]):
+        first = ctx.fake_account("account-1")
+        again = ctx.fake_account("account-1")
+        ctx.fake_account("account-2")
+
+    assert batches == [["account-1", "account-2"]]
+    # only the generated fakes are hashed one by one
+    assert single == ["fake-account-1", "fake-account-2"]
+    assert first == again
+    assert ctx._hashes == {}
+    assert ctx.fake_account.hash_keyed
+    assert not getattr(ctx.fake_phone, "hash_keyed", False)
+
+
+def test_runtime_hashes_only_values_of_hash_keyed_operators():
+    from presidio_analyzer import RecognizerResult
+    from presidio_anonymizer.entities import OperatorConfig
+
+    from palimpsest.palimpsest import _hash_keyed_values
+
+    def keyed(value):
+        return value
+
+    keyed.hash_keyed = True
+    operators = {
+        "DEFAULT": OperatorConfig("keep"),
+        "PERSON": OperatorConfig("custom", {"lambda": keyed}),
+        "PHONE_NUMBER": OperatorConfig("custom", {"lambda": lambda value: value}),
+    }
+    text = "Ivan 555-1234 Moscow"
+    results = [
+        RecognizerResult("PERSON", 0, 4, 0.9),
+        RecognizerResult("PHONE_NUMBER", 5, 13, 0.9),
+        RecognizerResult("RU_CITY", 14, 20, 0.9),
+    ]
+
+    assert _hash_keyed_values(text, results, operators) == ["Ivan"]
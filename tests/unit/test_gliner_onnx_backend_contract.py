@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import pytest
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.recognizer]
+
+
+class FakeGliner:
+    exports = []
+    loads = []
+
+    @classmethod
+    def from_pretrained(cls, model_id, **kwargs):
+        cls.loads.append((model_id, kwargs))
+        return cls()
+
+    def export_to_onnx(self, save_dir, quantize=False):
+        self.exports.append(quantize)
+        (save_dir / "gliner_config.json").write_text("{}")
+        (save_dir / "model.onnx").write_text("fp32")
+        quantized = None
+        if quantize:
+            quantized = save_dir / "model_quantized.onnx"
+            quantized.write_text("int8")
+        return {"onnx_path": str(save_dir / "model.onnx"), "quantized_path": quantized and str(quantized)}
+
+    def to(self, device):
+        return self
+
+
+@pytest.fixture
+def onnx_gliner(monkeypatch, tmp_path):
+    import palimpsest.recognizers.gliner_recogniser as gliner_module
+
+    FakeGliner.exports, FakeGliner.loads = [], []
+    monkeypatch.setattr(gliner_module, "GLiNER", FakeGliner)
+    monkeypatch.setattr(gliner_module, "ONNX_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(gliner_module, "_onnxruntime_available", lambda: True)
+    return gliner_module
+
+
+def test_int8_export_is_made_once_and_loaded_with_onnx_runtime(onnx_gliner, tmp_path):
+    onnx_gliner._load_gliner("org/model", "onnx-int8")
+    onnx_gliner._load_gliner("org/model", "onnx-int8")
+
+    export_dir = tmp_path / "org--model"
+    assert FakeGliner.exports == [True]
+    assert sorted(f.name for f in tmp_path.iterdir()) == ["org--model"]
+    assert (export_dir / "model_quantized.onnx").read_text() == "int8"
+    model_id, kwargs = FakeGliner.loads[-1]
+    assert model_id == str(export_dir)
+    assert kwargs == {"runtime": "onnxruntime", "runtime_model_file": "model_quantized.onnx"}
+
+
+def test_missing_onnxruntime_fails_fast_with_context(onnx_gliner, monkeypatch, tmp_path):
+    monkeypatch.setattr(onnx_gliner, "_onnxruntime_available", lambda: False)
+
+    with pytest.raises(ImportError) as raised:
+        onnx_gliner._load_gliner("org/model", "onnx")
+
+    assert "operation=gliner_model_load" in raised.value.__notes__[0]
+    assert "backend='onnx'" in raised.value.__notes__[0]
+    assert FakeGliner.exports == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_backends_get_their_own_shared_models(monkeypatch):
+    import palimpsest.recognizers.gliner_recogniser as gliner_module
+    from palimpsest import model_registry
+
+    monkeypatch.setattr(gliner_module, "_load_gliner", lambda path, backend="torch": object())
+
+    with model_registry.leases() as keys:
+        torch_model = gliner_module.GlinerRecognizer(model_path="backend-test")
+        int8_model = gliner_module.GlinerRecognizer(model_path="backend-test", backend="onnx-int8")
+    try:
+        assert torch_model._model is not int8_model._model
+        assert model_registry.registry.refcount(("gliner", "backend-test", "onnx-int8")) == 1
+    finally:
+        model_registry.registry.release_all(keys)
+    with pytest.raises(ValueError):
+        gliner_module.GlinerRecognizer(model_path="backend-test", backend="tensorrt")
+
+
+def test_unsupported_backends_are_rejected_before_loading():
+    import palimpsest.analyzer_engine_provider as provider_module
+    from palimpsest.process_pool import _PooledRuntime
+
+    with pytest.raises(ValueError, match="GLiNER backend"):
+        provider_module.nlp_engine_and_registry("gliner", "backend-test", gliner_backend="int4")
+    with pytest.raises(ValueError, match="torch GLiNER backend"):
+        _PooledRuntime(processes=2, gliner_backend="onnx")
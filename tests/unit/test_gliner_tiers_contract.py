@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import pytest
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.state]
+
+
+class TierRuntime:
+    def __init__(self, run_entities=None, gliner_model="large", **options):
+        if gliner_model == "broken":
+            raise OSError("checkpoint not found")
+        self.gliner_model = gliner_model
+        self.memos = []
+        self.closed = False
+
+    def anonymize(self, ctx, text, memo=None):
+        self.memos.append(dict(memo))
+        memo[text] = self.gliner_model
+        return f"{self.gliner_model}:{text}", [], text, []
+
+    def analyze_many(self, texts, **options):
+        return [(text, []) for text in texts]
+
+    def anonymize_analyzed(self, ctx, text, results):
+        return f"{self.gliner_model}:{text}", [], text, results
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def tier_runtimes(monkeypatch):
+    import palimpsest.palimpsest as palimpsest_module
+
+    runtimes = []
+
+    def factory(*args, **kwargs):
+        runtime = TierRuntime(*args, **kwargs)
+        runtimes.append(runtime)
+        return runtime
+
+    monkeypatch.setattr(palimpsest_module, "_runtime_factory", factory)
+    return runtimes
+
+
+def test_tier_names_resolve_and_other_models_pass_through():
+    from palimpsest.analyzer_engine_provider import GLINER_TIERS, resolve_gliner_model
+
+    assert resolve_gliner_model("large") == "gliner-community/gliner_large-v2.5"
+    assert resolve_gliner_model("small") == GLINER_TIERS["small"]
+    assert resolve_gliner_model("/models/gliner-ru") == "/models/gliner-ru"
+
+
+def test_each_call_picks_a_loaded_tier_and_the_first_is_the_default(tier_runtimes):
+    from palimpsest import Palimpsest
+
+    processor = Palimpsest(gliner_models=["small", "large", "small"])
+    session = processor.create_session()
+
+    assert [r.gliner_model for r in tier_runtimes] == ["small", "large"]
+    assert session.anonymize("a") == "small:a"
+    assert processor.anonymize("b", session=session, gliner_model="large") == "large:b"
+    assert processor.anonymize_many([(session, "c")], gliner_model="large") == ["large:c"]
+    with pytest.raises(ValueError, match="not loaded"):
+        session.anonymize("d", gliner_model="medium")
+
+    processor.close()
+    assert all(runtime.closed for runtime in tier_runtimes)
+
+
+def test_switching_tiers_never_reuses_the_other_tiers_memo(tier_runtimes):
+    from palimpsest import Palimpsest
+
+    processor = Palimpsest(gliner_models=("small", "large"))
+    small, large = tier_runtimes
+    session = processor.create_session()
+
+    session.anonymize("same")
+    session.anonymize("same", gliner_model="large")
+    session.anonymize("same", gliner_model="large")
+
+    assert small.memos == [{}]
+    assert large.memos == [{}, {"same": "large"}]
+    processor.close()
+
+
+def test_failed_tier_releases_the_tiers_already_loaded(tier_runtimes):
+    from palimpsest import Palimpsest
+
+    with pytest.raises(OSError):
+        Palimpsest(gliner_models=("small", "broken"))
+    assert [r.closed for r in tier_runtimes] == [True]
+    with pytest.raises(ValueError):
+        Palimpsest(gliner_models=())
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import pytest
+
+from tests.conftest import CountingContext, RegexAnalyzer, make_stub_runtime
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.state]
+
+
+@pytest.fixture
+def conversation(monkeypatch):
+    import palimpsest.palimpsest as palimpsest_module
+    import palimpsest.utils.sentence_splitter as splitter_module
+    from palimpsest import Palimpsest
+
+    analyzer = RegexAnalyzer(r"[A-Z][a-z]+")
+    runtime = make_stub_runtime(analyzer)
+    monkeypatch.setattr(palimpsest_module, "_runtime_factory", lambda *args, **kwargs: runtime)
+    monkeypatch.setattr(splitter_module, "split_text", lambda text, **kwargs: text.split("|"))
+
+    session = Palimpsest().create_session(session_id="chat")
+    session._ctx = CountingContext()
+    session.analyzed = analyzer.analyzed
+    return session
+
+
+def test_each_turn_analyzes_only_new_or_edited_chunks(conversation):
+    first = conversation.anonymize("hi Alice|from Bob")
+    second = conversation.anonymize("hi Alice|from Bob|cc Carol")
+    edited = conversation.anonymize("hi Alice|from Dave|cc Carol")
+
+    assert conversation.analyzed == ["hi Alice", "from Bob", "cc Carol", "from Dave"]
+    assert first == "hi Person2\nfrom Person1\n"
+    assert second == "hi Person2\nfrom Person1\ncc Person3\n"
+    assert edited == "hi Person2\nfrom Person4\ncc Person3\n"
+    assert set(conversation._analysis_memo) == {"hi Alice", "from Dave", "cc Carol"}
+
+
+def test_reset_forgets_remembered_analysis(conversation):
+    conversation.anonymize("hi Alice")
+    conversation.reset()
+    conversation.anonymize("hi Alice")
+
+    assert conversation.analyzed == ["hi Alice", "hi Alice"]
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import pytest
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.recognizer]
+
+
+def test_default_profile_leaves_the_model_alone_and_predicts_in_inference_mode():
+    import torch
+
+    from palimpsest.utils.inference_profile import DEFAULT_INFERENCE_PROFILE, InferenceProfile
+
+    model = torch.nn.Linear(2, 2)
+    assert DEFAULT_INFERENCE_PROFILE.prepare(model) is model
+    assert DEFAULT_INFERENCE_PROFILE.weights_key == ()
+    with DEFAULT_INFERENCE_PROFILE.context():
+        assert torch.is_inference_mode_enabled()
+    with InferenceProfile(inference_mode=False).context():
+        assert not torch.is_inference_mode_enabled()
+    with pytest.raises(ValueError):
+        InferenceProfile(threads=0)
+
+
+def test_bf16_and_compile_are_applied_to_the_core_module(monkeypatch):
+    import torch
+
+    import palimpsest.utils.inference_profile as profile_module
+
+    compiled = []
+    monkeypatch.setattr(torch, "compile", lambda fn, dynamic=None: compiled.append(fn) or fn)
+    monkeypatch.setattr(profile_module, "_bf16_supported", lambda: True)
+
+    outer = torch.nn.Sequential(torch.nn.Linear(2, 2))
+    profile = profile_module.InferenceProfile(bf16=True, compile=True)
+    assert profile.prepare(outer, core=outer[0]) is outer
+
+    assert profile.weights_key == ("bf16", "compile")
+    assert outer[0].weight.dtype == torch.bfloat16
+    assert len(compiled) == 1 and "forward" in vars(outer[0])
+
+    monkeypatch.setattr(profile_module, "_bf16_supported", lambda: False)
+    plain = torch.nn.Linear(2, 2)
+    fallback = profile_module.InferenceProfile(bf16=True, compile=True)
+    fallback.prepare(plain)
+    assert plain.weight.dtype == torch.float32
+    # the key names what prepare applied, so fp32 models share with fp32 ones
+    assert fallback.weights_key == ("compile",)
+    assert profile_module.InferenceProfile(bf16=True).weights_key == ()
+
+
+def test_runtime_model_id_says_bf16_only_for_bf16_weights(monkeypatch):
+    import palimpsest.analyzer_engine_provider as provider_module
+    import palimpsest.palimpsest as palimpsest_module
+    import palimpsest.utils.inference_profile as profile_module
+
+    class Stop(Exception):
+        pass
+
+    def stop(*args, **kwargs):
+        raise Stop
+
+    def model_id(profile):
+        # the id is set before any model is loaded; stop right there
+        runtime = palimpsest_module._PalimpsestRuntime.__new__(palimpsest_module._PalimpsestRuntime)
+        with pytest.raises(Stop):
+            runtime.__init__(inference_profile=profile)
+        return runtime._model_id
+
+    monkeypatch.setattr(provider_module, "analyzer_engine", stop)
+    profile = profile_module.InferenceProfile(bf16=True)
+    monkeypatch.setattr(profile_module, "_bf16_supported", lambda: False)
+    fp32 = model_id(profile)
+    monkeypatch.setattr(profile_module, "_bf16_supported", lambda: True)
+
+    assert "@bf16" not in fp32
+    assert model_id(profile) == fp32.replace(":full", "@bf16:full")
+
+
+def test_thread_counts_are_applied_once(monkeypatch):
+    import torch
+
+    from palimpsest.utils.inference_profile import InferenceProfile
+
+    calls = []
+    monkeypatch.setattr(torch, "get_num_threads", lambda: 8)
+    monkeypatch.setattr(torch, "set_num_threads", calls.append)
+
+    InferenceProfile(threads=8).apply_threads()
+    InferenceProfile(threads=3).apply_threads()
+    InferenceProfile().apply_threads()
+
+    assert calls == [3]
+
+
+def test_gliner_shares_models_per_profile_and_predicts_under_it(monkeypatch):
+    import torch
+
+    import palimpsest.recognizers.gliner_recogniser as gliner_module
+    import palimpsest.utils.inference_profile as profile_module
+    from palimpsest import model_registry
+    from palimpsest.utils.inference_profile import InferenceProfile
+
+    modes = []
+
+    class FakeGlinerModel:
+        def predict_entities(self, text, labels, flat_ner, threshold, multi_label):
+            modes.append(torch.is_inference_mode_enabled())
+            return []
+
+    monkeypatch.setattr(gliner_module, "_load_gliner", lambda path, backend="torch": FakeGlinerModel())
+    monkeypatch.setattr(profile_module, "_bf16_supported", lambda: True)
+    monkeypatch.setattr(InferenceProfile, "prepare", lambda self, model, core=None: model)
+
+    with model_registry.leases() as keys:
+        default = gliner_module.GlinerRecognizer(model_path="profile-test")
+        bf16 = gliner_module.GlinerRecognizer(model_path="profile-test", profile=InferenceProfile(bf16=True))
+    try:
+        assert default._model is not bf16._model
+        assert model_registry.registry.refcount(("gliner", "profile-test", "bf16")) == 1
+        default.analyze("Bob")
+        bf16.analyze("Bob")
+    finally:
+        model_registry.registry.release_all(keys)
+
+    assert modes == [True, True]
+    with pytest.raises(ValueError):
+        gliner_module.GlinerRecognizer(
+            model_path="profile-test", backend="onnx", profile=InferenceProfile(compile=True)
+        )
+
+
+@pytest.fixture
+def tiny_gliner(tmp_path):
+    """A randomly initialised one-layer GLiNER over a hand-written vocabulary; nothing is downloaded."""
+    import torch
+    from gliner import GLiNER, GLiNERConfig
+    from transformers import BertConfig, BertModel, BertTokenizer
+
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "alice", "met", "bob", "in", "paris", "person", "city"]
+    (tmp_path / "vocab.txt").write_text("\n".join(vocab))
+    BertTokenizer(str(tmp_path / "vocab.txt")).save_pretrained(tmp_path)
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(vocab), hidden_size=32, num_hidden_layers=1, num_attention_heads=2, intermediate_size=64
+    )
+    BertModel(config).save_pretrained(tmp_path)
+    return GLiNER.from_config(GLiNERConfig(model_name=str(tmp_path), hidden_size=32, max_width=4))
+
+
+def test_gliner_predict_batch_runs_on_bf16_weights(tiny_gliner, monkeypatch):
+    import torch
+
+    import palimpsest.recognizers.gliner_recogniser as gliner_module
+    import palimpsest.utils.inference_profile as profile_module
+    from palimpsest import model_registry
+    from palimpsest.utils.inference_profile import InferenceProfile
+
+    # the tokenizers' thread pool would outlive the test and make later fork() tests unsafe
+    monkeypatch.setenv("TOKENIZERS_PARALLELISM", "false")
+    monkeypatch.setattr(profile_module, "_bf16_supported", lambda: True)
+    monkeypatch.setattr(gliner_module, "_load_gliner", lambda path, backend="torch": tiny_gliner)
+    texts = ["alice met bob in paris", "bob", "alice"]
+
+    with model_registry.leases() as keys:
+        recognizer = gliner_module.GlinerRecognizer(
+            model_path="tiny-bf16", run_entities=["PERSON", "RU_CITY"], profile=InferenceProfile(bf16=True)
+        )
+    try:
+        recognizer.threshold = 0.0
+        spans = recognizer.predict_batch(texts, batch_size=2)
+        results = recognizer.analyze_batch(texts, entities=["PERSON", "RU_CITY"])
+    finally:
+        model_registry.registry.release_all(keys)
+
+    assert {p.dtype for p in recognizer._model.parameters()} == {torch.bfloat16}
+    assert len(spans) == len(texts) and all(spans)
+    for text, text_spans in zip(texts, spans):
+        assert all(0 <= span["start"] < span["end"] <= len(text) for span in text_spans)
+        assert all(isinstance(span["score"], float) and 0.0 <= span["score"] <= 1.0 for span in text_spans)
+    assert [len(chunk) for chunk in results] == [len(chunk) for chunk in spans]
+    assert {r.entity_type for chunk in results for r in chunk} <= {"PERSON", "RU_CITY"}
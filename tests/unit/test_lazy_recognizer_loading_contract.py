@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import pytest
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.recognizer]
+
+
+@pytest.fixture
+def forbid_models(monkeypatch):
+    import palimpsest.analyzer_engine_provider as provider_module
+    import palimpsest.palimpsest as palimpsest_module
+    import palimpsest.recognizers.gliner_recogniser as gliner_module
+
+    def forbidden(name):
+        def load(*args, **kwargs):
+            raise AssertionError(f"{name} must not load for regex-only entities")
+
+        return load
+
+    monkeypatch.setattr(gliner_module, "_load_gliner", forbidden("GLiNER"))
+    monkeypatch.setattr(provider_module, "_shared_spacy_engine", forbidden("ru_core_news_lg"))
+    monkeypatch.setattr(provider_module, "NatashaSlovnetRecognizer", forbidden("Natasha"))
+    monkeypatch.setattr(palimpsest_module, "_load_tokenizer", forbidden("tokenizer"))
+
+
+def test_requested_model_families_follow_run_entities():
+    from palimpsest.analyzer_engine_provider import (
+        GLINER_ENTITIES,
+        NATASHA_ENTITIES,
+        _requested,
+    )
+
+    assert _requested(GLINER_ENTITIES, None)
+    assert _requested(GLINER_ENTITIES, ["PERSON", "INN"])
+    assert not _requested(GLINER_ENTITIES, ["RU_PERSON", "INN"])
+    assert _requested(NATASHA_ENTITIES, ["RU_PERSON"])
+    assert not _requested(GLINER_ENTITIES | NATASHA_ENTITIES, ["CREDIT_CARD", "SNILS"])
+
+
+def test_regex_only_runtime_loads_no_models_and_still_detects(forbid_models):
+    import palimpsest.palimpsest as palimpsest_module
+    from palimpsest import model_registry
+
+    runtime = palimpsest_module._PalimpsestRuntime(run_entities=["CREDIT_CARD", "SNILS"])
+    try:
+        names = {recognizer.name for recognizer in runtime._analyzer.registry.recognizers}
+        final_text, results = runtime.analyze("Карта 4111 1111 1111 1111")
+
+        assert "GlinerRecognizer" not in names
+        assert "NatashaSlovnetRecognizer" not in names
+        assert runtime._tokenizer is None
+        assert runtime._leases == [("spacy", "blank:ru")]
+        assert [final_text[r.start : r.end] for r in results] == ["4111 1111 1111 1111"]
+    finally:
+        runtime.close()
+    assert model_registry.registry.refcount(("spacy", "blank:ru")) == 0
+
+
+def test_light_nlp_mode_keeps_gliner_but_skips_the_spacy_parse(monkeypatch):
+    import palimpsest.analyzer_engine_provider as provider_module
+    import palimpsest.recognizers.gliner_recogniser as gliner_module
+    from palimpsest import model_registry
+
+    def forbidden(*args, **kwargs):
+        raise AssertionError("ru_core_news_lg must not load in light mode")
+
+    monkeypatch.setattr(gliner_module, "_load_gliner", lambda path, backend="torch": object())
+    monkeypatch.setattr(provider_module, "_shared_spacy_engine", forbidden)
+
+    with model_registry.leases() as keys:
+        nlp_engine, registry = provider_module.create_nlp_engine_with_gliner(
+            "light-test", run_entities=["PERSON"], nlp_mode="light"
+        )
+    try:
+        assert isinstance(nlp_engine, provider_module._BlankSpacyNlpEngine)
+        assert "GlinerRecognizer" in {recognizer.name for recognizer in registry.recognizers}
+    finally:
+        model_registry.registry.release_all(keys)
+
+    with pytest.raises(ValueError, match="NLP mode fast not supported"):
+        provider_module.nlp_engine_and_registry("gliner", "light-test", nlp_mode="fast")
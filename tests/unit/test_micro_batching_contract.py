@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.recognizer]
+
+
+def test_concurrent_callers_share_bounded_batches_and_get_their_own_results():
+    from palimpsest.utils.micro_batcher import MicroBatcher
+
+    batches = []
+    barrier = threading.Barrier(4)
+
+    def upper(items):
+        batches.append(list(items))
+        return [item.upper() for item in items]
+
+    # five queued items fit one batch, so the duplicate "a" is always deduped
+    batcher = MicroBatcher(upper, max_batch_size=5, max_wait=0.5)
+
+    def call(words):
+        barrier.wait()
+        return batcher.submit(words)
+
+    requests = [["a"], ["b", "c"], ["d"], ["a"]]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(call, requests))
+    batcher.close()
+
+    assert results == [["A"], ["B", "C"], ["D"], ["A"]]
+    assert all(len(batch) <= 5 for batch in batches)
+    assert sum(map(len, batches)) == 4  # "a" is computed once
+    assert len(batches) < len(requests)
+
+
+def test_deadline_closes_a_partial_batch_and_errors_reach_every_caller():
+    from palimpsest.utils.micro_batcher import MicroBatcher
+
+    def fail(items):
+        raise RuntimeError("model failed")
+
+    batcher = MicroBatcher(lambda items: [len(item) for item in items], max_batch_size=64, max_wait=0.001)
+    assert batcher.submit(["abc"]) == [3]
+    assert batcher.submit([]) == []
+    batcher.close()
+
+    failing = MicroBatcher(fail, max_batch_size=2, max_wait=0.001)
+    with pytest.raises(RuntimeError, match="model failed"):
+        failing.submit(["a", "b", "c"])
+    failing.close()
+    with pytest.raises(ValueError):
+        MicroBatcher(fail, max_batch_size=0)
+
+
+def test_runtime_prefetches_single_chunks_through_a_micro_batching_recognizer(monkeypatch):
+    from contextlib import contextmanager
+
+    import palimpsest.palimpsest as palimpsest_module
+
+    prefetched = []
+
+    class MicroBatching:
+        supported_entities = ["PERSON"]
+        micro_batching = True
+
+        @contextmanager
+        def prefetch(self, texts, batch_size=None):
+            prefetched.append(list(texts))
+            yield self
+
+    runtime = palimpsest_module._PalimpsestRuntime.__new__(palimpsest_module._PalimpsestRuntime)
+    runtime._batch_size = 8
+    runtime._batch_recognizers = [MicroBatching()]
+
+    with runtime._prefetch(["Alice"], ["PERSON"]):
+        pass
+    with runtime._prefetch([], ["PERSON"]):
+        pass
+
+    assert prefetched == [["Alice"]]
+
+
+def test_gliner_predictions_go_through_the_micro_batcher():
+    import palimpsest.recognizers.gliner_recogniser as gliner_module
+    from palimpsest.utils.micro_batcher import MicroBatcher
+
+    inference_calls = []
+
+    class FakeGlinerModel:
+        def inference(self, texts, labels, flat_ner, threshold, multi_label, batch_size):
+            inference_calls.append((list(texts), batch_size))
+            return [[{"label": "person", "start": 0, "end": len(text), "score": 0.9}] for text in texts]
+
+        def predict_entities(self, text, labels, flat_ner, threshold, multi_label):
+            raise AssertionError("micro-batched chunks must not be predicted one by one")
+
+    recognizer = gliner_module.GlinerRecognizer.__new__(gliner_module.GlinerRecognizer)
+    recognizer.label_map = {"person": "PERSON"}
+    recognizer.raw_labels = ["person"]
+    recognizer.supported_entities = ["PERSON"]
+    recognizer.batch_size = 4
+    recognizer.threshold = 0.35
+    recognizer._prefetched = threading.local()
+    recognizer._model = FakeGlinerModel()
+    recognizer._batcher = MicroBatcher(recognizer._predict_sorted, max_batch_size=4, max_wait=0.001)
+
+    with recognizer.prefetch(["Bob"]):
+        results = recognizer.analyze("Bob", entities=["PERSON"])
+    recognizer.close()
+
+    assert recognizer.micro_batching
+    assert inference_calls == [(["Bob"], 4)]
+    assert [(r.start, r.end) for r in results] == [(0, 3)]
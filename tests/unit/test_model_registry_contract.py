@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import pytest
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.recognizer]
+
+
+def test_registry_loads_once_and_unloads_on_last_release():
+    from palimpsest.model_registry import ModelRegistry
+
+    registry = ModelRegistry()
+    loads = []
+
+    def factory():
+        loads.append(1)
+        return object()
+
+    first = registry.acquire("model", factory)
+    second = registry.acquire("model", factory)
+
+    assert first is second
+    assert loads == [1]
+    assert registry.refcount("model") == 2
+    registry.release("model")
+    assert registry.loaded() == {"model": 1}
+    registry.release("model")
+    assert registry.loaded() == {}
+    assert registry.acquire("model", factory) is not first
+    assert loads == [1, 1]
+
+
+def test_leases_record_acquisitions_and_release_them_on_failure():
+    from palimpsest.model_registry import ModelRegistry
+
+    registry = ModelRegistry()
+    with registry.leases() as keys:
+        registry.acquire("a", object)
+        registry.acquire("b", object)
+    assert keys == ["a", "b"]
+    registry.release_all(keys)
+    assert registry.loaded() == {}
+
+    with pytest.raises(RuntimeError):
+        with registry.leases():
+            registry.acquire("a", object)
+            raise RuntimeError("model load failed")
+    assert registry.loaded() == {}
+
+
+def test_gliner_recognizers_with_different_entities_share_weights(monkeypatch):
+    import palimpsest.recognizers.gliner_recogniser as gliner_module
+    from palimpsest import model_registry
+
+    loads = []
+    monkeypatch.setattr(gliner_module, "_load_gliner", lambda path, backend="torch": loads.append(path) or object())
+
+    with model_registry.leases() as keys:
+        persons = gliner_module.GlinerRecognizer(run_entities=["PERSON"], model_path="shared-test")
+        addresses = gliner_module.GlinerRecognizer(run_entities=["RU_ADDRESS"], model_path="shared-test")
+    try:
+        assert loads == ["shared-test"]
+        assert persons._model is addresses._model
+        assert persons.supported_entities == ["PERSON"]
+        assert addresses.supported_entities == ["RU_ADDRESS"]
+        assert model_registry.registry.refcount(("gliner", "shared-test")) == 2
+    finally:
+        model_registry.registry.release_all(keys)
+    assert model_registry.registry.refcount(("gliner", "shared-test")) == 0
+
+
+def test_runtime_releases_its_leases_when_init_fails_after_loading(monkeypatch):
+    import palimpsest.analyzer_engine_provider as provider_module
+    import palimpsest.palimpsest as palimpsest_module
+    from palimpsest import model_registry
+
+    closed = []
+
+    class BrokenAnalyzer:
+        def get_supported_entities(self):
+            raise RuntimeError("analyzer setup failed")
+
+        def close(self):
+            closed.append(self)
+
+    def analyzer_engine(*args, **kwargs):
+        model_registry.acquire(("test-model", "runtime-init"), object)
+        return BrokenAnalyzer()
+
+    def load_tokenizer(path):
+        raise OSError("tokenizer missing")
+
+    monkeypatch.setattr(provider_module, "analyzer_engine", analyzer_engine)
+    monkeypatch.setattr(palimpsest_module, "_load_tokenizer", load_tokenizer)
+
+    with pytest.raises(RuntimeError, match="analyzer setup failed"):
+        palimpsest_module._PalimpsestRuntime(run_entities=["EMAIL_ADDRESS"])
+    assert model_registry.registry.refcount(("test-model", "runtime-init")) == 0
+
+    with pytest.raises(OSError, match="tokenizer missing"):
+        palimpsest_module._PalimpsestRuntime(run_entities=["PERSON"])
+    assert model_registry.registry.refcount(("test-model", "runtime-init")) == 0
+    # the recognizer threads of the analyzer are stopped in both cases
+    assert len(closed) == 2
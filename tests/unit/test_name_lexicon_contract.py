@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import pytest
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.state]
+
+LISTS = {
+    ("first", "male"): ("Степан", "Иван"),
+    ("first", "female"): ("Анна",),
+    ("last", "male"): ("Степанов",),
+    ("last", "female"): ("Степанова", "Петрова"),
+}
+
+
+@pytest.fixture
+def lexicon(tmp_path):
+    from palimpsest.fakers.name_lexicon import NameLexicon, build_lexicon
+
+    # hash = lowercased first three letters: declined forms of a name collide, except "Иван" below
+    def hash_fn(text):
+        return "ivan-" + text if text.lower().startswith("иван") else text.lower()[:3]
+
+    table = NameLexicon(build_lexicon(tmp_path / "names.lex", LISTS, hash_fn))
+    yield table
+    table.close()
+
+
+def test_table_keeps_declensions_hashes_and_validity_of_every_name(lexicon):
+    assert len(lexicon) == 6
+    [stepan] = lexicon.lookup("Степан", "first")
+    assert (stepan.gender, stepan.valid, stepan.hash) == ("male", True, "сте")
+    assert stepan.forms[:3] == ("Степан", "Степана", "Степану")
+    assert len(stepan.forms) == 12
+    assert not lexicon.lookup("Иван", "first")[0].valid
+    assert lexicon.lookup("Степан", "last") == []
+    assert lexicon.lookup("Нет", "first") == []
+
+
+def test_validity_and_generation_lists_come_from_the_table(lexicon):
+    assert lexicon.validity("Степан Степанов")
+    assert lexicon.validity("Анна Петрова")
+    assert lexicon.validity("Иван Степанов") is False
+    assert lexicon.validity("Степанова") is True
+    assert lexicon.validity("Ivan Smith") is None
+    assert lexicon.validity("Степан Иванович Степанов") is None
+    assert lexicon.names("first") == ("Анна", "Степан")
+    assert lexicon.names("last", "female") == ("Петрова", "Степанова")
+
+
+def test_name_fakers_draw_validated_gender_matched_names_from_the_lexicon(lexicon, monkeypatch):
+    from faker import Faker
+
+    import palimpsest.fakers.fakers_funcs as fakers_funcs
+    import palimpsest.fakers.faker_utils as faker_utils
+
+    def no_validation(name):
+        raise AssertionError("lexicon names are already validated")
+
+    monkeypatch.setattr(fakers_funcs, "get_lexicon", lambda: lexicon)
+    monkeypatch.setattr(fakers_funcs, "validate_name", no_validation)
+    token = fakers_funcs.bind_faker(Faker("ru_RU"))
+    try:
+        names = {fakers_funcs.fake_name("x") for _ in range(20)}
+        assert fakers_funcs.fake_first_name("x") in {"Анна", "Степан"}
+        assert fakers_funcs.fake_last_name("x") in {"Степанов", "Степанова", "Петрова"}
+    finally:
+        fakers_funcs.reset_faker(token)
+
+    assert names <= {"Степан Степанов", "Анна Петрова", "Анна Степанова"}
+    monkeypatch.setattr(faker_utils, "get_lexicon", lambda: lexicon)
+    assert faker_utils.validate_name("Иван Степанов") is False
+
+
+def test_foreign_file_is_rejected(tmp_path):
+    from palimpsest.fakers.name_lexicon import NameLexicon
+
+    path = tmp_path / "other.lex"
+    path.write_bytes(b"NOTALEX!" + bytes(8))
+    with pytest.raises(ValueError):
+        NameLexicon(path)
+
+
+def fresh_lexicon_state(name_lexicon, monkeypatch, tmp_path):
+    for name in ("_lexicon", "_lexicon_error", "_lexicon_path", "_builder"):
+        monkeypatch.setattr(name_lexicon, name, None)
+    monkeypatch.setattr(name_lexicon, "lexicon_path", lambda: tmp_path / "names.lex")
+
+
+def test_missing_table_is_built_in_the_background_not_by_the_caller(tmp_path, monkeypatch):
+    import threading
+
+    import palimpsest.fakers.name_lexicon as name_lexicon
+
+    build_lexicon = name_lexicon.build_lexicon
+    release = threading.Event()
+    builders = []
+
+    def slow_build(path):
+        builders.append(threading.current_thread())
+        release.wait(5)
+        return build_lexicon(path, LISTS, lambda text: text.lower()[:3])
+
+    fresh_lexicon_state(name_lexicon, monkeypatch, tmp_path)
+    monkeypatch.setattr(name_lexicon, "build_lexicon", slow_build)
+
+    assert name_lexicon.get_lexicon() is None
+    assert name_lexicon.get_lexicon() is None
+    release.set()
+    name_lexicon._builder.join(5)
+    table = name_lexicon.get_lexicon()
+
+    assert builders and builders[0] is not threading.current_thread()
+    assert len(builders) == 1
+    assert table.names("first", "female") == ("Анна",)
+    table.close()
+
+
+def test_autobuild_off_leaves_the_table_to_the_cli_step(tmp_path, monkeypatch):
+    import palimpsest.fakers.name_lexicon as name_lexicon
+
+    def no_build(path):
+        raise AssertionError("the table must only be built by the CLI step")
+
+    fresh_lexicon_state(name_lexicon, monkeypatch, tmp_path)
+    monkeypatch.setattr(name_lexicon, "NAME_LEXICON_AUTOBUILD", False)
+    monkeypatch.setattr(name_lexicon, "build_lexicon", no_build)
+
+    assert name_lexicon.get_lexicon() is None
+    assert name_lexicon._builder is None
+
+
+def test_unavailable_lexicon_is_logged_once_and_validation_falls_back(tmp_path, monkeypatch):
+    import palimpsest.fakers.faker_utils as faker_utils
+    import palimpsest.fakers.name_lexicon as name_lexicon
+
+    builds = []
+
+    def read_only_home(path):
+        builds.append(path)
+        raise PermissionError("read-only file system")
+
+    fresh_lexicon_state(name_lexicon, monkeypatch, tmp_path)
+    monkeypatch.setattr(name_lexicon, "build_lexicon", read_only_home)
+    monkeypatch.setattr(faker_utils, "get_lexicon", name_lexicon.get_lexicon)
+    monkeypatch.setattr(faker_utils, "get_morphs", lambda name: {"singular": {"gent": name + "а"}, "plural": {}})
+    monkeypatch.setattr(faker_utils, "calc_hash", lambda text: text[:5])
+
+    assert name_lexicon.get_lexicon() is None
+    name_lexicon._builder.join(5)
+    for _ in range(2):
+        with pytest.raises(PermissionError) as exc_info:
+            name_lexicon.get_lexicon()
+    assert "operation=name_lexicon_load" in "\n".join(exc_info.value.__notes__)
+    assert faker_utils.validate_name("Степан") is True
+    assert faker_utils.validate_name("Анна") is False
+    assert len(builds) == 1
+
+
+def test_non_cyrillic_names_never_touch_the_lexicon(monkeypatch):
+    import palimpsest.fakers.faker_utils as faker_utils
+
+    def no_lexicon():
+        raise AssertionError("the ru_RU table must not be built for other locales")
+
+    monkeypatch.setattr(faker_utils, "get_lexicon", no_lexicon)
+    monkeypatch.setattr(faker_utils, "get_morphs", lambda name: {"singular": {}, "plural": {}})
+    monkeypatch.setattr(faker_utils, "calc_hash", str.lower)
+
+    assert faker_utils.validate_name("John Smith") is True
+
+
+def test_table_file_name_follows_the_calc_hash_fingerprint(monkeypatch):
+    import palimpsest.fakers.faker_utils as faker_utils
+    from palimpsest.fakers.name_lexicon import lexicon_path
+
+    monkeypatch.setattr(faker_utils, "calc_hash_fingerprint", lambda: "calc_hash 2;light;pymorphy3 2.0")
+    before = lexicon_path(LISTS)
+    monkeypatch.setattr(faker_utils, "calc_hash_fingerprint", lambda: "calc_hash 2;light;pymorphy3 2.1")
+
+    assert lexicon_path(LISTS) != before
+    assert faker_utils.CALC_HASH_VERSION >= 2
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.recognizer]
+
+
+class FakeNerTagger:
+    def __init__(self):
+        self.calls = []
+
+    def map(self, texts):
+        self.calls.append(list(texts))
+        for text in texts:
+            yield SimpleNamespace(spans=[SimpleNamespace(start=0, stop=len(text), type="PER")])
+
+
+def make_natasha_recognizer():
+    import palimpsest.recognizers.natasha_recogniser as natasha_module
+
+    recognizer = natasha_module.NatashaSlovnetRecognizer.__new__(natasha_module.NatashaSlovnetRecognizer)
+    recognizer.supported_entities = ["RU_PERSON", "RU_ORGANIZATION"]
+    recognizer.ner_tagger = FakeNerTagger()
+    recognizer._prefetched = threading.local()
+    return recognizer
+
+
+def test_chunks_are_tagged_in_one_length_sorted_call_and_blank_ones_skipped():
+    recognizer = make_natasha_recognizer()
+
+    spans = recognizer.predict_batch(["Ян", "  ", "Анна Петрова"])
+
+    assert recognizer.ner_tagger.calls == [["Анна Петрова", "Ян"]]
+    assert [[(s.start, s.stop) for s in chunk] for chunk in spans] == [[(0, 2)], [], [(0, 12)]]
+
+
+def test_analyze_reuses_prefetched_spans_and_tags_others_ner_only():
+    recognizer = make_natasha_recognizer()
+
+    with recognizer.prefetch(["Ян", "Анна", "Ян"]):
+        assert not recognizer.runs_concurrently("Ян")
+        inside = recognizer.analyze("Ян", entities=["RU_PERSON"])
+        assert recognizer.analyze("Ян", entities=["RU_ORGANIZATION"]) == []
+    outside = recognizer.analyze("Олег")
+
+    assert recognizer.runs_concurrently("Ян")
+    assert recognizer.ner_tagger.calls == [["Анна", "Ян"], ["Олег"]]
+    assert [(r.entity_type, r.start, r.end) for r in inside] == [("RU_PERSON", 0, 2)]
+    assert [(r.entity_type, r.start, r.end) for r in outside] == [("RU_PERSON", 0, 4)]
+
+
+def test_natasha_is_a_batch_recognizer_of_the_runtime():
+    import palimpsest.palimpsest as palimpsest_module
+
+    recognizer = make_natasha_recognizer()
+    analyzer = SimpleNamespace(registry=SimpleNamespace(recognizers=[object(), recognizer]))
+
+    assert palimpsest_module._batch_recognizers(analyzer) == [recognizer]
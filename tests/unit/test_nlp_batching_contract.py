@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import pytest
+
+from tests.conftest import make_stub_runtime
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.recognizer]
+
+
+def make_runtime(monkeypatch, nlp_batch_size):
+    from presidio_analyzer import RecognizerResult
+
+    import palimpsest.utils.sentence_splitter as splitter_module
+    from palimpsest.analyzer_engine_provider import _BlankSpacyNlpEngine
+
+    class CountingEngine(_BlankSpacyNlpEngine):
+        batches = []
+
+        def process_batch(self, texts, language, batch_size=1, **kwargs):
+            texts = list(texts)
+            self.batches.append((texts, batch_size))
+            return super().process_batch(texts, language, batch_size=batch_size, **kwargs)
+
+    nlp_engine = CountingEngine(models=[{"lang_code": "en", "model_name": "ru"}])
+    nlp_engine.load()
+
+    class FakeAnalyzer:
+        def __init__(self):
+            self.nlp_engine = nlp_engine
+            self.received = {}
+
+        def analyze(self, text, entities, language, return_decision_process, nlp_artifacts=None):
+            self.received[text] = nlp_artifacts
+            if nlp_artifacts is None:
+                nlp_artifacts = nlp_engine.process_text(text, language)
+            return [
+                RecognizerResult("PERSON", token.idx, token.idx + len(token), 0.9)
+                for token in nlp_artifacts.tokens
+                if token.text.istitle()
+            ]
+
+    monkeypatch.setattr(splitter_module, "split_text", lambda text, **kwargs: text.split("|"))
+    runtime = make_stub_runtime(FakeAnalyzer())
+    runtime._nlp_batch_size = nlp_batch_size
+    return runtime
+
+
+def test_runtime_pipes_all_pending_chunks_once_and_keeps_results(monkeypatch):
+    batched = make_runtime(monkeypatch, nlp_batch_size=16)
+    legacy = make_runtime(monkeypatch, nlp_batch_size=1)
+    texts = ["hi Alice|from Bob", "from Bob|cc Carol"]
+
+    results = batched.analyze_many(texts)
+
+    assert batched._analyzer.nlp_engine.batches == [(["hi Alice", "from Bob", "cc Carol"], 16)]
+    assert all(artifacts is not None for artifacts in batched._analyzer.received.values())
+    assert [[(r.start, r.end) for r in rs] for _, rs in results] == [
+        [(r.start, r.end) for r in rs] for _, rs in legacy.analyze_many(texts)
+    ]
+
+
+def test_nlp_batch_size_one_keeps_per_chunk_processing(monkeypatch):
+    runtime = make_runtime(monkeypatch, nlp_batch_size=1)
+
+    runtime.analyze("hi Alice|from Bob")
+
+    assert runtime._analyzer.nlp_engine.batches == []
+    assert runtime._analyzer.received == {"hi Alice": None, "from Bob": None}
+
+
+def test_unused_spacy_components_are_disabled():
+    import spacy
+
+    from palimpsest.analyzer_engine_provider import _disable_unused_components
+
+    nlp = spacy.blank("ru")
+    nlp.add_pipe("parser")
+    nlp.add_pipe("ner")
+
+    _disable_unused_components(nlp)
+
+    assert nlp.pipe_names == ["ner"]
+    assert nlp.disabled == ["parser"]
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.recognizer]
+
+
+def make_engines(barrier=None):
+    from presidio_analyzer import (
+        AnalyzerEngine,
+        EntityRecognizer,
+        Pattern,
+        PatternRecognizer,
+        RecognizerRegistry,
+        RecognizerResult,
+    )
+
+    from palimpsest.analyzer_engine_provider import _BlankSpacyNlpEngine
+    from palimpsest.parallel_analyzer import ConcurrentRecognizer, ParallelAnalyzerEngine
+
+    threads = []
+
+    class ModelRecognizer(ConcurrentRecognizer, EntityRecognizer):
+        def __init__(self, entity, word):
+            self.word = word
+            super().__init__(supported_entities=[entity], name=f"{entity}Model")
+
+        def load(self):
+            pass
+
+        def analyze(self, text, entities=None, **kwargs):
+            submitted = self.submitted_results(text)
+            if submitted is not None:
+                return submitted
+            threads.append(threading.current_thread().name)
+            if barrier is not None:
+                barrier.wait()
+            start = text.find(self.word)
+            if start < 0:
+                return []
+            return [RecognizerResult(self.supported_entities[0], start, start + len(self.word), 0.8)]
+
+    nlp_engine = _BlankSpacyNlpEngine(models=[{"lang_code": "en", "model_name": "ru"}])
+    nlp_engine.load()
+
+    def registry():
+        registry = RecognizerRegistry()
+        registry.add_recognizer(ModelRecognizer("PERSON", "Alice"))
+        registry.add_recognizer(ModelRecognizer("RU_PERSON", "Alice"))
+        registry.add_recognizer(
+            PatternRecognizer("PHONE_NUMBER", patterns=[Pattern("phone", r"\d{10}", 0.7)])
+        )
+        return registry
+
+    sequential = AnalyzerEngine(nlp_engine=nlp_engine, registry=registry())
+    parallel = ParallelAnalyzerEngine(nlp_engine=nlp_engine, registry=registry(), max_workers=2)
+    return sequential, parallel, threads
+
+
+def spans(results):
+    return [(r.entity_type, r.start, r.end, r.score) for r in results]
+
+
+def test_model_recognizers_run_concurrently_and_merge_like_sequential_analysis():
+    barrier = threading.Barrier(2, timeout=5)
+    _, parallel, threads = make_engines(barrier)
+    text = "Alice 9867777777"
+
+    results = parallel.analyze(text=text, language="en")
+    parallel.close()
+
+    assert len(threads) == 2
+    assert all(name.startswith("palimpsest-recognizer") for name in threads)
+    assert spans(results) == spans(make_engines()[0].analyze(text=text, language="en"))
+    assert {r.entity_type for r in results} == {"PERSON", "RU_PERSON", "PHONE_NUMBER"}
+
+
+def test_known_results_run_inline_and_worker_count_is_validated():
+    from palimpsest.parallel_analyzer import ParallelAnalyzerEngine
+
+    _, parallel, threads = make_engines()
+    for recognizer in parallel.registry.recognizers:
+        recognizer.runs_concurrently = lambda text: False
+
+    parallel.analyze(text="Alice", language="en", entities=["PERSON"])
+
+    assert threads == [threading.current_thread().name]
+    with pytest.raises(ValueError):
+        ParallelAnalyzerEngine(max_workers=0)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import gc
+import os
+
+import pytest
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.state]
+
+
+@pytest.fixture
+def pooled(monkeypatch):
+    from presidio_analyzer import RecognizerResult
+
+    import palimpsest.palimpsest as palimpsest_module
+    import palimpsest.utils.sentence_splitter as splitter_module
+    from palimpsest.process_pool import _PooledRuntime
+
+    class FakeAnalyzer:
+        def analyze(self, text, entities, language, return_decision_process):
+            if text == "boom":
+                raise ValueError("analyzer failed")
+            metadata = {"recognizer_name": "test", "pid": os.getpid()}
+            return [RecognizerResult("PERSON", 0, len(text), 0.9, recognition_metadata=metadata)]
+
+    def init(self, run_entities=None, **options):
+        self._analyzer = FakeAnalyzer()
+        self._analyzer_entities = ["PERSON"]
+        self._calc_len = len
+        self._batch_size = 1
+        self._batch_recognizers = []
+
+    monkeypatch.setattr(palimpsest_module._PalimpsestRuntime, "__init__", init)
+    monkeypatch.setattr(splitter_module, "split_text", lambda text, **kwargs: text.split("|"))
+    runtime = _PooledRuntime(processes=2, torch_threads=1)
+    yield runtime
+    runtime.close()
+    gc.unfreeze()
+
+
+def pids(results):
+    return [r.recognition_metadata["pid"] for r in results]
+
+
+def parent_pid(pid):
+    with open(f"/proc/{pid}/stat") as stat:
+        return int(stat.read().rsplit(")", 1)[1].split()[1])
+
+
+def is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def test_batches_are_sharded_across_forked_workers(pooled):
+    final_text, results = pooled.analyze_many(["Alice|Bob|Carol|Dave"])[0]
+
+    assert final_text == "Alice\nBob\nCarol\nDave\n"
+    assert [final_text[r.start : r.end] for r in results] == ["Alice", "Bob", "Carol", "Dave"]
+    assert len(set(pids(results))) == 2
+    assert os.getpid() not in pids(results)
+
+
+def test_session_affinity_is_sticky(pooled):
+    ctx = object()
+
+    first = pooled.analyze("Alice|Bob", affinity=ctx)[1]
+    second = pooled.analyze("Carol|Dave", affinity=ctx)[1]
+
+    assert len(set(pids(first + second))) == 1
+
+
+def test_worker_errors_surface_and_the_pool_stays_usable(pooled):
+    with pytest.raises(RuntimeError, match="analyzer failed"):
+        pooled.analyze_many(["Alice|boom"])
+
+    assert [r.end for r in pooled.analyze("Carol")[1]] == [5]
+
+
+def test_closed_pool_stops_workers_and_analyzes_in_process(pooled):
+    worker_pids = [worker.pid for worker in pooled._workers]
+    zygote = pooled._zygote.process
+
+    pooled.close()
+
+    assert not zygote.is_alive()
+    assert not any(map(is_running, worker_pids))
+    assert pids(pooled.analyze("Alice")[1]) == [os.getpid()]
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/stat"), reason="reads parent pids from /proc")
+def test_workers_are_forked_by_the_zygote_not_by_the_threaded_parent(pooled):
+    import signal
+    import threading
+
+    zygote_pid = pooled._zygote.process.pid
+    # the parent now runs other threads; replacements must not be forked from it
+    stop = threading.Event()
+    busy = threading.Thread(target=stop.wait)
+    busy.start()
+    try:
+        worker = pooled._workers[0]
+        assert parent_pid(worker.pid) == zygote_pid
+        os.kill(worker.pid, signal.SIGKILL)
+        with pytest.raises(RuntimeError, match="worker process died"):
+            pooled.analyze_many(["Alice|Bob|Carol|Dave"])
+        results = pooled.analyze_many(["Alice|Bob|Carol|Dave"])[0][1]
+    finally:
+        stop.set()
+        busy.join()
+
+    assert parent_pid(worker.pid) == zygote_pid
+    assert worker.pid in pids(results)
+
+
+def test_dead_worker_fails_its_call_and_is_forked_again(pooled):
+    import signal
+
+    ctx = object()
+    worker = pooled._workers[hash(ctx) % len(pooled._workers)]
+    old_pid = pids(pooled.analyze("Alice", affinity=ctx)[1])[0]
+    os.kill(old_pid, signal.SIGKILL)
+
+    with pytest.raises(RuntimeError, match=r"exitcode=-9 error='worker process died"):
+        pooled.analyze("Bob", affinity=ctx)
+
+    new_pid = pids(pooled.analyze("Carol", affinity=ctx)[1])[0]
+    assert new_pid not in (old_pid, os.getpid())
+    assert worker.pid == new_pid
+
+    os.kill(new_pid, signal.SIGKILL)
+    with pytest.raises(RuntimeError, match="worker process died"):
+        pooled.analyze_many(["Alice|Bob|Carol|Dave"])
+    assert len(set(pids(pooled.analyze_many(["Alice|Bob|Carol|Dave"])[0][1]))) == 2
@@ -15,33 +15,21 @@ class FakeFakerContext:
         raise AttributeError(name)
 
 
-def test_natasha_org_maps_to_ru_organization(monkeypatch):
-    import palimpsest.recognizers.natasha_recogniser as natasha_module
-
-    class FakeDoc:
-        def __init__(self, text):
-            self.spans = [SimpleNamespace(type="ORG", start=0, stop=len(text))]
-
-        def segment(self, segmenter):
-            pass
+def test_natasha_org_maps_to_ru_organization():
+    import threading
 
-        def tag_morph(self, morph_tagger):
-            pass
-
-        def parse_syntax(self, syntax_parser):
-            pass
+    import palimpsest.recognizers.natasha_recogniser as natasha_module
 
-        def tag_ner(self, ner_tagger):
-            pass
+    class FakeNerTagger:
+        def map(self, texts):
+            for text in texts:
+                yield SimpleNamespace(spans=[SimpleNamespace(type="ORG", start=0, stop=len(text))])
 
     recognizer = natasha_module.NatashaSlovnetRecognizer.__new__(
         natasha_module.NatashaSlovnetRecognizer
     )
-    recognizer.segmenter = object()
-    recognizer.morph_tagger = object()
-    recognizer.syntax_parser = object()
-    recognizer.ner_tagger = object()
-    monkeypatch.setattr(natasha_module, "Doc", FakeDoc)
+    recognizer.ner_tagger = FakeNerTagger()
+    recognizer._prefetched = threading.local()
 
     results = recognizer.analyze("Acme", entities=["RU_ORGANIZATION"])
 
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import io
+import re
+
+import pytest
+
+from tests.conftest import CountingContext, RegexAnalyzer, make_stub_runtime
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.state]
+
+
+@pytest.fixture
+def stream_processor(monkeypatch):
+    import palimpsest.palimpsest as palimpsest_module
+    import palimpsest.utils.sentence_splitter as splitter_module
+    from palimpsest import Palimpsest
+
+    analyzer = RegexAnalyzer(r"Alice|Bob")
+    runtime = make_stub_runtime(analyzer)
+    monkeypatch.setattr(palimpsest_module, "_runtime_factory", lambda *args, **kwargs: runtime)
+    monkeypatch.setattr(
+        splitter_module,
+        "sent_tokenize",
+        lambda text, language=None: re.split(r"(?<=[.!?])\s+", text.strip()),
+    )
+
+    processor = Palimpsest()
+    processor.analyzed = analyzer.analyzed
+    return processor
+
+
+def test_window_iterator_is_sentence_aligned_and_lossless(stream_processor):
+    from palimpsest.utils.sentence_splitter import iter_windows
+
+    text = "Alice met Bob. Bob left! " * 20 + "\nline\n" * 10 + "x" * 150
+    for source in (text, io.StringIO(text), [text[i : i + 7] for i in range(0, len(text), 7)]):
+        windows = list(iter_windows(source, 64))
+        assert "".join(windows) == text
+        assert max(map(len, windows)) <= 64
+    assert windows[0] == "Alice met Bob. Bob left! Alice met Bob. Bob left! "
+
+
+def test_anonymize_stream_yields_windows_lazily_with_one_session_mapping(stream_processor):
+    session = stream_processor.create_session(session_id="stream")
+    session._ctx = CountingContext()
+    source = io.StringIO("Alice met Bob.\n" * 100)
+
+    stream = stream_processor.anonymize_stream(source, session=session, window_size=64)
+    first = next(stream)
+    assert len(stream_processor.analyzed) == 1
+    output = first + "".join(stream)
+
+    assert output == "Person2 met Person1.\n" * 100
+    assert max(map(len, stream_processor.analyzed)) <= 64
+    assert {entry.text for entry in session._entries()} == {"Person1", "Person2"}
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import random
+
+import pytest
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.state]
+
+
+class NameModule:
+    generated = iter(())
+
+    @staticmethod
+    def fake_name(value):
+        return next(NameModule.generated)
+
+
+@pytest.fixture
+def stream_session(lightweight_palimpsest_factory, deterministic_faker_context):
+    from palimpsest import Palimpsest
+    from palimpsest.fakers.faker_context import FakerContext
+
+    NameModule.generated = iter(["Анна", "Анна Смирнова", "Иван Петров"])
+    session = Palimpsest().create_session(session_id="stream")
+    session._ctx = FakerContext(module=NameModule)
+    session._ctx.fake_name("Мария")
+    session._ctx.fake_name("Мария Иванова")
+    session._ctx.fake_name("Степан Степанов")
+    return session
+
+
+TEXT = "Анна Смирнова и Анна, Анналы; Иван Петров.\nИван Петровский, Анна"
+EXPECTED = "Мария Иванова и Мария, Анналы; Степан Степанов.\nИван Петровский, Мария"
+
+
+def test_streamed_output_matches_dictionary_restoration_for_any_split(stream_session):
+    rng = random.Random(7)
+    splits = [[TEXT], list(TEXT)]
+    for _ in range(50):
+        cuts = sorted(rng.sample(range(1, len(TEXT)), 6))
+        splits.append([TEXT[i:j] for i, j in zip([0, *cuts], [*cuts, len(TEXT)])])
+
+    for deltas in splits:
+        assert "".join(stream_session.stream_deanonymizer().stream(deltas)) == EXPECTED
+
+
+def test_stream_emits_unambiguous_text_early_and_buffers_only_fake_prefixes(stream_session):
+    stream = stream_session.stream_deanonymizer()
+
+    assert stream.feed("Привет, Ан") == "Привет, "
+    assert stream.feed("на") == ""
+    assert stream.feed(" Смирнова") == ""
+    assert stream.feed("!") == "Мария Иванова!"
+    assert stream.feed("x" * 1000) == "x" * 1000
+    assert stream.feed(" Иван Пет") == " "
+    assert len(stream._buffer) == len("Иван Пет")
+    assert stream.flush() == "Иван Пет"
+
+
+def test_async_stream_and_closed_session(stream_session):
+    from palimpsest import SessionStateError
+
+    async def deltas():
+        for delta in ["Иван ", "Петров", " пишет"]:
+            yield delta
+
+    async def collect():
+        return [chunk async for chunk in stream_session.stream_deanonymizer().astream(deltas())]
+
+    assert "".join(asyncio.run(collect())) == "Степан Степанов пишет"
+
+    stream = stream_session.stream_deanonymizer()
+    stream_session.close()
+    with pytest.raises(SessionStateError):
+        stream.feed("Анна")
+
+
+def test_async_stream_does_not_block_the_loop_on_a_busy_session(stream_session):
+    import threading
+
+    stream = stream_session.stream_deanonymizer()
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold_session():
+        with stream_session._lock:
+            held.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold_session)
+    holder.start()
+    held.wait(5)
+
+    async def deltas():
+        yield "Иван Петров"
+
+    async def main():
+        task = asyncio.create_task(
+            asyncio.wait_for(collect_async(stream.astream(deltas())), 5)
+        )
+        # the loop keeps running while feed() waits for the session lock
+        await asyncio.sleep(0.05)
+        assert not task.done()
+        release.set()
+        return await task
+
+    try:
+        assert "".join(asyncio.run(main())) == "Степан Степанов"
+    finally:
+        release.set()
+        holder.join()
+
+
+async def collect_async(chunks):
+    return [chunk async for chunk in chunks]